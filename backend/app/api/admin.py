@@ -4,12 +4,22 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
-from typing import List
+from typing import List, Optional
 
 from app.db.database import get_db
 from app.models.user import User
 from app.models.recipe import SavedRecipe
 from app.models.image_upload import ImageUpload
+from app.services.analysis_cache import analysis_cache
+from app.services.image_analysis import image_analysis_service
+from app.services.image_store import image_store
+from app.services.job_runner import analysis_job_runner
+from app.services.ollama_service import ollama_service
+from app.services.openrouter_service import openrouter_service
+from app.services.recipe_cache import recipe_cache
+from app.utils.disconnect import cancellation_metrics
+from app.utils.image_utils import pipeline_metrics
+from app.utils.llm_json import json_parse_metrics
 from app.utils.logger import get_logger
 from app.dependencies.auth import require_admin
 
@@ -99,6 +109,114 @@ async def get_admin_stats(
     }
 
 
+@router.get("/metrics")
+async def get_runtime_metrics(
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    런타임 성능 지표 조회 (관리자 전용)
+
+    Returns:
+        http_pools: 업스트림 HTTP 커넥션 풀 (유휴/활성 연결, 핸드셰이크 절감 수)
+        ollama_pool: Ollama 서버별 진행 중 요청, 지연 시간, 헬스/브레이커 상태
+        ollama_admission / ollama_fast_admission: 대형/빠른 모델 대기열 상태
+        model_tiering: 분석 티어 선택과 대형 모델 재분석 현황
+        analysis_cascade: 캐스케이드 미리보기 지연 시간과 결과 수
+        ollama_streaming / recipe_streaming: 첫 재료/첫 레시피 도착 시간
+        recipe_generation: 레시피 생성 방식(single/fanout)별 소요 시간
+        openrouter_hedging: 헤지 요청 수와 헤지 적용/대조군 응답 시간 백분위
+        ollama_profiles: 요청 프로필별 지연 시간/토큰 수
+        llm_json_parse: 업스트림별 LLM 응답 JSON 파싱 품질
+        cancelled_on_disconnect: 연결 종료로 취소된 호출과 절약된 GPU 시간 추정
+        analysis_cache / recipe_cache: 캐시 적중률
+        single_flight: 진행 중 요청 합치기 횟수
+        image_pipeline: 이미지 처리 워커 풀 지표
+        analysis_jobs: 비동기 분석 작업 실행기/대기열 상태
+    """
+    return {
+        "http_pools": {
+            "ollama": ollama_service.http.stats(),
+            "openrouter": openrouter_service.http.stats()
+        },
+        "ollama_pool": ollama_service.pool.stats(),
+        "ollama_admission": ollama_service.admission.stats(),
+        "ollama_fast_admission": ollama_service.fast_admission.stats(),
+        "model_tiering": image_analysis_service.stats(),
+        "analysis_cascade": image_analysis_service.cascade_stats(),
+        "ollama_streaming": ollama_service.stream_stats(),
+        "recipe_streaming": openrouter_service.stream_stats(),
+        "recipe_generation": openrouter_service.generation_stats(),
+        "openrouter_hedging": openrouter_service.hedge_stats(),
+        "ollama_profiles": ollama_service.profile_stats(),
+        "llm_json_parse": json_parse_metrics.stats(),
+        "cancelled_on_disconnect": cancellation_metrics.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "recipe_cache": recipe_cache.stats(),
+        "single_flight": {
+            "ollama": ollama_service.single_flight.stats(),
+            "openrouter": openrouter_service.single_flight.stats()
+        },
+        "image_pipeline": pipeline_metrics.stats(),
+        "analysis_jobs": {
+            "runner": analysis_job_runner.stats(),
+            "queue": await analysis_job_runner.queue_stats(db)
+        }
+    }
+
+
+@router.post("/images/gc")
+async def collect_image_garbage(
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    이미지 저장소 가비지 컬렉션 (관리자 전용)
+
+    어떤 ImageUpload도 참조하지 않는 블롭을 삭제합니다.
+    """
+    stats = await image_store.collect_garbage(db)
+    logger.info(f"이미지 저장소 GC 실행 - 관리자: {admin_user.id}")
+    return {"success": True, **stats}
+
+
+@router.get("/recipe-cache")
+async def get_recipe_cache(
+    limit: int = 50,
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    레시피 생성 결과 캐시 조회 (관리자 전용)
+
+    적중/실패 통계와 최근 사용 순 캐시 항목(정규화된 재료, 선호도, 적중 수, 만료 시각)을 반환합니다.
+
+    Args:
+        limit: 최대 항목 수
+    """
+    return {
+        "stats": recipe_cache.stats(),
+        **await recipe_cache.entries(db, limit=min(max(limit, 1), 500))
+    }
+
+
+@router.delete("/recipe-cache")
+async def purge_recipe_cache(
+    key: Optional[str] = None,
+    admin_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    레시피 생성 결과 캐시 삭제 (관리자 전용)
+
+    Args:
+        key: 삭제할 캐시 키 (optional, 없으면 전체 삭제)
+    """
+    deleted = await recipe_cache.purge(db, key=key)
+    logger.info(f"레시피 캐시 삭제 - {key or '전체'} {deleted}개, 관리자: {admin_user.id}")
+    return {"success": True, "deleted": deleted}
+
+
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: str,
@@ -1,37 +1,106 @@
 """
 이미지 업로드 및 분석 API
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form, Request
+from fastapi.responses import FileResponse, Response
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import select, delete
+from typing import AsyncIterator, Dict, Optional
+import asyncio
+import base64
 
-from app.db.database import get_db
-from app.services.ollama_service import OllamaService
-from app.utils.image_utils import process_image
+from app.db.database import AsyncSessionLocal, get_db
+from app.services.admission import ServiceOverloadedError
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.analysis_cache import analysis_cache
+from app.services.image_analysis import image_analysis_service
+from app.services.image_store import image_store
+from app.services.job_runner import analysis_job_runner
+from app.services.ollama_service import ollama_service
+from app.utils.disconnect import (
+    ClientDisconnectedError,
+    cancel_on_disconnect,
+    cancellation_metrics,
+    disconnected_exception
+)
+from app.utils.deadline import Deadline, DeadlineExceededError, request_deadline
+from app.utils.image_utils import ProcessedImage, process_image, validate_image
+from app.utils.llm_json import PARSE_OK
 from app.utils.logger import get_logger
-from app.models import ImageUpload, Ingredient, User
+from app.utils.sse import format_sse, sse_response
+from app.config import settings
+from app.models import AnalysisJob, ImageUpload, Ingredient, User
 from app.dependencies.auth import get_current_user
 
 router = APIRouter(prefix="/api/images", tags=["images"])
-ollama_service = OllamaService()
 logger = get_logger(__name__)
 
 
+class ReanalyzeRequest(BaseModel):
+    """재분석 요청"""
+    custom_prompt: Optional[str] = Field(None, max_length=1000)
+    use_previous: bool = True  # 이전 재료 목록을 컨텍스트로 보내 수정 사항만 요청
+
+
+def _overloaded_exception(e: ServiceOverloadedError) -> HTTPException:
+    """모델 대기열 초과 → 503 + Retry-After"""
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={
+            "Retry-After": str(e.retry_after),
+            "X-Queue-Position": str(e.queue_position)
+        }
+    )
+
+
+def _circuit_open_exception(e: CircuitOpenError) -> HTTPException:
+    """업스트림 서킷 브레이커 열림 → 503 + Retry-After"""
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def _deadline_exception(e: DeadlineExceededError) -> HTTPException:
+    """요청 마감 시간 초과 → 504"""
+    return HTTPException(status_code=504, detail=str(e))
+
+
+async def _get_owned_upload(db: AsyncSession, image_id: str, user: User) -> ImageUpload:
+    """이미지 업로드 조회 (본인 또는 관리자만 가능)"""
+    result = await db.execute(select(ImageUpload).filter(ImageUpload.id == image_id))
+    image_upload = result.scalar_one_or_none()
+
+    if not image_upload:
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+
+    # 권한 확인: 본인 또는 관리자만 접근 가능
+    if image_upload.user_id != user.id and not user.is_admin:
+        raise HTTPException(status_code=403, detail="본인의 이미지만 조회할 수 있습니다")
+
+    return image_upload
+
+
 @router.post("/analyze")
 async def analyze_image(
+    request: Request,
     file: UploadFile = File(...),
     custom_prompt: Optional[str] = Form(None),
+    deadline: Deadline = Depends(request_deadline(settings.ANALYZE_DEADLINE_SECONDS)),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     이미지 업로드 및 재료 인식 (로그인 필요)
 
+    클라이언트가 분석 도중 연결을 끊으면 모델 호출을 취소합니다.
+    X-Request-Timeout 헤더(초)로 마감 시간을 지정하면 재시도/대기가 그 안에서만 이루어집니다.
+
     Args:
+        request: 요청 (연결 종료 감지)
         file: 업로드된 이미지 파일
         custom_prompt: 커스텀 프롬프트 (선택사항)
+        deadline: 요청 마감 시간
         current_user: 현재 로그인한 사용자
         db: 데이터베이스 세션
 
@@ -41,45 +110,53 @@ async def analyze_image(
     try:
         logger.info(f"이미지 분석 요청 - 파일명: {file.filename}, 사용자: {current_user.id}")
 
-        # 1. 이미지 처리 및 Base64 인코딩
-        image_base64 = await process_image(file)
-        logger.debug(f"이미지 처리 완료 - Base64 길이: {len(image_base64)}")
-
-        # 2. Ollama API로 이미지 분석
-        result = await ollama_service.analyze_image(image_base64, custom_prompt=custom_prompt)
-
-        # 3. 데이터베이스에 저장 (user_id는 current_user.id 사용)
-        image_upload = ImageUpload(user_id=current_user.id)
-        db.add(image_upload)
-        await db.flush()  # ID 생성
-        logger.debug(f"이미지 업로드 레코드 생성 - ID: {image_upload.id}")
-
-        # 4. 재료 저장
-        ingredients_data = result.get("ingredients", [])
-        saved_ingredients = []
-
-        for ing_data in ingredients_data:
-            ingredient = Ingredient(
-                name=ing_data.get("name"),
-                quantity=ing_data.get("quantity"),
-                freshness=ing_data.get("freshness", "moderate"),
-                confidence=ing_data.get("confidence", 0.8),
-                image_id=image_upload.id
+        # 1. 이미지 처리 및 Base64 인코딩 (동기 분석은 캐스케이드 미리보기를 쓰지 않음)
+        processed = await process_image(file, with_preview=False)
+        logger.debug(
+            f"이미지 처리 완료 - 경로: {processed.path}, "
+            f"Base64 길이: {len(processed.base64)}, 해시: {processed.dhash}"
+        )
+
+        # 2. 캐시 조회 후 없으면 Ollama API로 이미지 분석 (연결 종료 시 취소)
+        with deadline:
+            result = await cancel_on_disconnect(
+                request,
+                image_analysis_service.analyze(db, processed, custom_prompt),
+                upstream="ollama"
             )
-            db.add(ingredient)
-            saved_ingredients.append(ingredient)
 
+        # 3. 정규화 이미지 및 재료 저장
+        image_upload, saved_ingredients = await image_analysis_service.persist(
+            db, current_user.id, processed, result.get("ingredients", [])
+        )
         await db.commit()
-        logger.info(f"이미지 분석 완료 - 재료 {len(saved_ingredients)}개 인식")
+        logger.info(f"이미지 분석 완료 - 재료 {len(saved_ingredients)}개 인식 (티어: {result.get('tier')})")
+
+        # 4. 빠른 티어 결과면 여유가 생길 때 대형 모델로 재분석 예약
+        image_analysis_service.schedule_refine(
+            image_upload, saved_ingredients, result, processed, custom_prompt
+        )
 
         # 5. 응답 생성
-        return {
-            "success": True,
-            "image_id": image_upload.id,
-            "ingredients": [ing.to_dict() for ing in saved_ingredients],
-            "total_count": len(saved_ingredients),
-            "model": result.get("model", "gemma3:12b")  # 사용된 모델 정보
-        }
+        return image_analysis_service.build_response(image_upload, saved_ingredients, result, processed)
+
+    except HTTPException:
+        raise
+
+    except ServiceOverloadedError as e:
+        # 모델 대기열 초과: 빠르게 거절하고 재시도 시점 안내
+        raise _overloaded_exception(e)
+
+    except CircuitOpenError as e:
+        raise _circuit_open_exception(e)
+
+    except DeadlineExceededError as e:
+        await db.rollback()
+        raise _deadline_exception(e)
+
+    except ClientDisconnectedError:
+        await db.rollback()
+        raise disconnected_exception()
 
     except ValueError as e:
         # 이미지 검증 실패
@@ -96,6 +173,452 @@ async def analyze_image(
         )
 
 
+async def _stream_analysis_events(
+    processed: ProcessedImage,
+    custom_prompt: Optional[str],
+    user_id: str,
+    cached_result: Optional[Dict],
+    deadline: Deadline
+) -> AsyncIterator[str]:
+    """
+    스트리밍 분석 SSE 이벤트 생성
+
+    이벤트 순서: start → preview (캐스케이드 예비 결과) → ingredient (재료마다) → done (저장 결과) / 오류 시 error
+    요청 스코프 DB 세션은 응답 본문 전송 전에 닫히므로 자체 세션을 사용합니다.
+    """
+    yield format_sse("start", {
+        "model": ollama_service.image_model,
+        "processing_path": processed.path,
+        "cached": cached_result is not None
+    })
+
+    try:
+        if cached_result is not None:
+            ingredients_data = cached_result.get("ingredients", [])
+            for item in ingredients_data:
+                yield format_sse("ingredient", item)
+        else:
+            # 캐스케이드 1단계: 저해상도 미리보기 결과를 먼저 전송 (실패해도 전체 해상도 분석은 계속)
+            preview = await image_analysis_service.preview(processed, custom_prompt, deadline)
+            if preview is not None:
+                yield format_sse("preview", preview)
+
+            stream_result = {}
+            async for event, payload in ollama_service.stream_analyze_image(
+                processed.base64, custom_prompt=custom_prompt, deadline=deadline
+            ):
+                if event == "ingredient":
+                    yield format_sse("ingredient", payload)
+                else:
+                    stream_result = payload
+            ingredients_data = stream_result.get("ingredients", [])
+
+            # 캐스케이드 2단계: 전체 해상도 결과에 미리보기에서만 찾은 고신뢰 재료 합치기
+            if preview is not None:
+                ingredients_data = image_analysis_service.merge_cascade(
+                    preview["ingredients"], ingredients_data
+                )
+
+        async with AsyncSessionLocal() as db:
+            try:
+                if cached_result is None:
+                    prompt = ollama_service.build_analysis_prompt(custom_prompt)
+                    # 잘린 응답(parse_quality=repaired)은 캐시에서 제외됨
+                    await analysis_cache.store(
+                        db, processed.dhash, ollama_service.image_model, prompt,
+                        {"ingredients": ingredients_data, "parse_quality": stream_result.get("parse_quality")}
+                    )
+                image_upload, saved_ingredients = await image_analysis_service.persist(
+                    db, user_id, processed, ingredients_data
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        logger.info(f"스트리밍 이미지 분석 완료 - 재료 {len(saved_ingredients)}개 인식")
+        yield format_sse("done", image_analysis_service.build_response(
+            image_upload, saved_ingredients, cached_result if cached_result is not None else stream_result, processed
+        ))
+
+    except (asyncio.CancelledError, GeneratorExit):
+        # 클라이언트 연결 종료: Starlette가 스트림을 취소하면 업스트림 연결도 함께 닫힘
+        if cached_result is None:
+            cancellation_metrics.record("ollama_stream")
+        logger.info("클라이언트 연결 종료 - 스트리밍 이미지 분석 중단")
+        raise
+
+    except (ServiceOverloadedError, CircuitOpenError) as e:
+        yield format_sse("error", {
+            "status_code": 503,
+            "detail": str(e),
+            "retry_after": e.retry_after
+        })
+
+    except DeadlineExceededError as e:
+        yield format_sse("error", {"status_code": 504, "detail": str(e)})
+
+    except Exception as e:
+        logger.error(f"스트리밍 이미지 분석 중 오류: {str(e)}", exc_info=True)
+        yield format_sse("error", {
+            "status_code": 500,
+            "detail": f"이미지 분석 중 오류가 발생했습니다: {str(e)}"
+        })
+
+
+@router.post("/analyze/stream")
+async def analyze_image_stream(
+    file: UploadFile = File(...),
+    custom_prompt: Optional[str] = Form(None),
+    deadline: Deadline = Depends(request_deadline(settings.ANALYZE_DEADLINE_SECONDS)),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    이미지 업로드 및 재료 인식 - SSE 스트리밍 (로그인 필요)
+
+    캐스케이드가 켜져 있으면 저해상도 미리보기 분석 결과를 preview 이벤트로 먼저 보내고,
+    전체 해상도 분석에서 모델이 재료 객체를 하나 완성할 때마다 ingredient 이벤트로 즉시 전송하며,
+    마지막에 두 결과를 합쳐 저장한 결과를 done 이벤트로 보냅니다.
+    이미지 검증 실패/대기열 초과/서킷 브레이커 열림은 스트림 시작 전에 일반 HTTP 오류로 응답합니다.
+
+    Args:
+        file: 업로드된 이미지 파일
+        custom_prompt: 커스텀 프롬프트 (선택사항)
+        deadline: 요청 마감 시간
+        current_user: 현재 로그인한 사용자
+        db: 데이터베이스 세션
+
+    Returns:
+        text/event-stream 응답
+    """
+    try:
+        logger.info(f"스트리밍 이미지 분석 요청 - 파일명: {file.filename}, 사용자: {current_user.id}")
+
+        # 업로드 파일은 응답 시작 전에 닫히므로 먼저 처리
+        processed = await process_image(file)
+
+        prompt = ollama_service.build_analysis_prompt(custom_prompt)
+        cached_result = await analysis_cache.lookup(
+            db, processed.dhash, ollama_service.image_model, prompt
+        )
+        if cached_result is None:
+            ollama_service.check_available(deadline)
+            ollama_service.admission.ensure_capacity()
+        else:
+            # 캐시 LRU 갱신 반영 (요청 스코프 세션은 스트림에서 사용하지 않으므로 여기서 커밋)
+            await db.commit()
+
+    except HTTPException:
+        raise
+
+    except ServiceOverloadedError as e:
+        raise _overloaded_exception(e)
+
+    except CircuitOpenError as e:
+        raise _circuit_open_exception(e)
+
+    except DeadlineExceededError as e:
+        raise _deadline_exception(e)
+
+    except ValueError as e:
+        logger.warning(f"이미지 검증 실패: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return sse_response(
+        _stream_analysis_events(processed, custom_prompt, current_user.id, cached_result, deadline)
+    )
+
+
+async def _get_owned_job(db: AsyncSession, job_id: str, user: User) -> AnalysisJob:
+    """분석 작업 조회 (본인 또는 관리자만 가능)"""
+    job = await db.get(AnalysisJob, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다.")
+
+    if job.user_id != user.id and not user.is_admin:
+        raise HTTPException(status_code=403, detail="본인의 분석 작업만 조회할 수 있습니다")
+
+    return job
+
+
+@router.post("/jobs", status_code=202)
+async def create_analysis_job(
+    response: Response,
+    file: UploadFile = File(...),
+    custom_prompt: Optional[str] = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    비동기 이미지 분석 작업 생성 (로그인 필요)
+
+    업로드를 검증하고 저장한 뒤 즉시 202와 작업 ID를 반환합니다.
+    결과는 GET /api/images/jobs/{job_id} 또는 /events(SSE)로 확인합니다.
+
+    Args:
+        response: 응답 (Location 헤더 설정)
+        file: 업로드된 이미지 파일
+        custom_prompt: 커스텀 프롬프트 (선택사항)
+        current_user: 현재 로그인한 사용자
+        db: 데이터베이스 세션
+
+    Returns:
+        작업 ID 및 상태 조회 URL
+    """
+    try:
+        # 검증만 요청 중에 수행하고 디코딩/분석은 워커에서 처리
+        contents = await validate_image(file)
+        input_hash = await image_store.save(contents)
+
+        job = AnalysisJob(user_id=current_user.id, input_hash=input_hash, custom_prompt=custom_prompt)
+        db.add(job)
+        await db.commit()
+
+    except HTTPException:
+        raise
+
+    except ValueError as e:
+        logger.warning(f"이미지 검증 실패: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    analysis_job_runner.submit(job.id)
+    logger.info(f"분석 작업 생성 - ID: {job.id}, 사용자: {current_user.id}")
+
+    status_url = f"/api/images/jobs/{job.id}"
+    response.headers["Location"] = status_url
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": status_url,
+        "events_url": f"{status_url}/events"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_analysis_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    분석 작업 상태 조회 (본인 또는 관리자만 가능)
+
+    Returns:
+        작업 상태 (succeeded면 result에 분석 응답 포함)
+    """
+    job = await _get_owned_job(db, job_id, current_user)
+    return job.to_dict()
+
+
+async def _job_events(job_id: str) -> AsyncIterator[str]:
+    """
+    작업 상태 SSE 이벤트 생성
+
+    상태가 바뀔 때마다 status 이벤트를, 캐스케이드 미리보기 결과가 기록되면 preview 이벤트를,
+    완료 시 done(성공) 또는 error(실패) 이벤트를 보냅니다.
+    인프로세스 알림으로 즉시 깨어나고, 그 외에는 JOB_POLL_INTERVAL마다 DB를 확인합니다.
+    """
+    last_status = None
+    preview_sent = False
+    while True:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(AnalysisJob, job_id)
+            if job is None:
+                yield format_sse("error", {"status_code": 404, "detail": "분석 작업을 찾을 수 없습니다."})
+                return
+            job_data = job.to_dict()
+
+        if job_data["status"] != last_status:
+            last_status = job_data["status"]
+            yield format_sse("status", {"job_id": job_id, "status": last_status})
+
+        preview = (job_data["result"] or {}).get("preview")
+        if preview is not None and not preview_sent and last_status == AnalysisJob.RUNNING:
+            preview_sent = True
+            yield format_sse("preview", {"job_id": job_id, **preview})
+
+        if last_status == AnalysisJob.SUCCEEDED:
+            yield format_sse("done", job_data)
+            return
+        if last_status == AnalysisJob.FAILED:
+            yield format_sse("error", {"status_code": 500, "detail": job_data["error"], "job": job_data})
+            return
+
+        await analysis_job_runner.wait_for_update(job_id, settings.JOB_POLL_INTERVAL)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_analysis_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    분석 작업 상태 SSE 스트림 (본인 또는 관리자만 가능)
+
+    Returns:
+        text/event-stream 응답 (status → preview → done | error)
+    """
+    await _get_owned_job(db, job_id, current_user)
+    return sse_response(_job_events(job_id))
+
+
+@router.post("/{image_id}/reanalyze")
+async def reanalyze_image(
+    image_id: str,
+    request: ReanalyzeRequest,
+    http_request: Request,
+    deadline: Deadline = Depends(request_deadline(settings.ANALYZE_DEADLINE_SECONDS)),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    저장된 전처리 이미지로 재분석 (재업로드 불필요, 로그인 필요)
+
+    업로드/검증/디코딩/리사이징을 건너뛰고 모델 호출만 수행합니다.
+    use_previous가 true면 이전 재료 목록을 함께 보내 수정 사항만 받습니다.
+
+    Args:
+        image_id: 이미지 업로드 ID
+        request: 커스텀 프롬프트 및 이전 결과 사용 여부
+        http_request: HTTP 요청 (연결 종료 감지)
+        deadline: 요청 마감 시간
+        current_user: 현재 로그인한 사용자
+        db: 데이터베이스 세션
+
+    Returns:
+        재분석된 재료 목록
+    """
+    try:
+        image_upload = await _get_owned_upload(db, image_id, current_user)
+
+        image_bytes = None
+        if image_upload.content_hash:
+            image_bytes = await image_store.load(image_upload.content_hash)
+        if image_bytes is None:
+            raise HTTPException(
+                status_code=404,
+                detail="저장된 이미지가 없어 재분석할 수 없습니다. 이미지를 다시 업로드해주세요."
+            )
+
+        logger.info(f"이미지 재분석 요청 - ID: {image_id}, 사용자: {current_user.id}")
+
+        previous = None
+        if request.use_previous and image_upload.ingredients:
+            previous = [
+                {
+                    "name": ing.name,
+                    "quantity": ing.quantity,
+                    "freshness": ing.freshness,
+                    "confidence": ing.confidence
+                }
+                for ing in image_upload.ingredients
+            ]
+
+        with deadline:
+            result = await cancel_on_disconnect(
+                http_request,
+                ollama_service.analyze_image(
+                    base64.b64encode(image_bytes).decode("utf-8"),
+                    custom_prompt=request.custom_prompt,
+                    previous_ingredients=previous
+                ),
+                upstream="ollama"
+            )
+
+        # 기존 재료를 한 번에 교체 (일괄 DELETE + 일괄 INSERT, 단일 트랜잭션)
+        await db.execute(delete(Ingredient).where(Ingredient.image_id == image_id))
+        saved_ingredients = image_analysis_service.build_ingredients(result.get("ingredients", []), image_id)
+        db.add_all(saved_ingredients)
+        await db.commit()
+
+        logger.info(f"이미지 재분석 완료 - 재료 {len(saved_ingredients)}개")
+
+        return {
+            "success": True,
+            "image_id": image_id,
+            "image_url": image_upload.image_url,
+            "ingredients": [ing.to_dict() for ing in saved_ingredients],
+            "total_count": len(saved_ingredients),
+            "model": result.get("model", ollama_service.image_model),
+            "corrections": result.get("corrections"),
+            "parse_quality": result.get("parse_quality", PARSE_OK)
+        }
+
+    except HTTPException:
+        raise
+
+    except ServiceOverloadedError as e:
+        raise _overloaded_exception(e)
+
+    except CircuitOpenError as e:
+        raise _circuit_open_exception(e)
+
+    except DeadlineExceededError as e:
+        await db.rollback()
+        raise _deadline_exception(e)
+
+    except ClientDisconnectedError:
+        await db.rollback()
+        raise disconnected_exception()
+
+    except Exception as e:
+        logger.error(f"이미지 재분석 중 오류: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"이미지 재분석 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+@router.get("/{image_id}/file")
+async def get_image_file(
+    image_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    저장된 전처리 이미지 조회 (본인 또는 관리자만 가능)
+
+    콘텐츠 해시를 ETag로 사용하므로 If-None-Match가 일치하면 304를 반환합니다.
+
+    Args:
+        image_id: 이미지 업로드 ID
+        request: 요청 (If-None-Match 헤더 확인)
+        current_user: 현재 로그인한 사용자
+        db: 데이터베이스 세션
+
+    Returns:
+        JPEG 파일 응답
+    """
+    image_upload = await _get_owned_upload(db, image_id, current_user)
+
+    if not image_upload.content_hash or not image_store.exists(image_upload.content_hash):
+        raise HTTPException(status_code=404, detail="저장된 이미지 파일이 없습니다.")
+
+    # 콘텐츠 주소이므로 내용이 바뀌지 않음 → 강한 ETag + 장기 캐시
+    # Content-Encoding: identity → 이미 압축된 JPEG을 GZipMiddleware가 다시 압축(청크 전송)하지 않고 그대로 전송
+    etag = f'"{image_upload.content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "Content-Encoding": "identity"
+    }
+
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    # FileResponse: 서버가 지원하면 sendfile(zero-copy)로 전송
+    return FileResponse(
+        image_store.path_for(image_upload.content_hash),
+        media_type="image/jpeg",
+        headers=headers
+    )
+
+
 @router.get("/test")
 async def test_endpoint():
     """테스트 엔드포인트"""
@@ -1,14 +1,26 @@
 """
 레시피 관련 API 엔드포인트
 """
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
-from typing import List, Optional, Dict
-from app.services.openrouter_service import OpenRouterService
+from typing import AsyncIterator, List, Literal, Optional, Dict
+from app.config import settings
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.openrouter_service import openrouter_service
+from app.services.recipe_cache import recipe_cache
+from app.utils.deadline import Deadline, DeadlineExceededError, request_deadline
+from app.utils.disconnect import (
+    ClientDisconnectedError,
+    cancel_on_disconnect,
+    cancellation_metrics,
+    disconnected_exception
+)
+from app.utils.llm_json import PARSE_FAILED
 from app.utils.logger import get_logger
+from app.utils.sse import format_sse, sse_response
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
-openrouter_service = OpenRouterService()
 logger = get_logger(__name__)
 
 
@@ -16,18 +28,29 @@ class RecipeRequest(BaseModel):
     """레시피 생성 요청"""
     ingredients: List[str]
     preferences: Optional[Dict] = None
+    mode: Optional[Literal["single", "fanout"]] = None  # 생성 방식 (기본값: RECIPE_GENERATION_MODE)
 
 
 @router.post("/generate")
-async def generate_recipes(request: RecipeRequest):
+async def generate_recipes(
+    request: RecipeRequest,
+    http_request: Request,
+    deadline: Deadline = Depends(request_deadline(settings.RECIPE_DEADLINE_SECONDS))
+):
     """
     재료 기반 레시피 생성
 
+    같은 재료 집합(정규화 기준)과 선호도로 생성한 결과가 캐시에 있으면 모델을 호출하지 않고 반환합니다.
+    mode=fanout이면 레시피를 1개씩 동시에 요청해 RECIPE_FANOUT_TIMEOUT까지 도착한 것만 합쳐 반환합니다 (fanout 요약 포함).
+    클라이언트가 생성 도중 연결을 끊으면 OpenRouter 호출(및 재시도)을 취소합니다.
+
     Args:
         request: 재료 목록 및 선호도
+        http_request: HTTP 요청 (연결 종료 감지)
+        deadline: 요청 마감 시간 (X-Request-Timeout 헤더 또는 기본값)
 
     Returns:
-        생성된 레시피 목록
+        생성된 레시피 목록 (parse_quality: ok | extracted | repaired, cached: 캐시 적중 여부)
     """
     try:
         logger.info(
@@ -35,22 +58,142 @@ async def generate_recipes(request: RecipeRequest):
             f"선호도: {bool(request.preferences)}"
         )
 
-        result = await openrouter_service.generate_recipes(
-            ingredients=request.ingredients,
-            preferences=request.preferences
+        cached_result = await recipe_cache.lookup(
+            request.ingredients, request.preferences, openrouter_service.text_model
         )
+        if cached_result is not None:
+            logger.info(f"레시피 캐시 적중 - {cached_result['cache']['tier']}")
+            return cached_result
+
+        with deadline:
+            result = await cancel_on_disconnect(
+                http_request,
+                openrouter_service.generate_recipes(
+                    ingredients=request.ingredients,
+                    preferences=request.preferences,
+                    mode=request.mode
+                ),
+                upstream="openrouter"
+            )
 
-        if "error" in result:
-            logger.error(f"레시피 생성 실패: {result['error']}")
-            raise HTTPException(status_code=500, detail=result["error"])
+        # 응답에서 JSON을 전혀 찾지 못한 경우만 실패 (잘린 응답은 완성된 레시피만으로 응답)
+        if result["parse_quality"] == PARSE_FAILED:
+            logger.error("레시피 생성 실패: 모델 응답에서 JSON을 찾지 못했습니다.")
+            raise HTTPException(status_code=502, detail="레시피 생성 모델의 응답을 해석할 수 없습니다.")
 
         recipe_count = len(result.get("recipes", []))
         logger.info(f"레시피 생성 완료 - {recipe_count}개 생성")
 
-        return result
+        await recipe_cache.store(
+            request.ingredients, request.preferences, openrouter_service.text_model, result
+        )
+        return {**result, "cached": False}
 
     except HTTPException:
         raise
+    except ClientDisconnectedError:
+        raise disconnected_exception()
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"레시피 생성 중 오류: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _stream_recipe_events(
+    request: RecipeRequest,
+    cached_result: Optional[Dict],
+    deadline: Deadline
+) -> AsyncIterator[str]:
+    """
+    스트리밍 레시피 생성 SSE 이벤트 생성
+
+    이벤트 순서: start → recipe (레시피마다) → done (요약) / 오류 시 error
+    """
+    model = openrouter_service.text_model
+    yield format_sse("start", {"model": model, "cached": cached_result is not None})
+
+    try:
+        if cached_result is not None:
+            for recipe in cached_result.get("recipes", []):
+                yield format_sse("recipe", recipe)
+            summary = {**cached_result, "time_to_first_recipe": 0.0, "duration": 0.0}
+        else:
+            summary = None
+            async for event, payload in openrouter_service.stream_generate_recipes(
+                request.ingredients, request.preferences, deadline=deadline
+            ):
+                if event == "recipe":
+                    yield format_sse("recipe", payload)
+                else:
+                    summary = payload
+
+            if summary["parse_quality"] == PARSE_FAILED:
+                logger.error("스트리밍 레시피 생성 실패: 모델 응답에서 JSON을 찾지 못했습니다.")
+                yield format_sse("error", {
+                    "status_code": 502,
+                    "detail": "레시피 생성 모델의 응답을 해석할 수 없습니다."
+                })
+                return
+
+            await recipe_cache.store(request.ingredients, request.preferences, model, summary)
+            summary = {**summary, "cached": False}
+
+        logger.info(f"스트리밍 레시피 생성 완료 - {len(summary['recipes'])}개 생성")
+        yield format_sse("done", {**summary, "total_count": len(summary["recipes"])})
+
+    except (asyncio.CancelledError, GeneratorExit):
+        # 클라이언트 연결 종료: Starlette가 스트림을 취소하면 업스트림 연결도 함께 닫힘
+        if cached_result is None:
+            cancellation_metrics.record("openrouter_stream")
+        logger.info("클라이언트 연결 종료 - 스트리밍 레시피 생성 중단")
+        raise
+
+    except CircuitOpenError as e:
+        yield format_sse("error", {"status_code": 503, "detail": str(e), "retry_after": e.retry_after})
+
+    except DeadlineExceededError as e:
+        yield format_sse("error", {"status_code": 504, "detail": str(e)})
+
+    except Exception as e:
+        logger.error(f"스트리밍 레시피 생성 중 오류: {str(e)}", exc_info=True)
+        yield format_sse("error", {"status_code": 500, "detail": str(e)})
+
+
+@router.post("/generate/stream")
+async def generate_recipes_stream(
+    request: RecipeRequest,
+    deadline: Deadline = Depends(request_deadline(settings.RECIPE_DEADLINE_SECONDS))
+):
+    """
+    재료 기반 레시피 생성 - SSE 스트리밍
+
+    모델이 레시피 JSON 객체를 하나 완성할 때마다 recipe 이벤트로 즉시 전송하고,
+    마지막에 전체 레시피와 파싱 품질/소요 시간 요약을 done 이벤트로 보냅니다.
+    캐시에 있으면 모델을 호출하지 않고 캐시된 레시피를 같은 이벤트 순서로 보냅니다.
+    서킷 브레이커가 열려 있으면 스트림 시작 전에 503으로 응답합니다.
+
+    Args:
+        request: 재료 목록 및 선호도
+        deadline: 요청 마감 시간 (X-Request-Timeout 헤더 또는 기본값)
+
+    Returns:
+        text/event-stream 응답
+    """
+    logger.info(
+        f"스트리밍 레시피 생성 요청 - 재료: {len(request.ingredients)}개, "
+        f"선호도: {bool(request.preferences)}"
+    )
+
+    cached_result = await recipe_cache.lookup(
+        request.ingredients, request.preferences, openrouter_service.text_model
+    )
+    if cached_result is None:
+        try:
+            openrouter_service.breaker.check()
+        except CircuitOpenError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    return sse_response(_stream_recipe_events(request, cached_result, deadline))
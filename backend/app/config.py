@@ -17,6 +17,93 @@ class Settings(BaseSettings):
     OPENROUTER_API_URL: str = "https://openrouter.ai/api/v1/chat/completions"
     TEXT_MODEL: str = os.getenv("TEXT_MODEL", "upstage/solar-pro-3:free")
     IMAGE_MODEL: str = os.getenv("IMAGE_MODEL", "google/gemma-3-12b-it:free")
+    OPENROUTER_HTTP2: bool = True  # OpenRouter는 HTTP/2 지원 (h2 패키지 필요)
+    OPENROUTER_MAX_CONNECTIONS: int = 20
+    OPENROUTER_MAX_KEEPALIVE_CONNECTIONS: int = 10
+
+    # OpenRouter 헤지 요청 (레시피 생성): 응답이 임계값 안에 없으면 두 번째 요청을 보내고 먼저 온 응답 사용
+    OPENROUTER_HEDGE_ENABLED: bool = os.getenv("OPENROUTER_HEDGE_ENABLED", "true").lower() == "true"
+    OPENROUTER_HEDGE_PERCENTILE: float = 90.0  # 임계값: 최근 응답 시간의 이 백분위
+    OPENROUTER_HEDGE_MIN_DELAY: float = 3.0  # 임계값 하한 (초)
+    OPENROUTER_HEDGE_MIN_SAMPLES: int = 20  # 이 수만큼 응답 시간이 쌓이기 전에는 헤지하지 않음
+    OPENROUTER_HEDGE_BUDGET: float = 0.1  # 추가 요청 비율 상한 (0.1 = 요청 10개당 헤지 1번)
+    OPENROUTER_HEDGE_HOLDOUT: float = 0.05  # 헤지하지 않는 대조군 비율 (헤지 없음 응답 시간 지표)
+    # 헤지 요청에 쓸 대체 모델 (쉼표 구분, 순서대로 돌아가며 사용, 비어 있으면 같은 모델로 다시 요청)
+    OPENROUTER_HEDGE_MODELS: str = os.getenv("OPENROUTER_HEDGE_MODELS", "")
+
+    # Ollama (로컬 이미지 분석)
+    OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    # 여러 Ollama 서버에 분산할 때 쉼표로 구분한 URL 목록 (비어 있으면 OLLAMA_BASE_URL 1대)
+    OLLAMA_HOSTS: str = os.getenv("OLLAMA_HOSTS", "")
+    OLLAMA_MAX_CONNECTIONS: int = 10
+    OLLAMA_MAX_KEEPALIVE_CONNECTIONS: int = 5
+    OLLAMA_MAX_INFLIGHT: int = 1  # 서버 1대당 동시에 모델에 보낼 요청 수 (GPU 1대 기준)
+    OLLAMA_MAX_QUEUE: int = 4  # 대기열 최대 길이 (초과 시 503)
+    OLLAMA_DEFAULT_SERVICE_TIME: float = 60.0  # 처리 시간 기록이 없을 때 추정값 (초)
+
+    # Ollama 서버 풀 (헬스 체크 + 최소 진행 요청 라우팅)
+    OLLAMA_HEALTH_CHECK_INTERVAL: float = 10.0  # 헬스 체크 주기 (초) - 퇴출된 서버도 이 주기로 복귀 확인
+    OLLAMA_HEALTH_CHECK_TIMEOUT: float = 5.0
+    OLLAMA_LATENCY_EWMA_ALPHA: float = 0.3  # 최근 지연 시간 가중치
+    OLLAMA_COLD_MODEL_PENALTY: float = 2.0  # 모델이 메모리에 없는 서버의 라우팅 점수 배수
+
+    # Ollama 모델 상주 관리 (콜드 로드 방지)
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # 요청 후 모델 유지 시간 ("30m", "1h", -1=계속)
+    OLLAMA_WARMUP_ON_STARTUP: bool = True  # 시작 시 빈 프롬프트로 모델 로드
+    OLLAMA_WARMUP_TIMEOUT: float = 300.0  # 모델 로드 타임아웃 (초)
+    OLLAMA_KEEP_WARM: bool = os.getenv("OLLAMA_KEEP_WARM", "false").lower() == "true"  # 업무 시간 중 주기적 로드 유지
+    OLLAMA_KEEP_WARM_START_HOUR: int = 9  # 업무 시간 시작 (서버 로컬 시각, 포함)
+    OLLAMA_KEEP_WARM_END_HOUR: int = 22  # 업무 시간 종료 (제외)
+    OLLAMA_KEEP_WARM_IDLE_SECONDS: float = 600.0  # 이 시간 동안 요청이 없으면 로드 유지 요청
+
+    # Ollama 요청 프로필: 구조화 출력(JSON Schema)과 생성 예산
+    OLLAMA_STRUCTURED_OUTPUT: bool = os.getenv("OLLAMA_STRUCTURED_OUTPUT", "true").lower() == "true"  # Ollama 0.5 이상
+    OLLAMA_NUM_CTX: int = 4096  # 컨텍스트 길이 (시스템 프롬프트 + 이미지 토큰 + 출력)
+    OLLAMA_NUM_PREDICT: int = 1024  # 최대 출력 토큰 (재료 약 30개)
+    OLLAMA_PREVIEW_NUM_CTX: int = 2048
+    OLLAMA_PREVIEW_NUM_PREDICT: int = 768
+    OLLAMA_CORRECTION_NUM_PREDICT: int = 512  # 재분석은 수정 사항만 출력
+    OLLAMA_TEMPERATURE: float = 0.1
+
+    # 분석 모델 티어링 (대기열이 길거나 마감 시간이 촉박하면 빠른 모델로 먼저 응답)
+    TIERING_ENABLED: bool = os.getenv("TIERING_ENABLED", "false").lower() == "true"
+    FAST_TIER_BACKEND: str = os.getenv("FAST_TIER_BACKEND", "ollama")  # ollama (OLLAMA_FAST_MODEL) | openrouter (IMAGE_MODEL)
+    OLLAMA_FAST_MODEL: str = os.getenv("OLLAMA_FAST_MODEL", "gemma3:4b")
+    OLLAMA_FAST_MAX_INFLIGHT: int = 1  # 서버 1대당 빠른 모델 동시 실행 수 (대형 모델 대기열과 별도)
+    OLLAMA_FAST_DEFAULT_SERVICE_TIME: float = 15.0
+    TIERING_QUEUE_DEPTH: int = 2  # 대형 모델 대기열이 이 길이 이상이면 빠른 모델
+    TIERING_REFINE: bool = True  # 빠른 모델 결과를 여유가 생기면 대형 모델로 다시 분석해 재료 갱신
+    TIERING_REFINE_MAX_PENDING: int = 20  # 동시에 기다릴 수 있는 재분석 수
+    TIERING_REFINE_MAX_WAIT_SECONDS: float = 1800.0  # 여유가 생기기를 기다리는 최대 시간
+    TIERING_REFINE_POLL_INTERVAL: float = 5.0
+
+    # 2단계 캐스케이드 분석 (스트리밍/비동기 작업): 저해상도 미리보기 결과를 먼저 보내고 전체 해상도 결과로 보완
+    CASCADE_ENABLED: bool = os.getenv("CASCADE_ENABLED", "true").lower() == "true"
+    CASCADE_PREVIEW_SIZE: int = 384  # 미리보기 이미지 최대 너비/높이
+    CASCADE_PREVIEW_MODEL: str = os.getenv("CASCADE_PREVIEW_MODEL", "")  # 비어 있으면 대형 모델과 같은 모델
+    CASCADE_PREVIEW_TIMEOUT: float = 30.0  # 미리보기가 이보다 오래 걸리면 건너뜀 (초)
+    CASCADE_KEEP_PREVIEW_CONFIDENCE: float = 0.8  # 전체 해상도 결과에 없어도 유지할 미리보기 재료의 최소 신뢰도
+
+    # 공유 HTTP 커넥션 풀: 유휴 연결 유지 시간 (초)
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+
+    # 클라이언트 연결 종료 확인 간격 (초) - 끊기면 진행 중인 모델 호출 취소
+    DISCONNECT_POLL_INTERVAL: float = 0.5
+
+    # 요청 마감 시간 (X-Request-Timeout 헤더가 없을 때 라우트 기본값, 초)
+    ANALYZE_DEADLINE_SECONDS: float = 300.0
+    RECIPE_DEADLINE_SECONDS: float = 120.0
+    MAX_REQUEST_TIMEOUT_SECONDS: float = 600.0  # 헤더로 요청할 수 있는 최대값
+    DEADLINE_MIN_ATTEMPT_SECONDS: float = 1.0  # 남은 시간이 이보다 적으면 재시도하지 않음
+
+    # 서킷 브레이커 (업스트림별)
+    CIRCUIT_BREAKER_WINDOW: int = 20  # 최근 호출 수
+    CIRCUIT_BREAKER_MIN_CALLS: int = 5  # 판단에 필요한 최소 호출 수
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5  # 이 오류율 이상이면 열림
+    CIRCUIT_BREAKER_SLOW_CALL_RATE: float = 0.8  # 이 느린 호출 비율 이상이면 열림
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = 30.0  # 열림 유지 시간 (이후 시험 호출)
+    OLLAMA_SLOW_CALL_SECONDS: float = 180.0  # 느린 호출 기준
+    OPENROUTER_SLOW_CALL_SECONDS: float = 45.0
 
     # 데이터베이스
     DATABASE_URL: str = "sqlite+aiosqlite:///./fridgechef.db"
@@ -30,8 +117,47 @@ class Settings(BaseSettings):
 
     # 이미지 설정
     MAX_IMAGE_SIZE: int = 20 * 1024 * 1024  # 20MB
+    MAX_IMAGE_PIXELS: int = 50_000_000  # 최대 픽셀 수 (디컴프레션 밤 차단)
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024  # 업로드 읽기 단위
+    UPLOAD_BODY_OVERHEAD: int = 64 * 1024  # multipart 경계/폼 필드 여유분
     ALLOWED_IMAGE_TYPES: list = ["image/jpeg", "image/png", "image/jpg"]
     IMAGE_RESIZE_MAX: int = 1024  # 최대 너비/높이
+    IMAGE_DRAFT_DECODE: bool = True  # JPEG 축소 디코딩 (draft) 사용
+    IMAGE_PASSTHROUGH_ENABLED: bool = True  # 조건을 만족하는 JPEG은 재인코딩 없이 전달
+    IMAGE_PASSTHROUGH_MAX_BYTES: int = 1024 * 1024  # 패스스루 최대 용량 (1MB)
+    IMAGE_WORKER_KIND: str = "thread"  # 이미지 처리 워커 풀 종류 (thread | process)
+    IMAGE_WORKERS: int = 2  # 워커 수
+    IMAGE_MAX_CONCURRENT_DECODES: int = 2  # 동시에 디코딩할 원본 비트맵 수 (메모리 피크 제한)
+
+    # 전처리 이미지 저장소 (SHA-256 콘텐츠 주소)
+    IMAGE_STORE_DIR: str = "./image_store"
+    IMAGE_STORE_GC_GRACE_SECONDS: int = 3600  # 참조 없는 블롭 삭제 유예 기간
+
+    # 이미지 분석 결과 캐시 (지각 해시 기반)
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_MAX_DISTANCE: int = 6  # dHash 해밍 거리 임계값 (64비트 중)
+    ANALYSIS_CACHE_TTL_HOURS: int = 24 * 7
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 5000
+
+    # 레시피 생성 결과 캐시 (정규화한 재료 집합 + 선호도 + 모델 기준, 메모리 LRU + SQLite)
+    RECIPE_CACHE_ENABLED: bool = os.getenv("RECIPE_CACHE_ENABLED", "true").lower() == "true"
+    RECIPE_CACHE_TTL_HOURS: int = 24
+    RECIPE_CACHE_MAX_ENTRIES: int = 2000  # SQLite 최대 항목 수 (초과 시 LRU 삭제)
+    RECIPE_CACHE_MEMORY_ENTRIES: int = 256  # 프로세스 메모리 LRU 항목 수
+
+    # 레시피 생성 방식: single (프롬프트 하나로 N개) | fanout (1개씩 N개 동시 요청, 요청별로 mode 지정 가능)
+    RECIPE_COUNT: int = 3
+    RECIPE_GENERATION_MODE: str = os.getenv("RECIPE_GENERATION_MODE", "single")
+    RECIPE_FANOUT_TIMEOUT: float = 25.0  # 이 시간이 지나면 끝나지 않은 팬아웃 요청은 버리고 도착한 레시피만 반환 (초)
+
+    # 비동기 분석 작업 (/api/images/jobs)
+    JOB_EXECUTION_MODE: str = "inprocess"  # inprocess | external (python -m app.worker로 별도 실행)
+    JOB_WORKERS: int = 2  # 프로세스당 작업 워커 수
+    JOB_POLL_INTERVAL: float = 2.0  # 작업 상태 SSE 폴링 간격 (초)
+    JOB_CLAIM_POLL_INTERVAL: float = 1.0  # 대기열이 비었을 때 워커의 점유 재시도 간격 (초)
+    JOB_LEASE_SECONDS: int = 120  # 작업 임대 시간 (하트비트 없이 지나면 다른 워커가 가져감)
+    JOB_HEARTBEAT_INTERVAL: float = 30.0  # 임대 연장 간격 (초)
+    JOB_MAX_ATTEMPTS: int = 3  # 임대 만료로 재점유되는 최대 횟수
 
     # Rate Limit
     MAX_REQUESTS_PER_DAY: int = 50  # 무료 티어 제한
@@ -44,6 +170,17 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_HOURS: int = 24
 
+    @property
+    def ollama_hosts(self) -> list:
+        """Ollama 서버 URL 목록"""
+        hosts = [host.strip().rstrip("/") for host in self.OLLAMA_HOSTS.split(",") if host.strip()]
+        return hosts or [self.OLLAMA_BASE_URL.rstrip("/")]
+
+    @property
+    def openrouter_hedge_models(self) -> list:
+        """헤지 요청용 대체 모델 목록"""
+        return [model.strip() for model in self.OPENROUTER_HEDGE_MODELS.split(",") if model.strip()]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -3,13 +3,20 @@ FastAPI 애플리케이션 진입점
 """
 import logging
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
 from app.db.database import init_db
+from app.services.image_analysis import image_analysis_service
+from app.services.job_runner import analysis_job_runner
+from app.services.ollama_service import ollama_service
+from app.services.openrouter_service import openrouter_service
+from app.utils.image_utils import shutdown_image_workers
 from app.utils.logger import setup_logger
+from app.utils.upload_guard import UploadSizeLimitMiddleware
 
 # 루트 로거 설정
 setup_logger("app", level=logging.INFO)
@@ -25,9 +32,24 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting FridgeChef API...")
     await init_db()
     logger.info("✅ Database initialized")
+    # 업스트림별 공유 HTTP 클라이언트 (커넥션 풀 재사용)
+    ollama_service.http.start()
+    openrouter_service.http.start()
+    # Ollama 서버 풀 헬스 체크 (퇴출/복귀) + 모델 미리 로드 (첫 분석의 콜드 로드 방지)
+    ollama_service.pool.start(warm_up=settings.OLLAMA_WARMUP_ON_STARTUP)
+    # 비동기 분석 작업 워커 (external 모드에서는 python -m app.worker가 처리)
+    if settings.JOB_EXECUTION_MODE == "inprocess":
+        await analysis_job_runner.start()
     yield
     # 종료 시
     logger.info("👋 Shutting down FridgeChef API...")
+    if analysis_job_runner.running:
+        await analysis_job_runner.stop()
+    await image_analysis_service.stop()
+    await ollama_service.pool.stop()
+    await ollama_service.http.aclose()
+    await openrouter_service.http.aclose()
+    shutdown_image_workers()
 
 
 # FastAPI 앱 생성
@@ -38,6 +60,14 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# 업로드 본문 크기 제한: 이미지 API는 본문 수신 중 제한 초과 시 즉시 413
+# (CORS 미들웨어보다 안쪽에 두어 413 응답에도 CORS 헤더가 붙도록 먼저 등록)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path_prefix="/api/images",
+    max_body_size=settings.MAX_IMAGE_SIZE + settings.UPLOAD_BODY_OVERHEAD
+)
+
 # GZip 압축: 1KB 이상 응답 자동 압축 (API 응답 크기 50-70% 감소)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
@@ -63,14 +93,41 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """상세 헬스 체크"""
+    """
+    상세 헬스 체크
+
+    퇴출된 Ollama 서버가 있거나 서킷 브레이커가 열려 있으면 degraded,
+    시작 후 모델 로드를 한 번 확인했고 사용 가능한 Ollama 서버가 하나라도 있어야 ready입니다.
+    모델 상주 여부(ollama_pool.endpoints[].model_loaded)는 참고용 정보입니다.
+    """
+    ollama_pool = ollama_service.pool.stats()
+    breakers = {
+        "openrouter": openrouter_service.breaker.stats()
+    }
+    degraded = (
+        ollama_pool["available_endpoints"] < len(ollama_pool["endpoints"])
+        or any(breaker["state"] != "closed" for breaker in breakers.values())
+    )
     return {
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy",
+        "ready": ollama_pool["ready"],
         "database": "connected",
-        "openrouter": "configured" if settings.OPENROUTER_API_KEY else "not configured"
+        "openrouter": "configured" if settings.OPENROUTER_API_KEY else "not configured",
+        "ollama_pool": ollama_pool,
+        "circuit_breakers": breakers
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """준비 상태 확인 (로드 밸런서/오케스트레이터용) - 시작 후 모델 로드를 확인하기 전이거나 사용 가능한 Ollama 서버가 없으면 503"""
+    ready = ollama_service.pool.ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "model": ollama_service.image_model}
+    )
+
+
 # API 라우터 등록
 from app.api import images, recipes, users, admin, auth
 
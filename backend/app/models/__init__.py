@@ -5,5 +5,10 @@ from app.models.user import User
 from app.models.ingredient import Ingredient
 from app.models.image_upload import ImageUpload
 from app.models.recipe import SavedRecipe
+from app.models.analysis_cache import AnalysisCacheEntry
+from app.models.analysis_job import AnalysisJob
+from app.models.recipe_cache import RecipeCacheEntry
 
-__all__ = ["User", "Ingredient", "ImageUpload", "SavedRecipe"]
+__all__ = [
+    "User", "Ingredient", "ImageUpload", "SavedRecipe", "AnalysisCacheEntry", "AnalysisJob", "RecipeCacheEntry"
+]
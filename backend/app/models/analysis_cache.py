@@ -0,0 +1,31 @@
+"""
+이미지 분석 결과 캐시(AnalysisCacheEntry) 모델
+"""
+from sqlalchemy import Column, String, JSON, Integer, DateTime, Index
+from datetime import datetime
+import uuid
+
+from app.db.database import Base
+
+
+class AnalysisCacheEntry(Base):
+    """지각 해시 기반 이미지 분석 결과 캐시"""
+    __tablename__ = "analysis_cache"
+
+    # 복합 인덱스: 모델 + 프롬프트별 후보 조회, LRU 정리용 최근 사용 시각
+    __table_args__ = (
+        Index("ix_analysis_cache_model_prompt", "model", "prompt_hash"),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    image_hash = Column(String(16), nullable=False, index=True)  # 64비트 dHash (hex)
+    model = Column(String, nullable=False)
+    prompt_hash = Column(String(64), nullable=False)  # 프롬프트 SHA-256
+    result = Column(JSON, nullable=False)  # {"ingredients": [...]}
+    hit_count = Column(Integer, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<AnalysisCacheEntry {self.image_hash} {self.model}>"
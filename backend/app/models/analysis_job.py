@@ -0,0 +1,67 @@
+"""
+비동기 이미지 분석 작업(AnalysisJob) 모델
+
+작업 테이블 자체가 대기열입니다. 워커는 조건부 UPDATE로 작업을 원자적으로 점유(lease)하고,
+lease_expires_at을 하트비트로 연장합니다. 워커가 죽어 임대가 만료되면 다른 워커가 다시 가져갑니다.
+"""
+from sqlalchemy import Column, String, JSON, Integer, Text, DateTime, ForeignKey, Index
+from datetime import datetime
+import uuid
+
+from app.db.database import Base
+
+
+class AnalysisJob(Base):
+    """비동기 이미지 분석 작업 (재시작 후에도 복구되도록 DB에 기록)"""
+    __tablename__ = "analysis_jobs"
+
+    # 상태 값
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    ACTIVE_STATUSES = (QUEUED, RUNNING)
+    TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+    # 복합 인덱스: 상태별 오래된 작업 순 조회 (대기열), 만료된 임대 조회
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_created", "status", "created_at"),
+        Index("ix_analysis_jobs_status_lease", "status", "lease_expires_at"),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
+    status = Column(String(16), nullable=False, default=QUEUED)
+    input_hash = Column(String(64), nullable=False)  # 이미지 저장소의 원본 업로드 블롭 키
+    custom_prompt = Column(Text, nullable=True)
+    image_id = Column(String, ForeignKey("image_uploads.id"), nullable=True)  # 결과 이미지 업로드
+    result = Column(JSON, nullable=True)  # /api/images/analyze 응답과 같은 형태
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+
+    # 작업 임대 (워커 점유)
+    lease_owner = Column(String, nullable=True)  # 점유 중인 워커 ID
+    lease_expires_at = Column(DateTime, nullable=True)  # 하트비트가 없으면 이 시각 이후 재점유 가능
+    available_at = Column(DateTime, nullable=True)  # 연기된 작업의 재시도 가능 시각
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<AnalysisJob {self.id} {self.status}>"
+
+    def to_dict(self):
+        """딕셔너리로 변환"""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "image_id": self.image_id,
+            "result": self.result,
+            "error": self.error,
+            "attempts": self.attempts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -15,7 +15,8 @@ class ImageUpload(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
-    image_url = Column(String)  # 저장된 이미지 경로 (추후 구현)
+    image_url = Column(String)  # 저장된 이미지 조회 URL (/api/images/{id}/file)
+    content_hash = Column(String(64), index=True)  # 이미지 저장소 블롭 키 (SHA-256)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
 
     # 관계 (selectin 로딩: to_dict()에서 ingredients 접근 시 N+1 방지)
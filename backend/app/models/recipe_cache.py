@@ -0,0 +1,40 @@
+"""
+레시피 생성 결과 캐시(RecipeCacheEntry) 모델
+"""
+from sqlalchemy import Column, String, JSON, Integer, DateTime
+from datetime import datetime
+import uuid
+
+from app.db.database import Base
+
+
+class RecipeCacheEntry(Base):
+    """정규화한 재료 집합 + 선호도 + 모델 기준 레시피 생성 결과 캐시"""
+    __tablename__ = "recipe_cache"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    cache_key = Column(String(64), nullable=False, unique=True, index=True)  # 정규화 요청의 SHA-256
+    model = Column(String, nullable=False)
+    ingredients = Column(JSON, nullable=False)  # 정규화된 재료 이름 (정렬, 중복 제거)
+    preferences = Column(JSON, nullable=True)  # 키에 반영된 선호도 필드
+    result = Column(JSON, nullable=False)  # {"recipes": [...]}
+    hit_count = Column(Integer, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        """관리자 조회용 딕셔너리 변환 (결과 본문 제외)"""
+        return {
+            "key": self.cache_key,
+            "model": self.model,
+            "ingredients": self.ingredients,
+            "preferences": self.preferences,
+            "recipe_count": len((self.result or {}).get("recipes") or []),
+            "hit_count": self.hit_count,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "last_used_at": self.last_used_at.isoformat() if self.last_used_at else None
+        }
+
+    def __repr__(self):
+        return f"<RecipeCacheEntry {self.cache_key[:12]} {self.model}>"
@@ -0,0 +1,166 @@
+"""
+업스트림 모델 호출 승인(admission) 제어
+
+단일 GPU 모델 앞에 동시 실행 수 제한 + 최대 대기열 길이를 두어,
+요청 폭주 시 모두가 타임아웃될 때까지 쌓이지 않고 즉시 거절(503 + Retry-After)되도록 합니다.
+대기 시간 추정은 최근 처리 시간(service time)의 평균을 사용합니다.
+호출이 취소되면(클라이언트 연결 종료 등) 평균 처리 시간 대비 남은 시간을 절약된 GPU 시간으로 추정합니다.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ServiceOverloadedError(Exception):
+    """대기열이 가득 차 요청을 받을 수 없음"""
+
+    def __init__(self, message: str, retry_after: int, queue_position: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.queue_position = queue_position
+
+
+class AdmissionController:
+    """동시 실행 수와 대기열 길이를 제한하는 FIFO 스케줄러"""
+
+    def __init__(
+        self,
+        name: str,
+        max_inflight: int,
+        max_queue: int,
+        default_service_time: float = 30.0,
+        window: int = 50
+    ):
+        self.name = name
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.default_service_time = default_service_time
+
+        self._semaphore = asyncio.Semaphore(max_inflight)
+        self._inflight = 0
+        self._waiting = 0
+        self._service_times = deque(maxlen=window)
+
+        # 통계
+        self._admitted = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._failed = 0
+        self._saved_seconds = 0.0  # 취소로 절약된 모델 처리 시간 추정치
+
+    @property
+    def inflight(self) -> int:
+        """실행 중인 요청 수"""
+        return self._inflight
+
+    @property
+    def queue_depth(self) -> int:
+        """대기 중인 요청 수"""
+        return self._waiting
+
+    def average_service_time(self) -> float:
+        """최근 처리 시간 평균 (기록이 없으면 기본값)"""
+        if not self._service_times:
+            return self.default_service_time
+        return sum(self._service_times) / len(self._service_times)
+
+    def estimate_wait(self, queue_position: int) -> float:
+        """대기열 position번째 요청이 실행되기까지 예상 대기 시간 (초)"""
+        rounds = math.ceil(queue_position / self.max_inflight)
+        return rounds * self.average_service_time()
+
+    def expected_wait(self) -> float:
+        """지금 들어오는 요청이 실행되기까지 예상 대기 시간 (초, 빈 슬롯이 있으면 0)"""
+        if not self._semaphore.locked():
+            return 0.0
+        return self.estimate_wait(self._waiting + 1)
+
+    def ensure_capacity(self) -> None:
+        """
+        대기열에 자리가 있는지 미리 확인 (슬롯을 점유하지 않음)
+
+        스트리밍 응답처럼 응답을 시작한 뒤에는 503을 보낼 수 없는 경우,
+        응답 시작 전에 호출하여 과부하를 빠르게 알립니다.
+
+        Raises:
+            ServiceOverloadedError: 대기열이 가득 찬 경우
+        """
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            self._rejected += 1
+            position = self._waiting + 1
+            retry_after = max(1, math.ceil(self.estimate_wait(position)))
+            logger.warning(
+                f"{self.name} 대기열 초과로 요청 거절 - 실행 중: {self._inflight}, "
+                f"대기: {self._waiting}, 예상 대기: {retry_after}초"
+            )
+            raise ServiceOverloadedError(
+                f"요청이 많아 처리할 수 없습니다. 약 {retry_after}초 후 다시 시도해주세요.",
+                retry_after=retry_after,
+                queue_position=position
+            )
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        실행 슬롯 획득 (async with)
+
+        Raises:
+            ServiceOverloadedError: 대기열이 가득 찬 경우 (대기 없이 즉시)
+        """
+        self.ensure_capacity()
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        except asyncio.CancelledError:
+            # 대기 중 취소: 실행했다면 쓰였을 처리 시간 전체를 절약
+            self._record_cancel(self.average_service_time())
+            raise
+        finally:
+            self._waiting -= 1
+
+        self._inflight += 1
+        self._admitted += 1
+        started = time.monotonic()
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit):
+            # 실행 중 취소: 평균 처리 시간 중 남은 부분을 절약으로 추정 (처리 시간 통계에는 넣지 않음)
+            elapsed = time.monotonic() - started
+            self._record_cancel(max(0.0, self.average_service_time() - elapsed))
+            raise
+        except Exception:
+            # 실패한 호출(연결 실패/HTTP 오류/타임아웃)의 소요 시간은 대기 시간 추정을 왜곡하므로 제외
+            self._failed += 1
+            raise
+        else:
+            self._service_times.append(time.monotonic() - started)
+        finally:
+            self._inflight -= 1
+            self._semaphore.release()
+
+    def _record_cancel(self, saved_seconds: float) -> None:
+        self._cancelled += 1
+        self._saved_seconds += saved_seconds
+
+    def stats(self) -> Dict:
+        """스케줄러 통계"""
+        return {
+            "max_inflight": self.max_inflight,
+            "max_queue": self.max_queue,
+            "inflight": self._inflight,
+            "queue_depth": self._waiting,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "cancelled": self._cancelled,
+            "failed": self._failed,
+            "estimated_seconds_saved": round(self._saved_seconds, 1),
+            "avg_service_time": round(self.average_service_time(), 3)
+        }
@@ -0,0 +1,181 @@
+"""
+이미지 분석 결과 캐시 서비스
+
+같은(또는 거의 같은) 냉장고 사진이 다시 업로드되면 30~240초 걸리는 모델 호출 대신
+DB에 저장된 재료 인식 결과를 반환합니다.
+- 키: 정규화 이미지의 dHash + 모델 + 프롬프트(SHA-256)
+- 조회: 정확히 일치하는 해시 우선(인덱스), 없으면 해밍 거리 임계값 이내의 가장 가까운 항목
+- 정리: TTL 만료 항목 삭제 + 최대 개수 초과 시 최근 사용(LRU) 순으로 삭제
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.analysis_cache import AnalysisCacheEntry
+from app.utils.image_utils import hamming_distance
+from app.utils.llm_json import PARSE_REPAIRED
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AnalysisCache:
+    """지각 해시 기반 분석 결과 캐시"""
+
+    def __init__(self):
+        self.enabled = settings.ANALYSIS_CACHE_ENABLED
+        self.max_distance = settings.ANALYSIS_CACHE_MAX_DISTANCE
+        self.ttl = timedelta(hours=settings.ANALYSIS_CACHE_TTL_HOURS)
+        self.max_entries = settings.ANALYSIS_CACHE_MAX_ENTRIES
+
+        # 통계
+        self._exact_hits = 0
+        self._near_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _prompt_hash(prompt: str) -> str:
+        """프롬프트 해시"""
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    async def lookup(
+        self,
+        db: AsyncSession,
+        image_hash: str,
+        model: str,
+        prompt: str
+    ) -> Optional[Dict]:
+        """
+        캐시된 분석 결과 조회
+
+        Args:
+            db: 데이터베이스 세션
+            image_hash: 정규화 이미지의 dHash
+            model: 분석 모델 이름
+            prompt: 분석 프롬프트
+
+        Returns:
+            캐시된 결과 (없으면 None)
+        """
+        if not self.enabled:
+            return None
+
+        conditions = (
+            AnalysisCacheEntry.model == model,
+            AnalysisCacheEntry.prompt_hash == self._prompt_hash(prompt),
+            AnalysisCacheEntry.created_at >= datetime.utcnow() - self.ttl,
+        )
+
+        # 1. 정확히 일치 (인덱스 조회)
+        result = await db.execute(
+            select(AnalysisCacheEntry)
+            .where(AnalysisCacheEntry.image_hash == image_hash, *conditions)
+            .limit(1)
+        )
+        entry = result.scalar_one_or_none()
+        distance = 0
+
+        # 2. 해밍 거리 임계값 이내의 가장 가까운 항목
+        if entry is None and self.max_distance > 0:
+            candidates = await db.execute(
+                select(AnalysisCacheEntry.id, AnalysisCacheEntry.image_hash).where(*conditions)
+            )
+            best = min(
+                ((hamming_distance(image_hash, candidate_hash), entry_id)
+                 for entry_id, candidate_hash in candidates),
+                default=None
+            )
+            if best is not None and best[0] <= self.max_distance:
+                distance = best[0]
+                entry = await db.get(AnalysisCacheEntry, best[1])
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if distance == 0:
+            self._exact_hits += 1
+        else:
+            self._near_hits += 1
+
+        # LRU 갱신 (호출 측 커밋 시 함께 반영)
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_used_at = datetime.utcnow()
+
+        logger.info(f"분석 결과 캐시 적중 - 해시: {image_hash}, 거리: {distance}")
+        return {
+            **entry.result,
+            "model": model,
+            "cache": {"hash": entry.image_hash, "distance": distance}
+        }
+
+    async def store(
+        self,
+        db: AsyncSession,
+        image_hash: str,
+        model: str,
+        prompt: str,
+        result: Dict
+    ) -> None:
+        """
+        분석 결과 저장 (호출 측 커밋 시 함께 반영)
+
+        Args:
+            db: 데이터베이스 세션
+            image_hash: 정규화 이미지의 dHash
+            model: 분석 모델 이름
+            prompt: 분석 프롬프트
+            result: 분석 결과
+        """
+        ingredients = result.get("ingredients") or []
+        # 빈 결과는 파싱 실패일 수 있고, 잘린 응답에서 복구한 결과는 일부 재료가 빠졌을 수 있으므로 캐시하지 않음
+        if not self.enabled or not ingredients or result.get("parse_quality") == PARSE_REPAIRED:
+            return
+
+        await self.evict(db)
+        db.add(AnalysisCacheEntry(
+            image_hash=image_hash,
+            model=model,
+            prompt_hash=self._prompt_hash(prompt),
+            result={"ingredients": ingredients}
+        ))
+
+    async def evict(self, db: AsyncSession) -> None:
+        """TTL 만료 항목과 최대 개수 초과분(LRU) 삭제"""
+        await db.execute(
+            delete(AnalysisCacheEntry)
+            .where(AnalysisCacheEntry.created_at < datetime.utcnow() - self.ttl)
+        )
+
+        count_result = await db.execute(select(func.count()).select_from(AnalysisCacheEntry))
+        overflow = count_result.scalar() - self.max_entries + 1
+        if overflow > 0:
+            oldest = (
+                select(AnalysisCacheEntry.id)
+                .order_by(AnalysisCacheEntry.last_used_at.asc())
+                .limit(overflow)
+            )
+            await db.execute(
+                delete(AnalysisCacheEntry).where(AnalysisCacheEntry.id.in_(oldest))
+            )
+            logger.info(f"분석 결과 캐시 LRU 정리 - {overflow}개 삭제")
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        lookups = self._exact_hits + self._near_hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "max_distance": self.max_distance,
+            "exact_hits": self._exact_hits,
+            "near_hits": self._near_hits,
+            "misses": self._misses,
+            "hit_rate": round((self._exact_hits + self._near_hits) / lookups, 3) if lookups else 0.0
+        }
+
+
+# 애플리케이션 전역 인스턴스
+analysis_cache = AnalysisCache()
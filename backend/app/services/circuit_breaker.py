@@ -0,0 +1,228 @@
+"""
+업스트림별 서킷 브레이커
+
+최근 호출의 오류율과 느린 호출 비율을 보고 업스트림이 비정상이면 회로를 열어(open)
+일정 시간 동안 호출 없이 즉시 실패시킵니다. 대기 시간이 지나면 반열림(half-open) 상태에서
+시험 호출을 허용하고, 성공하면 닫고(closed) 실패하면 다시 엽니다.
+
+    closed ──(오류율/느린 호출 비율 초과)──▶ open ──(open_seconds 경과)──▶ half-open
+      ▲                                        ▲                              │
+      └──────────────(시험 호출 성공)───────────┼──────────(시험 호출 실패)───┘
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from app.utils.deadline import Deadline, current_deadline
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 업스트림 호출을 하지 않음"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    업스트림 장애로 볼 오류인지 판단
+
+    타임아웃/네트워크 오류, 5xx, 429는 장애로 보고 그 외 4xx(요청 자체의 문제)는 제외합니다.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return True
+
+
+class CircuitBreaker:
+    """오류율 + 느린 호출 비율 기반 서킷 브레이커"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: Optional[float] = None,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        is_failure: Callable[[BaseException], bool] = is_upstream_failure
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure
+
+        self._state = self.CLOSED
+        self._outcomes = deque(maxlen=window)  # (실패 여부, 느린 호출 여부)
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+        # 통계
+        self._short_circuited = 0
+        self._opened_count = 0
+        self._last_opened_reason: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (open 대기 시간이 지나면 half-open으로 전환)"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"{self.name} 서킷 브레이커 반열림 - 시험 호출 허용")
+        return self._state
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.open_seconds - (time.monotonic() - self._opened_at)))
+
+    def check(self) -> None:
+        """
+        회로가 열려 있으면 즉시 실패 (반열림 시험 호출 자리는 점유하지 않음)
+
+        대기열에 들어가기 전 빠른 거절용입니다.
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있는 경우
+        """
+        if self.state == self.OPEN:
+            self._short_circuited += 1
+            retry_after = self._retry_after()
+            raise CircuitOpenError(
+                f"{self.name} 서비스가 일시적으로 불안정합니다. 약 {retry_after}초 후 다시 시도해주세요.",
+                retry_after=retry_after
+            )
+
+    def before_call(self) -> None:
+        """
+        호출 허용 여부 확인
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 반열림 시험 호출이 이미 진행 중인 경우
+        """
+        self.check()
+        if self._state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self._short_circuited += 1
+                raise CircuitOpenError(
+                    f"{self.name} 서비스 상태를 확인하는 중입니다. 잠시 후 다시 시도해주세요.",
+                    retry_after=1
+                )
+            self._half_open_calls += 1
+
+    def record_success(self, duration: float) -> None:
+        """성공 호출 기록 (느린 호출 판단 포함)"""
+        slow = self.slow_call_seconds is not None and duration >= self.slow_call_seconds
+        if self._state == self.HALF_OPEN:
+            if slow:
+                self._trip(f"시험 호출이 느림 ({duration:.1f}초)")
+            else:
+                self._close()
+            return
+        self._outcomes.append((False, slow))
+        self._evaluate()
+
+    def record_failure(self, duration: float) -> None:
+        """실패 호출 기록"""
+        if self._state == self.HALF_OPEN:
+            self._trip("시험 호출 실패")
+            return
+        self._outcomes.append((True, False))
+        self._evaluate()
+
+    def release(self) -> None:
+        """결과 없이 끝난 호출 (취소 등) - 반열림 시험 호출 자리만 반환"""
+        if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def _evaluate(self) -> None:
+        if self._state != self.CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        total = len(self._outcomes)
+        failure_rate = sum(1 for failed, _ in self._outcomes if failed) / total
+        slow_rate = sum(1 for _, slow in self._outcomes if slow) / total
+        if failure_rate >= self.failure_rate_threshold:
+            self._trip(f"오류율 {failure_rate:.0%}")
+        elif self.slow_call_seconds is not None and slow_rate >= self.slow_call_rate_threshold:
+            self._trip(f"느린 호출 비율 {slow_rate:.0%}")
+
+    def _trip(self, reason: str) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._half_open_calls = 0
+        self._opened_count += 1
+        self._last_opened_reason = reason
+        logger.warning(f"{self.name} 서킷 브레이커 열림 - {reason}, {self.open_seconds:.0f}초간 즉시 실패")
+
+    def _close(self) -> None:
+        self._state = self.CLOSED
+        self._outcomes.clear()
+        self._half_open_calls = 0
+        logger.info(f"{self.name} 서킷 브레이커 닫힘 - 정상 복구")
+
+    @asynccontextmanager
+    async def call(self, deadline: Optional[Deadline] = None):
+        """
+        업스트림 호출 감싸기 (async with)
+
+        요청 마감 시간 때문에 잘린 호출(시도 타임아웃이 남은 시간으로 줄어든 경우)은
+        업스트림 장애로 보지 않고 기록하지 않습니다.
+
+        Args:
+            deadline: 요청 마감 시간 (기본값: 현재 컨텍스트의 마감 시간)
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있는 경우 (호출 없이 즉시)
+        """
+        deadline = deadline or current_deadline()
+        self.before_call()
+        started = time.monotonic()
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit):
+            self.release()
+            raise
+        except Exception as e:
+            if deadline is not None and deadline.expired:
+                self.release()
+            elif self.is_failure(e):
+                self.record_failure(time.monotonic() - started)
+            else:
+                self.record_success(time.monotonic() - started)
+            raise
+        else:
+            self.record_success(time.monotonic() - started)
+
+    def stats(self) -> Dict:
+        """브레이커 상태"""
+        state = self.state
+        total = len(self._outcomes)
+        return {
+            "state": state,
+            "retry_after": self._retry_after() if state == self.OPEN else 0,
+            "recent_calls": total,
+            "failure_rate": round(sum(1 for failed, _ in self._outcomes if failed) / total, 3) if total else 0.0,
+            "slow_call_rate": round(sum(1 for _, slow in self._outcomes if slow) / total, 3) if total else 0.0,
+            "opened_count": self._opened_count,
+            "last_opened_reason": self._last_opened_reason,
+            "short_circuited": self._short_circuited
+        }
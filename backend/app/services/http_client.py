@@ -0,0 +1,110 @@
+"""
+업스트림 HTTP 클라이언트 관리
+
+업스트림(Ollama, OpenRouter)마다 하나의 httpx.AsyncClient를 애플리케이션 수명 동안
+공유하여 커넥션 풀(keep-alive)을 재사용합니다.
+- 요청마다 클라이언트를 만들면 Limits 설정이 무의미하고 매번 TCP/TLS 핸드셰이크가 발생
+- 클라이언트는 main.py의 lifespan에서 생성/종료 (미시작 상태에서 호출되면 지연 생성)
+- httpcore trace 이벤트로 신규 연결 수를 세어 재사용(핸드셰이크 절감) 통계를 제공
+"""
+from typing import Dict, Optional
+
+import httpx
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UpstreamClient:
+    """업스트림별 공유 httpx.AsyncClient 래퍼"""
+
+    def __init__(
+        self,
+        name: str,
+        timeout: httpx.Timeout,
+        limits: httpx.Limits,
+        http2: bool = False
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.limits = limits
+        self.http2 = http2
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # 풀 통계
+        self._requests = 0
+        self._new_connections = 0
+        self._tls_handshakes = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """공유 클라이언트 (미시작 상태면 지연 생성)"""
+        if self._client is None or self._client.is_closed:
+            self.start()
+        return self._client
+
+    def start(self) -> None:
+        """클라이언트 생성"""
+        if self._client is not None and not self._client.is_closed:
+            return
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2
+        )
+        logger.info(
+            f"HTTP 클라이언트 시작 - {self.name} "
+            f"(max_connections={self.limits.max_connections}, "
+            f"max_keepalive={self.limits.max_keepalive_connections}, http2={self.http2})"
+        )
+
+    async def aclose(self) -> None:
+        """클라이언트 종료 (풀의 모든 연결 정리)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info(f"HTTP 클라이언트 종료 - {self.name}")
+        self._client = None
+
+    async def _trace(self, event_name: str, info: Dict) -> None:
+        """httpcore trace 콜백: 신규 연결/TLS 핸드셰이크 집계"""
+        if event_name == "connection.connect_tcp.complete":
+            self._new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            self._tls_handshakes += 1
+
+    def request_extensions(self) -> Dict:
+        """요청에 붙일 extensions (trace 콜백 포함)"""
+        self._requests += 1
+        return {"trace": self._trace}
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """공유 클라이언트로 POST 요청"""
+        return await self.client.post(url, extensions=self.request_extensions(), **kwargs)
+
+    def stream(self, method: str, url: str, **kwargs):
+        """공유 클라이언트로 스트리밍 요청 (async with 컨텍스트 반환)"""
+        return self.client.stream(method, url, extensions=self.request_extensions(), **kwargs)
+
+    def stats(self) -> Dict:
+        """커넥션 풀 통계"""
+        idle = active = 0
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        for connection in getattr(pool, "connections", []):
+            if connection.is_idle():
+                idle += 1
+            elif not connection.is_closed():
+                active += 1
+
+        return {
+            "started": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "idle_connections": idle,
+            "active_connections": active,
+            "requests": self._requests,
+            "new_connections": self._new_connections,
+            "tls_handshakes": self._tls_handshakes,
+            "handshakes_avoided": max(self._requests - self._new_connections, 0)
+        }
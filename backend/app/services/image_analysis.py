@@ -0,0 +1,406 @@
+"""
+이미지 분석 파이프라인 (동기 API / 스트리밍 API / 비동기 작업 워커 공용)
+
+캐시 조회 → 티어 선택 → 모델 호출 → 캐시 저장, 정규화 이미지와 재료 저장을 한곳에서 처리합니다.
+빠른 티어로 응답한 결과는 대형 모델에 여유가 생기면 백그라운드에서 다시 분석해 재료를 갱신합니다.
+캐스케이드(스트리밍/비동기 작업): 저해상도 미리보기를 먼저 분석해 예비 결과를 보내고,
+전체 해상도 결과에 미리보기에서만 찾은 고신뢰 재료를 합쳐 최종 결과로 사용합니다.
+미리보기 모델의 대기열에 기다리는 요청이 있으면 미리보기를 건너뛰어 전체 해상도 분석이 늦어지지 않게 합니다.
+트레이드오프: 미리보기는 전체 해상도 분석보다 먼저 순서대로 실행되므로, 대기열이 비어 있어도 최종 결과는
+미리보기 호출 시간만큼 늦어집니다 (첫 결과는 빨라지고 전체 시간은 늘어남, 스텁 기준 동기 1.3초 → 스트리밍 2.7초).
+전체 시간이 중요하면 CASCADE_ENABLED=false로 끕니다.
+"""
+import asyncio
+import base64
+import time
+from collections import Counter
+from contextlib import nullcontext
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models import ImageUpload, Ingredient
+from app.services.admission import ServiceOverloadedError
+from app.services.analysis_cache import analysis_cache
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.image_store import image_store
+from app.services.model_tiering import FAST_TIER, FULL_TIER, tiering_policy
+from app.services.ollama_profiles import PREVIEW
+from app.services.ollama_service import ollama_service
+from app.services.openrouter_service import openrouter_service
+from app.utils.deadline import Deadline, DeadlineExceededError
+from app.utils.image_utils import ProcessedImage
+from app.utils.llm_json import PARSE_OK
+from app.utils.logger import get_logger
+from app.utils.metrics import RollingStats
+
+logger = get_logger(__name__)
+
+
+class ImageAnalysisService:
+    """이미지 분석 및 결과 저장"""
+
+    def __init__(self):
+        self._refine_tasks = set()
+        self._refine_outcomes = Counter()
+        # 캐스케이드 지표: 미리보기 결과까지 걸린 시간 (초) / 결과 수
+        self.preview_latency = RollingStats()
+        self._cascade_outcomes = Counter()
+
+    @staticmethod
+    def build_ingredients(ingredients_data: List[Dict], image_id: str) -> List[Ingredient]:
+        """분석 결과를 Ingredient 모델 목록으로 변환"""
+        return [
+            Ingredient(
+                name=ing_data.get("name"),
+                quantity=ing_data.get("quantity"),
+                freshness=ing_data.get("freshness", "moderate"),
+                confidence=ing_data.get("confidence", 0.8),
+                image_id=image_id
+            )
+            for ing_data in ingredients_data
+            if ing_data.get("name")
+        ]
+
+    async def analyze(
+        self,
+        db: AsyncSession,
+        processed: ProcessedImage,
+        custom_prompt: Optional[str] = None,
+        on_preview: Optional[Callable[[Dict], Awaitable[None]]] = None
+    ) -> Dict:
+        """
+        캐시 조회 후 없으면 Ollama로 분석하고 결과를 캐시에 저장
+
+        Args:
+            db: 데이터베이스 세션
+            processed: 전처리된 이미지
+            custom_prompt: 커스텀 프롬프트 (optional)
+            on_preview: 캐스케이드 미리보기 결과 콜백 (optional, 있으면 전체 해상도 분석 전에 호출)
+
+        Returns:
+            분석 결과 ("tier" 키 포함, 캐시 적중 시 "cache" 키 포함)
+
+        Raises:
+            ServiceOverloadedError: 모델 대기열이 가득 찬 경우
+        """
+        prompt = ollama_service.build_analysis_prompt(custom_prompt)
+        result = await analysis_cache.lookup(
+            db, processed.dhash, ollama_service.image_model, prompt
+        )
+        if result is not None:
+            return {**result, "tier": FULL_TIER}
+
+        tier, reason = tiering_policy.choose()
+        if tier == FAST_TIER:
+            result = await self._analyze_fast(db, processed, custom_prompt, prompt, reason)
+            if result is not None:
+                return result
+
+        preview = None
+        if on_preview is not None:
+            preview = await self.preview(processed, custom_prompt)
+            if preview is not None:
+                await on_preview(preview)
+
+        result = await ollama_service.analyze_image(processed.base64, custom_prompt=custom_prompt)
+        if preview is not None:
+            result = {**result, "ingredients": self.merge_cascade(preview["ingredients"], result.get("ingredients", []))}
+        await analysis_cache.store(
+            db, processed.dhash, ollama_service.image_model, prompt, result
+        )
+        return {**result, "tier": FULL_TIER}
+
+    async def preview(
+        self,
+        processed: ProcessedImage,
+        custom_prompt: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Optional[Dict]:
+        """
+        캐스케이드 1단계: 저해상도 미리보기 분석 (실패/시간 초과 시 None, 전체 해상도 분석은 계속 진행)
+
+        미리보기 모델 대기열에 대기 중인 요청이 있거나 예상 대기 시간이 CASCADE_PREVIEW_TIMEOUT보다 길면
+        건너뜁니다. CASCADE_PREVIEW_TIMEOUT은 슬롯을 얻은 뒤의 모델 호출 시간에만 적용됩니다.
+        CASCADE_PREVIEW_MODEL이 대형 모델과 다르면 빠른 모델 슬롯을 사용합니다.
+
+        Args:
+            processed: 전처리된 이미지 (preview 포함)
+            custom_prompt: 커스텀 프롬프트 (optional)
+            deadline: 요청 마감 시간 (optional, 스트리밍 생성기처럼 컨텍스트를 쓸 수 없는 경우)
+
+        Returns:
+            {"ingredients": [...], "model": ..., "duration": ..., "size": ...} 또는 None
+        """
+        if not settings.CASCADE_ENABLED or processed.preview is None:
+            return None
+
+        model = settings.CASCADE_PREVIEW_MODEL or ollama_service.image_model
+        admission = ollama_service.admission_for(model)
+        if admission.queue_depth > 0 or admission.expected_wait() > settings.CASCADE_PREVIEW_TIMEOUT:
+            self._cascade_outcomes["preview_skipped_busy"] += 1
+            logger.info(f"{admission.name} 대기열이 밀려 있어 미리보기 분석 건너뜀 - 전체 해상도 분석만 진행")
+            return None
+
+        started = time.monotonic()
+        try:
+            with deadline or nullcontext():
+                result = await ollama_service.analyze_image(
+                    processed.preview_base64,
+                    custom_prompt=custom_prompt,
+                    model=model,
+                    profile=PREVIEW,
+                    call_timeout=settings.CASCADE_PREVIEW_TIMEOUT
+                )
+        except asyncio.TimeoutError:
+            self._cascade_outcomes["preview_timeout"] += 1
+            logger.warning(f"미리보기 분석 시간 초과 ({settings.CASCADE_PREVIEW_TIMEOUT:g}초) - 전체 해상도 분석만 진행")
+            return None
+        except Exception as e:
+            self._cascade_outcomes["preview_failed"] += 1
+            logger.warning(f"미리보기 분석 실패 - 전체 해상도 분석만 진행: {str(e)}")
+            return None
+
+        duration = time.monotonic() - started
+        self.preview_latency.observe(duration)
+        self._cascade_outcomes["preview"] += 1
+        logger.info(f"미리보기 분석 완료 - 재료 {len(result.get('ingredients', []))}개, {duration:.1f}초")
+        return {
+            "ingredients": result.get("ingredients", []),
+            "model": result.get("model"),
+            "duration": duration,
+            "size": settings.CASCADE_PREVIEW_SIZE
+        }
+
+    def merge_cascade(self, preview_ingredients: List[Dict], full_ingredients: List[Dict]) -> List[Dict]:
+        """
+        전체 해상도 결과에 미리보기에서만 찾은 고신뢰 재료 추가
+
+        전체 해상도 결과를 우선하고, 미리보기 재료는 이름이 겹치지 않고
+        신뢰도가 CASCADE_KEEP_PREVIEW_CONFIDENCE 이상일 때만 유지합니다.
+        """
+        def key(ingredient: Dict) -> str:
+            return "".join(str(ingredient.get("name", "")).split())
+
+        seen = {key(ing) for ing in full_ingredients}
+        kept = []
+        for ing in preview_ingredients:
+            confidence = ing.get("confidence")
+            if (
+                key(ing) and key(ing) not in seen
+                and isinstance(confidence, (int, float))
+                and confidence >= settings.CASCADE_KEEP_PREVIEW_CONFIDENCE
+            ):
+                seen.add(key(ing))
+                kept.append(ing)
+
+        self._cascade_outcomes["preview_only_kept"] += len(kept)
+        return list(full_ingredients) + kept
+
+    async def _analyze_fast(
+        self,
+        db: AsyncSession,
+        processed: ProcessedImage,
+        custom_prompt: Optional[str],
+        prompt: str,
+        reason: str
+    ) -> Optional[Dict]:
+        """빠른 티어로 분석 (실패하면 None을 반환해 대형 모델로 진행)"""
+        model = tiering_policy.fast_model
+        logger.info(f"빠른 티어로 분석 - 모델: {model}, 사유: {reason}")
+
+        result = await analysis_cache.lookup(db, processed.dhash, model, prompt)
+        if result is None:
+            try:
+                if settings.FAST_TIER_BACKEND == "openrouter":
+                    result = await openrouter_service.analyze_image(processed.base64, prompt)
+                else:
+                    result = await ollama_service.analyze_image(
+                        processed.base64, custom_prompt=custom_prompt, model=model
+                    )
+            except (DeadlineExceededError, asyncio.CancelledError):
+                raise
+            except Exception as e:
+                logger.warning(f"빠른 티어 분석 실패, 대형 모델로 진행: {str(e)}")
+                return None
+            await analysis_cache.store(db, processed.dhash, model, prompt, result)
+
+        return {**result, "tier": FAST_TIER, "tier_reason": reason}
+
+    async def persist(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        processed: ProcessedImage,
+        ingredients_data: List[Dict]
+    ) -> Tuple[ImageUpload, List[Ingredient]]:
+        """
+        정규화 이미지와 분석 결과 저장 (커밋은 호출자가 수행)
+
+        Returns:
+            (이미지 업로드 레코드, 저장된 재료 목록)
+        """
+        # 정규화 이미지 저장 (콘텐츠 주소 기반, 중복 제거)
+        content_hash = await image_store.save(processed.data)
+        image_upload = ImageUpload(user_id=user_id, content_hash=content_hash)
+        db.add(image_upload)
+        await db.flush()  # ID 생성
+        image_upload.image_url = f"/api/images/{image_upload.id}/file"
+        logger.debug(f"이미지 업로드 레코드 생성 - ID: {image_upload.id}, 해시: {content_hash}")
+
+        saved_ingredients = self.build_ingredients(ingredients_data, image_upload.id)
+        db.add_all(saved_ingredients)
+        return image_upload, saved_ingredients
+
+    @staticmethod
+    def build_response(
+        image_upload: ImageUpload,
+        saved_ingredients: List[Ingredient],
+        result: Dict,
+        processed: ProcessedImage
+    ) -> Dict:
+        """분석 API 응답 생성"""
+        return {
+            "success": True,
+            "image_id": image_upload.id,
+            "image_url": image_upload.image_url,
+            "ingredients": [ing.to_dict() for ing in saved_ingredients],
+            "total_count": len(saved_ingredients),
+            "model": result.get("model", ollama_service.image_model),  # 사용된 모델 정보
+            "cached": "cache" in result,
+            "processing_path": processed.path,  # transcode | passthrough
+            "tier": result.get("tier", FULL_TIER),  # full | fast (빠른 모델이 응답)
+            "refining": result.get("tier") == FAST_TIER and settings.TIERING_REFINE,  # 대형 모델 재분석 예정
+            "parse_quality": result.get("parse_quality", PARSE_OK)  # ok | extracted | repaired | failed
+        }
+
+    @staticmethod
+    def _snapshot(ingredients: List[Ingredient]) -> List[Tuple]:
+        """사용자 수정 여부 비교용 재료 상태"""
+        return sorted((ing.id, ing.name, ing.quantity, ing.freshness) for ing in ingredients)
+
+    def schedule_refine(
+        self,
+        image_upload: ImageUpload,
+        saved_ingredients: List[Ingredient],
+        result: Dict,
+        processed: ProcessedImage,
+        custom_prompt: Optional[str] = None
+    ) -> bool:
+        """
+        빠른 티어 결과를 대형 모델로 다시 분석하도록 예약 (커밋 후 호출)
+
+        Returns:
+            예약 여부
+        """
+        if result.get("tier") != FAST_TIER or not settings.TIERING_REFINE:
+            return False
+        if len(self._refine_tasks) >= settings.TIERING_REFINE_MAX_PENDING:
+            self._refine_outcomes["dropped"] += 1
+            logger.warning(f"재분석 대기가 가득 차 건너뜀 - 이미지: {image_upload.id}")
+            return False
+
+        task = asyncio.create_task(self._refine(
+            image_upload.id, self._snapshot(saved_ingredients), processed.dhash, custom_prompt
+        ))
+        self._refine_tasks.add(task)
+        task.add_done_callback(self._refine_tasks.discard)
+        self._refine_outcomes["scheduled"] += 1
+        return True
+
+    async def _refine(
+        self,
+        image_id: str,
+        snapshot: List[Tuple],
+        dhash: str,
+        custom_prompt: Optional[str]
+    ) -> None:
+        """대형 모델에 여유가 생기면 다시 분석해 재료 교체 (그사이 사용자가 수정했으면 건너뜀)"""
+        give_up_at = time.monotonic() + settings.TIERING_REFINE_MAX_WAIT_SECONDS
+        try:
+            while True:
+                while not tiering_policy.has_spare_capacity():
+                    if time.monotonic() >= give_up_at:
+                        self._refine_outcomes["expired"] += 1
+                        logger.info(f"재분석 대기 시간 초과 - 이미지: {image_id}")
+                        return
+                    await asyncio.sleep(settings.TIERING_REFINE_POLL_INTERVAL)
+
+                async with AsyncSessionLocal() as db:
+                    image_upload = await db.get(ImageUpload, image_id)
+                    content_hash = image_upload.content_hash if image_upload else None
+                contents = await image_store.load(content_hash) if content_hash else None
+                if contents is None:
+                    self._refine_outcomes["skipped"] += 1
+                    return
+
+                try:
+                    result = await ollama_service.analyze_image(
+                        base64.b64encode(contents).decode("utf-8"), custom_prompt=custom_prompt
+                    )
+                    break
+                except (ServiceOverloadedError, CircuitOpenError):
+                    # 확인 직후 요청이 몰림: 다시 여유가 생기기를 기다림
+                    await asyncio.sleep(settings.TIERING_REFINE_POLL_INTERVAL)
+
+            async with AsyncSessionLocal() as db:
+                try:
+                    current = (await db.execute(
+                        select(Ingredient).where(Ingredient.image_id == image_id)
+                    )).scalars().all()
+                    if self._snapshot(current) != snapshot:
+                        self._refine_outcomes["skipped_edited"] += 1
+                        logger.info(f"사용자가 재료를 수정하여 재분석 결과 적용 안 함 - 이미지: {image_id}")
+                        return
+
+                    for ingredient in current:
+                        await db.delete(ingredient)
+                    db.add_all(self.build_ingredients(result.get("ingredients", []), image_id))
+                    prompt = ollama_service.build_analysis_prompt(custom_prompt)
+                    await analysis_cache.store(db, dhash, ollama_service.image_model, prompt, result)
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+
+            self._refine_outcomes["completed"] += 1
+            logger.info(f"대형 모델 재분석 완료 - 이미지: {image_id}, 재료 {len(result.get('ingredients', []))}개")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._refine_outcomes["failed"] += 1
+            logger.error(f"대형 모델 재분석 실패 - 이미지: {image_id}: {str(e)}", exc_info=True)
+
+    async def stop(self) -> None:
+        """대기 중인 재분석 취소 (종료 시)"""
+        tasks = list(self._refine_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """티어링/재분석 통계"""
+        return {
+            **tiering_policy.stats(),
+            "refine": {
+                "pending": len(self._refine_tasks),
+                **self._refine_outcomes
+            }
+        }
+
+    def cascade_stats(self) -> Dict:
+        """캐스케이드 미리보기 통계 (preview_latency: 첫 예비 결과까지 걸린 시간, 초)"""
+        return {
+            "enabled": settings.CASCADE_ENABLED,
+            "preview_size": settings.CASCADE_PREVIEW_SIZE,
+            "preview_latency": self.preview_latency.snapshot(),
+            **self._cascade_outcomes
+        }
+
+
+# 애플리케이션 전역 인스턴스
+image_analysis_service = ImageAnalysisService()
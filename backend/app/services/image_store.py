@@ -0,0 +1,165 @@
+"""
+콘텐츠 주소 기반(content-addressed) 이미지 저장소
+
+전처리된(정규화) JPEG을 SHA-256 해시를 키로 디스크에 한 번만 저장합니다.
+- 경로: {IMAGE_STORE_DIR}/ab/cd/abcd...(해시 전체) - 2단계 샤딩으로 디렉터리당 파일 수 제한
+- 같은 이미지는 사용자와 관계없이 하나의 파일로 중복 제거
+- 임시 파일에 쓴 뒤 os.replace로 원자적 교체 (부분 기록 파일이 노출되지 않음)
+- ImageUpload.content_hash 참조 수가 0인 블롭은 가비지 컬렉터가 삭제
+  (미완료 분석 작업의 입력 블롭 AnalysisJob.input_hash도 참조로 계산)
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.analysis_job import AnalysisJob
+from app.models.image_upload import ImageUpload
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ImageStore:
+    """SHA-256 콘텐츠 주소 기반 블롭 저장소"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """콘텐츠 해시 (SHA-256 hex)"""
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def is_valid_digest(digest: str) -> bool:
+        """SHA-256 hex 형식 여부 (경로 조작 방지)"""
+        return len(digest) == 64 and all(c in "0123456789abcdef" for c in digest)
+
+    def path_for(self, digest: str) -> Path:
+        """해시에 해당하는 블롭 경로"""
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def exists(self, digest: str) -> bool:
+        """블롭 존재 여부"""
+        return self.path_for(digest).is_file()
+
+    def put(self, data: bytes) -> str:
+        """
+        블롭 저장 (이미 있으면 쓰지 않음)
+
+        Args:
+            data: 저장할 바이트
+
+        Returns:
+            콘텐츠 해시
+        """
+        digest = self.digest(data)
+        path = self.path_for(digest)
+        if path.is_file():
+            # 중복 제거: GC 유예 기간 계산을 위해 수정 시각만 갱신
+            os.utime(path)
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return digest
+
+    async def save(self, data: bytes) -> str:
+        """블롭 저장 (파일 I/O는 스레드에서 실행)"""
+        return await asyncio.to_thread(self.put, data)
+
+    def read(self, digest: str) -> Optional[bytes]:
+        """블롭 읽기 (없으면 None)"""
+        path = self.path_for(digest)
+        return path.read_bytes() if path.is_file() else None
+
+    async def load(self, digest: str) -> Optional[bytes]:
+        """블롭 읽기 (파일 I/O는 스레드에서 실행)"""
+        return await asyncio.to_thread(self.read, digest)
+
+    def iter_digests(self) -> Iterator[str]:
+        """저장된 모든 블롭 해시"""
+        if not self.root.is_dir():
+            return
+        for path in self.root.glob("??/??/*"):
+            if path.is_file() and self.is_valid_digest(path.name):
+                yield path.name
+
+    async def collect_garbage(self, db: AsyncSession, grace_seconds: float = None) -> Dict:
+        """
+        참조되지 않는 블롭 삭제
+
+        ImageUpload.content_hash와 미완료 AnalysisJob.input_hash 기준 참조 수를 집계하여
+        0인 블롭을 삭제합니다.
+        방금 저장되어 아직 DB 커밋 전인 블롭을 지우지 않도록 유예 기간보다
+        오래된 파일만 대상으로 합니다.
+
+        Args:
+            db: 데이터베이스 세션
+            grace_seconds: 유예 기간 (기본값: settings.IMAGE_STORE_GC_GRACE_SECONDS)
+
+        Returns:
+            GC 결과 통계
+        """
+        if grace_seconds is None:
+            grace_seconds = settings.IMAGE_STORE_GC_GRACE_SECONDS
+
+        result = await db.execute(
+            select(ImageUpload.content_hash, func.count())
+            .where(ImageUpload.content_hash.isnot(None))
+            .group_by(ImageUpload.content_hash)
+        )
+        ref_counts = {digest: count for digest, count in result.all()}
+
+        # 아직 처리되지 않은 분석 작업의 입력 이미지
+        result = await db.execute(
+            select(AnalysisJob.input_hash, func.count())
+            .where(AnalysisJob.status.in_(AnalysisJob.ACTIVE_STATUSES))
+            .group_by(AnalysisJob.input_hash)
+        )
+        for digest, count in result.all():
+            ref_counts[digest] = ref_counts.get(digest, 0) + count
+
+        def sweep() -> Dict:
+            cutoff = time.time() - grace_seconds
+            scanned = deleted = freed = 0
+            for digest in self.iter_digests():
+                scanned += 1
+                if ref_counts.get(digest, 0) > 0:
+                    continue
+                path = self.path_for(digest)
+                stat = path.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                path.unlink(missing_ok=True)
+                deleted += 1
+                freed += stat.st_size
+            return {"scanned": scanned, "deleted": deleted, "freed_bytes": freed}
+
+        stats = await asyncio.to_thread(sweep)
+        stats["referenced"] = len(ref_counts)
+        logger.info(f"이미지 저장소 GC 완료 - {stats}")
+        return stats
+
+
+# 애플리케이션 전역 인스턴스
+image_store = ImageStore(settings.IMAGE_STORE_DIR)
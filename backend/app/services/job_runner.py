@@ -0,0 +1,433 @@
+"""
+비동기 이미지 분석 작업 실행기
+
+POST /api/images/jobs는 원본 업로드를 이미지 저장소에 보관하고 작업 레코드만 만든 뒤 즉시 202를 반환합니다.
+이 실행기의 워커들이 전처리 → 모델 분석 → 저장을 수행하고 결과를 작업 레코드에 기록합니다.
+
+analysis_jobs 테이블이 곧 대기열입니다 (API 노드 여러 대가 넣고 워커 여러 대가 꺼냄).
+- 점유: 조건부 UPDATE(queued 또는 임대 만료 상태일 때만)로 원자적으로 가져감 - rowcount로 성공 확인
+- 임대: lease_expires_at까지 점유, 실행 중에는 하트비트로 연장
+- 크래시: 하트비트가 끊겨 임대가 만료되면 다른 워커가 다시 가져감 (JOB_MAX_ATTEMPTS까지)
+- 완료 기록도 lease_owner가 자신일 때만 반영하므로 임대를 잃은 워커의 결과는 버려짐
+
+API 프로세스 안에서 실행하거나(JOB_EXECUTION_MODE=inprocess),
+Ollama 호스트 옆에서 `python -m app.worker`로 따로 실행할 수 있습니다 (external).
+별도 워커는 같은 DATABASE_URL과 IMAGE_STORE_DIR(공유 디렉터리)을 사용해야 합니다.
+"""
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models import AnalysisJob
+from app.services.admission import ServiceOverloadedError
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.image_analysis import image_analysis_service
+from app.services.image_store import image_store
+from app.utils.image_utils import process_image_bytes
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LeaseLostError(Exception):
+    """작업 임대를 잃음 (만료 후 다른 워커가 가져감)"""
+    pass
+
+
+def _claimable(now: datetime):
+    """점유 가능한 작업 조건: 대기 중(재시도 시각 경과) 또는 임대 만료된 실행 중 작업"""
+    return or_(
+        and_(
+            AnalysisJob.status == AnalysisJob.QUEUED,
+            or_(AnalysisJob.available_at.is_(None), AnalysisJob.available_at <= now)
+        ),
+        and_(
+            AnalysisJob.status == AnalysisJob.RUNNING,
+            or_(AnalysisJob.lease_expires_at.is_(None), AnalysisJob.lease_expires_at < now)
+        )
+    )
+
+
+class AnalysisJobRunner:
+    """DB 임대 기반 분석 작업 워커 풀"""
+
+    def __init__(
+        self,
+        workers: int,
+        lease_seconds: float = None,
+        heartbeat_interval: float = None,
+        max_attempts: int = None,
+        poll_interval: float = None
+    ):
+        self.workers = workers
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.heartbeat_interval = heartbeat_interval or settings.JOB_HEARTBEAT_INTERVAL
+        self.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+        self.poll_interval = poll_interval or settings.JOB_CLAIM_POLL_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._updates: Dict[str, asyncio.Event] = {}  # 작업별 상태 변경 알림 (SSE 대기용)
+
+        # 통계
+        self._claimed = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._deferred = 0
+        self._reclaimed = 0
+        self._lease_lost = 0
+
+    @property
+    def running(self) -> bool:
+        """워커 실행 여부"""
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """워커 시작 (미완료/임대 만료 작업은 점유 조건에 따라 자연히 다시 처리됨)"""
+        if self._tasks:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(index), name=f"analysis-job-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"분석 작업 워커 {self.workers}개 시작 - 워커 ID: {self.worker_id}")
+
+    async def stop(self) -> None:
+        """워커 종료 후 실행 중이던 작업의 임대 반환 (다른 워커가 바로 가져갈 수 있도록)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(AnalysisJob)
+                .where(
+                    AnalysisJob.status == AnalysisJob.RUNNING,
+                    AnalysisJob.lease_owner == self.worker_id
+                )
+                .values(
+                    status=AnalysisJob.QUEUED,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    started_at=None,
+                    attempts=AnalysisJob.attempts - 1
+                )
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.info(f"실행 중이던 분석 작업 {result.rowcount}개 임대 반환")
+
+    def submit(self, job_id: str) -> None:
+        """새 작업 알림 (레코드는 커밋된 상태여야 함) - 대기 중인 로컬 워커를 즉시 깨움"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def wait_for_update(self, job_id: str, timeout: float) -> None:
+        """작업 상태가 바뀌거나 timeout이 지날 때까지 대기 (다른 프로세스의 변경은 timeout 후 확인)"""
+        event = self._updates.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _notify(self, job_id: str) -> None:
+        event = self._updates.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _wait_for_work(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _claim(self) -> Optional[AnalysisJob]:
+        """
+        가장 오래된 점유 가능 작업 1건을 원자적으로 점유
+
+        후보를 조회한 뒤 같은 조건을 건 UPDATE로 점유합니다. 다른 워커가 먼저 가져가면
+        rowcount가 0이므로 다음 후보를 시도합니다.
+
+        Returns:
+            점유한 작업 (없으면 None)
+        """
+        async with AsyncSessionLocal() as db:
+            while True:
+                now = datetime.utcnow()
+                result = await db.execute(
+                    select(AnalysisJob.id, AnalysisJob.status, AnalysisJob.attempts)
+                    .where(_claimable(now))
+                    .order_by(AnalysisJob.created_at)
+                    .limit(1)
+                )
+                candidate = result.first()
+                if candidate is None:
+                    return None
+
+                job_id, status, attempts = candidate
+                reclaimed = status == AnalysisJob.RUNNING
+
+                # 임대 만료가 반복된 작업 (워커 크래시 유발 등) → 실패 처리
+                if (attempts or 0) >= self.max_attempts:
+                    result = await db.execute(
+                        update(AnalysisJob)
+                        .where(AnalysisJob.id == job_id, _claimable(now))
+                        .values(
+                            status=AnalysisJob.FAILED,
+                            error=f"최대 시도 횟수({self.max_attempts}회)를 초과했습니다.",
+                            lease_owner=None,
+                            lease_expires_at=None,
+                            finished_at=now
+                        )
+                    )
+                    await db.commit()
+                    if result.rowcount:
+                        self._failed += 1
+                        self._notify(job_id)
+                        logger.warning(f"분석 작업 실패 - {job_id}: 최대 시도 횟수 초과")
+                    continue
+
+                result = await db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job_id, _claimable(now))
+                    .values(
+                        status=AnalysisJob.RUNNING,
+                        lease_owner=self.worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        available_at=None,
+                        started_at=now,
+                        attempts=AnalysisJob.attempts + 1
+                    )
+                )
+                await db.commit()
+                if result.rowcount != 1:
+                    continue  # 다른 워커가 먼저 점유
+
+                self._claimed += 1
+                if reclaimed:
+                    self._reclaimed += 1
+                    logger.warning(f"임대 만료된 분석 작업 재점유 - {job_id}")
+                return await db.get(AnalysisJob, job_id)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"분석 작업 점유 중 오류: {str(e)}", exc_info=True)
+                job = None
+
+            if job is None:
+                await self._wait_for_work()
+                continue
+
+            self._notify(job.id)
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"분석 작업 처리 중 예기치 않은 오류 - {job.id}: {str(e)}", exc_info=True)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """임대 연장 (임대를 잃으면 반환)"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    update(AnalysisJob)
+                    .where(
+                        AnalysisJob.id == job_id,
+                        AnalysisJob.status == AnalysisJob.RUNNING,
+                        AnalysisJob.lease_owner == self.worker_id
+                    )
+                    .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+                )
+                await db.commit()
+            if result.rowcount != 1:
+                return
+
+    async def _run(self, job: AnalysisJob) -> None:
+        """점유한 작업 1건 실행 (하트비트와 함께)"""
+        logger.info(f"분석 작업 시작 - {job.id} (시도 {job.attempts}, 워커 {self.worker_id})")
+
+        work = asyncio.create_task(self._execute(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            done, _ = await asyncio.wait({work, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if work not in done:
+                # 하트비트 실패: 다른 워커가 가져갔으므로 중단
+                work.cancel()
+                await asyncio.gather(work, return_exceptions=True)
+                self._lease_lost += 1
+                logger.warning(f"분석 작업 임대 상실로 중단 - {job.id}")
+            else:
+                work.result()
+        except LeaseLostError:
+            self._lease_lost += 1
+            logger.warning(f"분석 작업 임대 상실로 결과 폐기 - {job.id}")
+        finally:
+            work.cancel()
+            heartbeat.cancel()
+            await asyncio.gather(work, heartbeat, return_exceptions=True)
+
+    def _owned(self, job_id: str):
+        """현재 워커가 임대 중인 작업 조건"""
+        return and_(
+            AnalysisJob.id == job_id,
+            AnalysisJob.status == AnalysisJob.RUNNING,
+            AnalysisJob.lease_owner == self.worker_id
+        )
+
+    async def _set_status(self, job_id: str, **values) -> None:
+        """임대 중인 작업 상태 갱신 후 대기 중인 구독자에게 알림"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(update(AnalysisJob).where(self._owned(job_id)).values(**values))
+            await db.commit()
+        if result.rowcount != 1:
+            raise LeaseLostError(job_id)
+        self._notify(job_id)
+
+    async def _execute(self, job: AnalysisJob) -> None:
+        """전처리 → 분석 → 저장, 결과 기록"""
+        try:
+            contents = await image_store.load(job.input_hash)
+            if contents is None:
+                raise ValueError("작업 입력 이미지가 저장소에 없습니다.")
+
+            processed = await process_image_bytes(contents)
+
+            async with AsyncSessionLocal() as db:
+                try:
+                    # 캐스케이드 미리보기 결과는 완료 전에 작업 결과로 기록 (폴링/SSE 구독자에게 먼저 전달)
+                    async def publish_preview(preview: Dict) -> None:
+                        await self._set_status(job.id, result={"preview": preview})
+
+                    result = await image_analysis_service.analyze(
+                        db, processed, job.custom_prompt, on_preview=publish_preview
+                    )
+                    image_upload, saved_ingredients = await image_analysis_service.persist(
+                        db, job.user_id, processed, result.get("ingredients", [])
+                    )
+                    # 재료 ID/감지 시각을 채운 뒤 응답 생성 (동기 /analyze 응답과 동일하게)
+                    await db.flush()
+                    response = image_analysis_service.build_response(
+                        image_upload, saved_ingredients, result, processed
+                    )
+                    # 결과 저장과 완료 기록을 한 트랜잭션으로: 임대를 잃었으면 모두 롤백
+                    completed = await db.execute(
+                        update(AnalysisJob)
+                        .where(self._owned(job.id))
+                        .values(
+                            status=AnalysisJob.SUCCEEDED,
+                            image_id=image_upload.id,
+                            result=response,
+                            error=None,
+                            lease_owner=None,
+                            lease_expires_at=None,
+                            finished_at=datetime.utcnow()
+                        )
+                    )
+                    if completed.rowcount != 1:
+                        raise LeaseLostError(job.id)
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+
+            self._succeeded += 1
+            self._notify(job.id)
+            logger.info(f"분석 작업 완료 - {job.id}, 재료 {len(saved_ingredients)}개 (티어: {result.get('tier')})")
+            image_analysis_service.schedule_refine(
+                image_upload, saved_ingredients, result, processed, job.custom_prompt
+            )
+
+        except LeaseLostError:
+            raise
+
+        except (ServiceOverloadedError, CircuitOpenError) as e:
+            # 모델 대기열이 가득 참 / 회로 열림: 실패 처리하지 않고 예상 대기 시간 뒤 다시 점유 가능하게 함
+            self._deferred += 1
+            await self._set_status(
+                job.id,
+                status=AnalysisJob.QUEUED,
+                lease_owner=None,
+                lease_expires_at=None,
+                started_at=None,
+                result=None,
+                available_at=datetime.utcnow() + timedelta(seconds=e.retry_after),
+                attempts=AnalysisJob.attempts - 1
+            )
+            logger.info(f"분석 작업 연기 - {job.id}, {e.retry_after}초 후 재시도")
+
+        except HTTPException as e:
+            await self._fail(job.id, str(e.detail))
+
+        except Exception as e:
+            await self._fail(job.id, str(e))
+
+    async def _fail(self, job_id: str, error: str) -> None:
+        logger.warning(f"분석 작업 실패 - {job_id}: {error}")
+        await self._set_status(
+            job_id,
+            status=AnalysisJob.FAILED,
+            error=error,
+            lease_owner=None,
+            lease_expires_at=None,
+            finished_at=datetime.utcnow()
+        )
+        self._failed += 1
+
+    @staticmethod
+    async def queue_stats(db: AsyncSession) -> Dict:
+        """작업 대기열 상태 (모든 API 노드/워커 공통, DB 기준)"""
+        result = await db.execute(
+            select(AnalysisJob.status, func.count()).group_by(AnalysisJob.status)
+        )
+        counts = {status: count for status, count in result.all()}
+        result = await db.execute(
+            select(func.count())
+            .select_from(AnalysisJob)
+            .where(
+                AnalysisJob.status == AnalysisJob.RUNNING,
+                AnalysisJob.lease_expires_at < datetime.utcnow()
+            )
+        )
+        counts["expired_leases"] = result.scalar()
+        return counts
+
+    def stats(self) -> Dict:
+        """작업 실행기 통계 (이 프로세스의 워커)"""
+        return {
+            "worker_id": self.worker_id,
+            "workers": self.workers,
+            "running": self.running,
+            "lease_seconds": self.lease_seconds,
+            "claimed": self._claimed,
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "deferred": self._deferred,
+            "reclaimed": self._reclaimed,
+            "lease_lost": self._lease_lost
+        }
+
+
+# 애플리케이션 전역 인스턴스 (inprocess 모드에서 lifespan이 시작/종료)
+analysis_job_runner = AnalysisJobRunner(workers=settings.JOB_WORKERS)
@@ -0,0 +1,94 @@
+"""
+분석 모델 티어링 정책
+
+대형 모델(gemma3:12b) 대기열이 길거나 요청 마감 시간 안에 대형 모델이 끝나지 못할 것으로 보이면
+작은 모델(OLLAMA_FAST_MODEL) 또는 OpenRouter 멀티모달 모델(IMAGE_MODEL)로 먼저 응답합니다.
+- full: 대형 모델 (기본)
+- fast: 빠른 모델 (대기열 길이 ≥ TIERING_QUEUE_DEPTH, 또는 예상 대기 + 처리 시간 ≥ 남은 시간)
+빠른 모델로 응답한 결과는 대형 모델에 여유가 생기면 다시 분석해 재료를 갱신할 수 있습니다 (ImageAnalysisService).
+"""
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.ollama_service import ollama_service
+from app.services.openrouter_service import openrouter_service
+from app.utils.deadline import Deadline, current_deadline
+
+FULL_TIER = "full"
+FAST_TIER = "fast"
+
+
+class TieringPolicy:
+    """대형 모델 대기열 상태와 마감 시간으로 분석 티어 선택"""
+
+    def __init__(self):
+        self._decisions = Counter()  # (티어, 사유)
+
+    @property
+    def fast_model(self) -> str:
+        """빠른 티어 모델 이름"""
+        if settings.FAST_TIER_BACKEND == "openrouter":
+            return openrouter_service.image_model
+        return ollama_service.fast_model
+
+    def fast_available(self) -> bool:
+        """빠른 티어 업스트림 사용 가능 여부 (Ollama는 빠른 모델이 설치된 서버가 있어야 함)"""
+        if settings.FAST_TIER_BACKEND == "openrouter":
+            return openrouter_service.breaker.state != CircuitBreaker.OPEN
+        return ollama_service.pool.has_available(ollama_service.fast_model)
+
+    def has_spare_capacity(self) -> bool:
+        """대형 모델에 빈 슬롯이 있고 대기 중인 요청이 없는지 여부 (재분석 시점 판단)"""
+        admission = ollama_service.admission
+        return admission.inflight < admission.max_inflight and admission.queue_depth == 0
+
+    def choose(self, deadline: Optional[Deadline] = None) -> Tuple[str, str]:
+        """
+        분석 티어 선택
+
+        Args:
+            deadline: 요청 마감 시간 (기본값: 현재 컨텍스트의 마감 시간)
+
+        Returns:
+            (티어, 사유) - 사유: disabled | queue | deadline | capacity | fast_unavailable
+        """
+        tier, reason = self._choose(deadline or current_deadline())
+        self._decisions[(tier, reason)] += 1
+        return tier, reason
+
+    def _choose(self, deadline: Optional[Deadline]) -> Tuple[str, str]:
+        if not settings.TIERING_ENABLED:
+            return FULL_TIER, "disabled"
+
+        admission = ollama_service.admission
+        if admission.queue_depth >= settings.TIERING_QUEUE_DEPTH:
+            reason = "queue"
+        elif (
+            deadline is not None
+            and admission.expected_wait() + admission.average_service_time() >= deadline.remaining()
+        ):
+            reason = "deadline"
+        else:
+            return FULL_TIER, "capacity"
+
+        if not self.fast_available():
+            return FULL_TIER, "fast_unavailable"
+        return FAST_TIER, reason
+
+    def stats(self) -> Dict:
+        """티어 선택 통계"""
+        decisions: Dict[str, Dict[str, int]] = {}
+        for (tier, reason), count in self._decisions.items():
+            decisions.setdefault(tier, {})[reason] = count
+        return {
+            "enabled": settings.TIERING_ENABLED,
+            "fast_backend": settings.FAST_TIER_BACKEND,
+            "fast_model": self.fast_model,
+            "decisions": decisions
+        }
+
+
+# 애플리케이션 전역 인스턴스
+tiering_policy = TieringPolicy()
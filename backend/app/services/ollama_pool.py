@@ -0,0 +1,400 @@
+"""
+Ollama 다중 호스트 풀
+
+여러 GPU 서버의 Ollama 엔드포인트에 요청을 분산합니다.
+- 라우팅: 진행 중 요청 수가 가장 적은 엔드포인트 (최근 지연 시간 EWMA로 가중)
+         점수 = (진행 중 요청 + 1) × 지연 시간 EWMA, 모델이 메모리에 없으면 콜드 로드 가중치 추가
+- 헬스 체크: 백그라운드에서 /api/tags(응답 + 모델 설치 여부), /api/ps(모델 로드 여부)를 주기적으로 확인
+            빠른 모델 등 다른 모델 요청은 그 모델이 설치된 엔드포인트로만 라우팅
+- 퇴출/복귀: 헬스 체크 실패나 연결 실패 시 즉시 퇴출, 다음 헬스 체크 성공 시 복귀
+            호출 오류율/지연이 높으면 엔드포인트별 서킷 브레이커가 열려 제외, half-open 시험 호출 성공 시 복귀
+- 모델 상주: 모든 요청에 keep_alive를 붙이고, 시작 시 빈 프롬프트로 모델을 미리 로드(warm-up)하며,
+            업무 시간에는 한동안 요청이 없거나 모델이 내려간 서버에 로드 유지 요청(keep-warm)을 보냄
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Union
+
+import httpx
+
+from app.config import settings
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.http_client import UpstreamClient
+from app.utils.deadline import Deadline
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _normalize_model_name(name: str) -> str:
+    """태그가 없는 모델 이름은 :latest로 취급"""
+    return name if ":" in name else f"{name}:latest"
+
+
+def keep_alive_value(value: str) -> Union[str, int]:
+    """
+    Ollama keep_alive 파라미터 값
+
+    단위 없는 숫자("-1", "3600")는 초 단위 정수로, 그 외("30m", "1h")는 기간 문자열 그대로 보냅니다.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def in_keep_warm_hours(now: Optional[datetime] = None) -> bool:
+    """현재 시각이 keep-warm 업무 시간대인지 여부 (서버 로컬 시각)"""
+    if not settings.OLLAMA_KEEP_WARM:
+        return False
+    hour = (now or datetime.now()).hour
+    start, end = settings.OLLAMA_KEEP_WARM_START_HOUR, settings.OLLAMA_KEEP_WARM_END_HOUR
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end  # 자정을 넘기는 시간대 (예: 22~6)
+
+
+class OllamaEndpoint:
+    """풀에 속한 Ollama 엔드포인트 1개의 상태"""
+
+    def __init__(self, url: str, initial_latency: float):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.ewma_latency = initial_latency
+        self.healthy = True  # 첫 헬스 체크 전에는 사용 가능으로 가정
+        self.model_available = True
+        self.model_loaded = False
+        self.installed_models: Optional[Set[str]] = None  # /api/tags 결과 (첫 헬스 체크 전에는 None)
+        self.last_error: Optional[str] = None
+        self.last_checked_at: Optional[float] = None
+        self.last_used_at: Optional[float] = None
+        self.requests = 0
+        self.warm_ups = 0
+        self.breaker = CircuitBreaker(
+            f"ollama@{self.url}",
+            window=settings.CIRCUIT_BREAKER_WINDOW,
+            min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+            failure_rate_threshold=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+            slow_call_seconds=settings.OLLAMA_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=settings.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+            open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS
+        )
+
+    @property
+    def available(self) -> bool:
+        """라우팅 대상 여부"""
+        return self.healthy and self.model_available and self.breaker.state != CircuitBreaker.OPEN
+
+    def has_model(self, model: str) -> bool:
+        """모델 설치 여부 (첫 헬스 체크 전에는 설치된 것으로 가정)"""
+        return self.installed_models is None or _normalize_model_name(model) in self.installed_models
+
+    def serves(self, model: str) -> bool:
+        """다른 모델(빠른 모델 등) 요청의 라우팅 대상 여부"""
+        return self.healthy and self.has_model(model) and self.breaker.state != CircuitBreaker.OPEN
+
+    def score(self) -> float:
+        """라우팅 점수 (낮을수록 우선)"""
+        score = (self.outstanding + 1) * self.ewma_latency
+        if not self.model_loaded:
+            score *= settings.OLLAMA_COLD_MODEL_PENALTY
+        return score
+
+    def observe_latency(self, seconds: float) -> None:
+        """성공 호출 지연 시간 반영 (EWMA)"""
+        alpha = settings.OLLAMA_LATENCY_EWMA_ALPHA
+        self.ewma_latency = alpha * seconds + (1 - alpha) * self.ewma_latency
+
+    def mark_down(self, reason: str) -> None:
+        """퇴출 (다음 헬스 체크 성공 시 복귀)"""
+        if self.healthy:
+            logger.warning(f"Ollama 엔드포인트 퇴출 - {self.url}: {reason}")
+        self.healthy = False
+        self.last_error = reason
+
+    def mark_up(self) -> None:
+        """복귀"""
+        if not self.healthy:
+            logger.info(f"Ollama 엔드포인트 복귀 - {self.url}")
+        self.healthy = True
+        self.last_error = None
+
+    def stats(self) -> Dict:
+        """엔드포인트 상태"""
+        return {
+            "url": self.url,
+            "available": self.available,
+            "healthy": self.healthy,
+            "model_available": self.model_available,
+            "model_loaded": self.model_loaded,
+            "installed_models": sorted(self.installed_models) if self.installed_models is not None else None,
+            "outstanding": self.outstanding,
+            "ewma_latency": round(self.ewma_latency, 3),
+            "requests": self.requests,
+            "warm_ups": self.warm_ups,
+            "last_error": self.last_error,
+            "seconds_since_check": (
+                round(time.monotonic() - self.last_checked_at, 1) if self.last_checked_at else None
+            ),
+            "breaker": self.breaker.stats()
+        }
+
+
+class OllamaPool:
+    """최소 진행 요청(지연 시간 가중) 라우팅 + 헬스 체크를 하는 Ollama 엔드포인트 풀"""
+
+    def __init__(self, urls: List[str], model: str, http: UpstreamClient):
+        if not urls:
+            raise ValueError("Ollama 엔드포인트가 하나 이상 필요합니다.")
+        self.model = model
+        self.http = http
+        self.endpoints = [
+            OllamaEndpoint(url, initial_latency=settings.OLLAMA_DEFAULT_SERVICE_TIME) for url in urls
+        ]
+        self.keep_alive = keep_alive_value(settings.OLLAMA_KEEP_ALIVE)
+        self._health_task: Optional[asyncio.Task] = None
+        self._warm_up_tasks: Dict[str, asyncio.Task] = {}
+        # 시작 시 모델 로드: 한 번이라도 모델이 올라간 것을 확인하기 전에는 readiness false (이후 유지)
+        self._warm_up_required = False
+        self._warmed_up = False
+
+    @property
+    def urls(self) -> List[str]:
+        """엔드포인트 URL 목록"""
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def _candidates(self, model: Optional[str] = None) -> List[OllamaEndpoint]:
+        """모델을 처리할 수 있는 엔드포인트 목록 (기본값: 풀 모델)"""
+        if model is None or _normalize_model_name(model) == _normalize_model_name(self.model):
+            return [endpoint for endpoint in self.endpoints if endpoint.available]
+        return [endpoint for endpoint in self.endpoints if endpoint.serves(model)]
+
+    def select(self, model: Optional[str] = None) -> OllamaEndpoint:
+        """
+        라우팅할 엔드포인트 선택
+
+        Args:
+            model: 요청 모델 (기본값: 풀 모델, 다른 모델이면 설치된 엔드포인트만 선택)
+
+        Raises:
+            CircuitOpenError: 사용 가능한 엔드포인트가 없는 경우
+        """
+        candidates = self._candidates(model)
+        if not candidates:
+            raise CircuitOpenError(
+                f"{model or self.model} 모델을 사용할 수 있는 Ollama 서버가 없습니다. 잠시 후 다시 시도해주세요.",
+                retry_after=max(1, int(settings.OLLAMA_HEALTH_CHECK_INTERVAL))
+            )
+        return min(candidates, key=lambda endpoint: endpoint.score())
+
+    @property
+    def warming_up(self) -> bool:
+        """시작 시 모델 로드를 기다리는 중인지 여부 (실패하면 헬스 체크 주기마다 다시 시도)"""
+        return self._warm_up_required and not self._warmed_up
+
+    @property
+    def ready(self) -> bool:
+        """
+        시작 후 모델 로드를 한 번 확인했고 사용 가능 엔드포인트가 있는지 여부 (readiness)
+
+        모델 로드 확인: 모델 로드 요청 성공 또는 헬스 체크에서 /api/ps에 모델이 보인 경우 (시작 시 로드를 끈 경우 생략).
+        그 이후의 모델 상주 여부(model_loaded)는 조건에 넣지 않습니다. keep_alive가 지나 모델이 내려가면
+        readiness가 계속 false가 되어 트래픽이 끊기고, 모델을 다시 로드할 요청도 오지 않기 때문입니다.
+        """
+        return not self.warming_up and self.has_available()
+
+    def _mark_warmed_up(self, endpoint: OllamaEndpoint) -> None:
+        """첫 모델 로드 확인 기록 (readiness 시작)"""
+        if self._warm_up_required and not self._warmed_up:
+            logger.info(f"Ollama 모델 로드 확인 - {endpoint.url}, 준비 완료")
+        self._warmed_up = True
+
+    def has_available(self, model: Optional[str] = None) -> bool:
+        """라우팅 가능한 엔드포인트가 있는지 여부 (기본값: 풀 모델)"""
+        return bool(self._candidates(model))
+
+    def check_available(self, model: Optional[str] = None) -> None:
+        """
+        사용 가능한 엔드포인트가 있는지 확인 (대기열 진입 전 빠른 거절용)
+
+        Raises:
+            CircuitOpenError: 사용 가능한 엔드포인트가 없는 경우
+        """
+        self.select(model)
+
+    @asynccontextmanager
+    async def acquire(self, deadline: Optional[Deadline] = None, model: Optional[str] = None):
+        """
+        엔드포인트를 골라 호출 (async with pool.acquire() as endpoint)
+
+        진행 중 요청 수를 세고, 성공 시 지연 시간을 반영하며, 연결 실패 시 즉시 퇴출합니다.
+
+        Raises:
+            CircuitOpenError: 사용 가능한 엔드포인트가 없는 경우
+        """
+        endpoint = self.select(model)
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        endpoint.last_used_at = time.monotonic()
+        started = time.monotonic()
+        try:
+            async with endpoint.breaker.call(deadline):
+                yield endpoint
+        except httpx.ConnectError as e:
+            endpoint.mark_down(f"연결 실패: {e}")
+            raise
+        else:
+            endpoint.observe_latency(time.monotonic() - started)
+        finally:
+            endpoint.outstanding -= 1
+
+    async def check_endpoint(self, endpoint: OllamaEndpoint) -> None:
+        """엔드포인트 1개 헬스 체크: /api/tags(응답/모델 설치), /api/ps(모델 로드)"""
+        timeout = httpx.Timeout(settings.OLLAMA_HEALTH_CHECK_TIMEOUT)
+        model = _normalize_model_name(self.model)
+        try:
+            tags = await self.http.client.get(f"{endpoint.url}/api/tags", timeout=timeout)
+            tags.raise_for_status()
+            installed = {
+                _normalize_model_name(item.get("name") or item.get("model", ""))
+                for item in tags.json().get("models", [])
+            }
+
+            ps = await self.http.client.get(f"{endpoint.url}/api/ps", timeout=timeout)
+            ps.raise_for_status()
+            loaded = {
+                _normalize_model_name(item.get("name") or item.get("model", ""))
+                for item in ps.json().get("models", [])
+            }
+        except (httpx.HTTPError, ValueError) as e:
+            endpoint.mark_down(f"헬스 체크 실패: {type(e).__name__}: {e}")
+        else:
+            endpoint.installed_models = installed
+            endpoint.model_available = model in installed
+            endpoint.model_loaded = model in loaded
+            if endpoint.model_loaded:
+                self._mark_warmed_up(endpoint)
+            if not endpoint.model_available:
+                logger.warning(f"Ollama 엔드포인트에 {self.model} 모델이 없습니다 - {endpoint.url}")
+            endpoint.mark_up()
+        finally:
+            endpoint.last_checked_at = time.monotonic()
+
+    async def check_all(self) -> None:
+        """모든 엔드포인트 헬스 체크 (동시에)"""
+        await asyncio.gather(*(self.check_endpoint(endpoint) for endpoint in self.endpoints))
+
+    async def warm_up(self, endpoint: OllamaEndpoint) -> bool:
+        """
+        빈 프롬프트 generate 요청으로 모델을 메모리에 로드 (이미 로드되어 있으면 keep_alive만 갱신)
+
+        Returns:
+            로드 성공 여부
+        """
+        was_loaded = endpoint.model_loaded
+        started = time.monotonic()
+        try:
+            response = await self.http.client.post(
+                f"{endpoint.url}/api/generate",
+                json={"model": self.model, "prompt": "", "stream": False, "keep_alive": self.keep_alive},
+                timeout=httpx.Timeout(settings.OLLAMA_WARMUP_TIMEOUT, connect=settings.OLLAMA_HEALTH_CHECK_TIMEOUT)
+            )
+            response.raise_for_status()
+        except httpx.ConnectError as e:
+            endpoint.mark_down(f"연결 실패: {e}")
+            return False
+        except httpx.HTTPError as e:
+            logger.warning(f"Ollama 모델 로드 실패 - {endpoint.url}: {type(e).__name__}: {e}")
+            return False
+
+        endpoint.model_loaded = True
+        endpoint.warm_ups += 1
+        self._mark_warmed_up(endpoint)
+        endpoint.last_used_at = time.monotonic()
+        message = f"Ollama 모델 로드 완료 - {endpoint.url} ({self.model}, {time.monotonic() - started:.1f}초)"
+        if was_loaded:
+            logger.debug(message)  # keep-warm으로 keep_alive만 갱신
+        else:
+            logger.info(message)
+        return True
+
+    def schedule_warm_up(self, endpoint: OllamaEndpoint) -> None:
+        """백그라운드에서 모델 로드 (엔드포인트당 한 번에 하나만)"""
+        task = self._warm_up_tasks.get(endpoint.url)
+        if task is not None and not task.done():
+            return
+        self._warm_up_tasks[endpoint.url] = asyncio.create_task(
+            self.warm_up(endpoint), name=f"ollama-warm-up:{endpoint.url}"
+        )
+
+    def _keep_warm(self) -> None:
+        """업무 시간 중 모델이 내려갔거나 한동안 요청이 없던 서버에 로드 유지 요청"""
+        if not in_keep_warm_hours():
+            return
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if not endpoint.healthy or not endpoint.model_available:
+                continue
+            idle = endpoint.last_used_at is None or now - endpoint.last_used_at >= settings.OLLAMA_KEEP_WARM_IDLE_SECONDS
+            if not endpoint.model_loaded or idle:
+                self.schedule_warm_up(endpoint)
+
+    def _retry_warm_up(self) -> None:
+        """시작 시 모델 로드가 아직 성공하지 못했으면 사용 가능한 서버에 다시 로드 요청"""
+        if not self.warming_up:
+            return
+        for endpoint in self.endpoints:
+            if endpoint.available:
+                self.schedule_warm_up(endpoint)
+
+    async def _health_loop(self) -> None:
+        while True:
+            try:
+                await self.check_all()
+                self._retry_warm_up()
+                self._keep_warm()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ollama 헬스 체크 중 오류: {str(e)}", exc_info=True)
+            await asyncio.sleep(settings.OLLAMA_HEALTH_CHECK_INTERVAL)
+
+    def start(self, warm_up: bool = False) -> None:
+        """
+        백그라운드 헬스 체크 시작 (HTTP 클라이언트 시작 후 호출)
+
+        Args:
+            warm_up: 모든 엔드포인트에 모델을 미리 로드할지 여부 (한 곳이라도 로드될 때까지 readiness는 false)
+        """
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop(), name="ollama-health-check")
+            logger.info(f"Ollama 풀 헬스 체크 시작 - 엔드포인트: {', '.join(self.urls)}")
+        if warm_up:
+            self._warm_up_required = True
+            for endpoint in self.endpoints:
+                self.schedule_warm_up(endpoint)
+
+    async def stop(self) -> None:
+        """백그라운드 헬스 체크/모델 로드 종료"""
+        tasks = list(self._warm_up_tasks.values())
+        if self._health_task is not None:
+            tasks.append(self._health_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._health_task = None
+        self._warm_up_tasks.clear()
+
+    def stats(self) -> Dict:
+        """풀 상태"""
+        return {
+            "model": self.model,
+            "keep_alive": self.keep_alive,
+            "ready": self.ready,
+            "warming_up": self.warming_up,
+            "model_loaded_endpoints": sum(1 for endpoint in self.endpoints if endpoint.model_loaded),
+            "available_endpoints": sum(1 for endpoint in self.endpoints if endpoint.available),
+            "endpoints": [endpoint.stats() for endpoint in self.endpoints]
+        }
@@ -0,0 +1,253 @@
+"""
+Ollama 요청 프로필
+
+분석 종류별로 출력 형식(JSON Schema 구조화 출력), 생성 예산(num_predict, num_ctx), temperature와
+고정 시스템 프롬프트를 묶어 관리합니다.
+- 정적인 지시문은 항상 같은 system 메시지로 맨 앞에 두고, 이미지와 커스텀 요청만 user 메시지에 넣어
+  Ollama가 이전 요청의 프롬프트 캐시(KV 캐시 접두부)를 재사용하도록 합니다.
+- format에 JSON Schema를 보내면 모델 출력이 스키마에 맞게 제한됩니다 (Ollama 0.5 이상).
+  OLLAMA_STRUCTURED_OUTPUT=false이면 이전처럼 format: "json"만 보냅니다.
+- 프로필별 지연 시간과 토큰 수(prompt_eval_count, eval_count)를 기록해 /api/admin/metrics에 보고합니다.
+  prompt_eval_count는 캐시되지 않은 프롬프트 토큰만 세므로 접두부 재사용 여부도 여기서 확인할 수 있습니다.
+"""
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.utils.metrics import RollingStats
+
+FRESHNESS_VALUES = ["fresh", "moderate", "expiring"]
+
+INGREDIENT_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "quantity": {"type": "string"},
+        "freshness": {"type": "string", "enum": FRESHNESS_VALUES},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1}
+    },
+    "required": ["name", "quantity", "freshness", "confidence"]
+}
+
+# 재료 목록 응답 스키마
+INGREDIENTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "ingredients": {"type": "array", "items": INGREDIENT_ITEM_SCHEMA}
+    },
+    "required": ["ingredients"]
+}
+
+# 재분석(수정 사항) 응답 스키마
+CORRECTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "ingredients": {"type": "array", "items": INGREDIENT_ITEM_SCHEMA},
+        "removed": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["ingredients", "removed"]
+}
+
+ANALYSIS_SYSTEM_PROMPT = """당신은 냉장고 사진에서 식재료를 찾아내는 분석기입니다.
+
+반드시 다음 JSON 형식으로만 응답하세요. 다른 설명이나 스키마는 포함하지 마세요:
+{
+  "ingredients": [
+    {"name": "당근", "quantity": "3개", "freshness": "fresh", "confidence": 0.95},
+    {"name": "계란", "quantity": "10개", "freshness": "moderate", "confidence": 0.90}
+  ]
+}
+
+중요:
+- JSON 객체만 반환하세요
+- ingredients 배열 안에 실제 재료 정보를 넣으세요
+- 명확히 보이는 재료만 포함
+- 한글 재료명 사용
+- freshness: fresh, moderate, expiring 중 하나
+- confidence: 0.0~1.0 사이의 숫자
+"""
+
+CORRECTION_SYSTEM_PROMPT = """당신은 냉장고 사진의 이전 재료 분석 결과를 검토하는 분석기입니다.
+
+사진을 다시 확인하여 이전 결과와 달라지는 부분만 다음 JSON 형식으로 응답하세요:
+{
+  "ingredients": [
+    {"name": "당근", "quantity": "3개", "freshness": "fresh", "confidence": 0.95}
+  ],
+  "removed": ["잘못 인식된 재료명"]
+}
+
+중요:
+- ingredients에는 새로 찾은 재료와 수량/신선도가 바뀐 재료만 넣으세요 (변경 없는 재료는 생략)
+- removed에는 이전 결과 중 사진에 없는 재료의 이름을 넣으세요
+- 변경 사항이 없으면 {"ingredients": [], "removed": []}를 반환하세요
+- 한글 재료명 사용
+- freshness: fresh, moderate, expiring 중 하나
+- confidence: 0.0~1.0 사이의 숫자
+"""
+
+
+class RequestProfile:
+    """Ollama 요청 프로필 (출력 형식 + 생성 예산 + 고정 시스템 프롬프트 + 지표)"""
+
+    def __init__(
+        self,
+        name: str,
+        system: str,
+        schema: Dict,
+        num_predict: int,
+        num_ctx: int,
+        temperature: float
+    ):
+        self.name = name
+        self.system = system
+        self.schema = schema
+        self.num_predict = num_predict
+        self.num_ctx = num_ctx
+        self.temperature = temperature
+
+        # 지표
+        self.requests = 0
+        self.truncated = 0  # num_predict에 걸려 잘린 응답 수
+        self.latency = RollingStats()  # 요청 시간 (초, 재시도 포함)
+        self.prompt_tokens = RollingStats()  # 캐시되지 않아 새로 처리한 프롬프트 토큰
+        self.output_tokens = RollingStats()
+        self.load_seconds = RollingStats()  # 모델 로드 시간 (초)
+
+    @property
+    def format(self):
+        """요청 format 값 (JSON Schema 또는 "json")"""
+        return self.schema if settings.OLLAMA_STRUCTURED_OUTPUT else "json"
+
+    def options(self) -> Dict:
+        """모델 생성 옵션"""
+        return {
+            "num_predict": self.num_predict,
+            "num_ctx": self.num_ctx,
+            "temperature": self.temperature
+        }
+
+    def messages(self, content: str, images: Optional[List[str]] = None) -> List[Dict]:
+        """
+        요청 메시지 (고정 system 메시지 + 요청별 user 메시지)
+
+        Args:
+            content: user 메시지 내용
+            images: Base64 인코딩된 이미지 목록 (optional)
+        """
+        user = {"role": "user", "content": content}
+        if images:
+            user["images"] = images
+        return [{"role": "system", "content": self.system}, user]
+
+    def build_request(
+        self,
+        model: str,
+        messages: List[Dict],
+        stream: bool,
+        keep_alive
+    ) -> Dict:
+        """
+        /api/chat 요청 본문 생성
+
+        Args:
+            model: 모델 이름
+            messages: 메시지 목록 (messages()로 생성)
+            stream: 스트리밍 여부
+            keep_alive: 요청 후 모델 유지 시간
+
+        Returns:
+            요청 본문
+        """
+        return {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+            "format": self.format,
+            "options": self.options(),
+            "keep_alive": keep_alive
+        }
+
+    def observe(self, duration: float, response: Optional[Dict] = None) -> None:
+        """
+        요청 결과 기록
+
+        Args:
+            duration: 요청 시간 (초)
+            response: Ollama 최종 응답 (토큰 수/done_reason 포함, 스트리밍을 중간에 끊었으면 None)
+        """
+        self.requests += 1
+        self.latency.observe(duration)
+        if not response:
+            return
+        if "prompt_eval_count" in response:
+            self.prompt_tokens.observe(response["prompt_eval_count"])
+        if "eval_count" in response:
+            self.output_tokens.observe(response["eval_count"])
+        if response.get("load_duration"):
+            self.load_seconds.observe(response["load_duration"] / 1e9)
+        if response.get("done_reason") == "length":
+            self.truncated += 1
+
+    def stats(self) -> Dict:
+        """프로필 설정과 지표"""
+        return {
+            "options": self.options(),
+            "structured_output": settings.OLLAMA_STRUCTURED_OUTPUT,
+            "requests": self.requests,
+            "truncated": self.truncated,
+            "latency": self.latency.snapshot(),
+            "prompt_tokens": self.prompt_tokens.snapshot(1),
+            "output_tokens": self.output_tokens.snapshot(1),
+            "load_seconds": self.load_seconds.snapshot()
+        }
+
+
+ANALYSIS = "analysis"
+FAST = "fast"
+PREVIEW = "preview"
+CORRECTION = "correction"
+
+# 분석 종류별 프로필
+# - analysis: 대형 모델 전체 분석 (동기/스트리밍/비동기 작업)
+# - fast: 티어링 빠른 모델
+# - preview: 캐스케이드 저해상도 미리보기 (이미지 토큰이 적어 컨텍스트를 줄임)
+# - correction: 이전 결과 대비 수정 사항만 요청하는 재분석
+PROFILES: Dict[str, RequestProfile] = {
+    ANALYSIS: RequestProfile(
+        ANALYSIS,
+        ANALYSIS_SYSTEM_PROMPT,
+        INGREDIENTS_SCHEMA,
+        num_predict=settings.OLLAMA_NUM_PREDICT,
+        num_ctx=settings.OLLAMA_NUM_CTX,
+        temperature=settings.OLLAMA_TEMPERATURE
+    ),
+    FAST: RequestProfile(
+        FAST,
+        ANALYSIS_SYSTEM_PROMPT,
+        INGREDIENTS_SCHEMA,
+        num_predict=settings.OLLAMA_NUM_PREDICT,
+        num_ctx=settings.OLLAMA_NUM_CTX,
+        temperature=settings.OLLAMA_TEMPERATURE
+    ),
+    PREVIEW: RequestProfile(
+        PREVIEW,
+        ANALYSIS_SYSTEM_PROMPT,
+        INGREDIENTS_SCHEMA,
+        num_predict=settings.OLLAMA_PREVIEW_NUM_PREDICT,
+        num_ctx=settings.OLLAMA_PREVIEW_NUM_CTX,
+        temperature=settings.OLLAMA_TEMPERATURE
+    ),
+    CORRECTION: RequestProfile(
+        CORRECTION,
+        CORRECTION_SYSTEM_PROMPT,
+        CORRECTIONS_SCHEMA,
+        num_predict=settings.OLLAMA_CORRECTION_NUM_PREDICT,
+        num_ctx=settings.OLLAMA_NUM_CTX,
+        temperature=settings.OLLAMA_TEMPERATURE
+    )
+}
+
+
+def profile_stats() -> Dict[str, Dict]:
+    """전체 프로필 지표"""
+    return {name: profile.stats() for name, profile in PROFILES.items()}
@@ -1,10 +1,13 @@
 """
 Ollama API 서비스
 """
+import asyncio
+import hashlib
 import httpx
 import json
 import logging
-from typing import List, Dict, Optional
+import time
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -12,7 +15,33 @@ from tenacity import (
     retry_if_exception_type,
     before_sleep_log
 )
+from app.config import settings
+from app.services.admission import AdmissionController
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.http_client import UpstreamClient
+from app.services.ollama_pool import OllamaPool
+from app.services.ollama_profiles import (
+    ANALYSIS,
+    CORRECTION,
+    FAST,
+    PROFILES,
+    RequestProfile,
+    profile_stats
+)
+from app.utils.json_stream import IncrementalJSONParser
+from app.utils.llm_json import PARSE_OK, PARSE_REPAIRED, json_parse_metrics, parse_llm_json
+from app.utils.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    attempt_timeout,
+    current_deadline,
+    raise_if_expired,
+    stop_at_deadline,
+    wait_within_deadline
+)
 from app.utils.logger import get_logger
+from app.utils.metrics import RollingStats
+from app.utils.single_flight import SingleFlight
 
 # 로거 설정
 logger = get_logger(__name__)
@@ -22,23 +51,56 @@ class OllamaService:
     """Ollama API 통합 서비스"""
 
     def __init__(self):
-        self.base_url = "http://localhost:11434"
         self.image_model = "gemma3:12b"  # 이미지 분석용 멀티모달 모델 (빠르고 안정적)
+        self.fast_model = settings.OLLAMA_FAST_MODEL  # 부하가 높을 때 쓰는 작은 모델 (티어링)
 
-        # httpx 클라이언트 설정
+        # httpx 클라이언트 설정 (lifespan 동안 공유되는 커넥션 풀)
         self.timeout = httpx.Timeout(240.0, connect=10.0)
-        self.limits = httpx.Limits(max_keepalive_connections=5, max_connections=10)
+        self.limits = httpx.Limits(
+            max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+        self.http = UpstreamClient("ollama", timeout=self.timeout, limits=self.limits)
+
+        # Ollama 서버 풀: 헬스 체크 + 최소 진행 요청 라우팅, 서버별 서킷 브레이커 (/health에 상태 표시)
+        self.pool = OllamaPool(settings.ollama_hosts, model=self.image_model, http=self.http)
+
+        # 모델 앞단 승인 제어 (동시 실행 수 + 대기열 길이 제한, 동시 실행 수는 서버 수만큼)
+        self.admission = AdmissionController(
+            "ollama",
+            max_inflight=settings.OLLAMA_MAX_INFLIGHT * len(self.pool.endpoints),
+            max_queue=settings.OLLAMA_MAX_QUEUE,
+            default_service_time=settings.OLLAMA_DEFAULT_SERVICE_TIME
+        )
+        # 빠른 모델은 대형 모델 대기열 뒤에 서지 않도록 별도 슬롯 사용
+        self.fast_admission = AdmissionController(
+            "ollama-fast",
+            max_inflight=settings.OLLAMA_FAST_MAX_INFLIGHT * len(self.pool.endpoints),
+            max_queue=settings.OLLAMA_MAX_QUEUE,
+            default_service_time=settings.OLLAMA_FAST_DEFAULT_SERVICE_TIME
+        )
+
+        # 같은 이미지/프롬프트의 진행 중 분석 합치기
+        self.single_flight = SingleFlight("ollama")
+
+        # 스트리밍 분석 지표: 첫 재료까지 걸린 시간 / 전체 시간 (초)
+        self.stream_first_ingredient = RollingStats()
+        self.stream_total = RollingStats()
 
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        # 요청 마감 시간이 있으면 시도 횟수와 관계없이 남은 시간 안에서만 재시도
+        stop=stop_after_attempt(3) | stop_at_deadline(),
+        wait=wait_within_deadline(wait_exponential(multiplier=1, min=2, max=10)),
         retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError)),
-        before_sleep=before_sleep_log(logger, logging.WARNING)
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
     )
     async def _make_chat_request(
         self,
         model: str,
         messages: List[Dict],
+        profile: RequestProfile,
         timeout: Optional[float] = None
     ) -> Dict:
         """
@@ -47,105 +109,256 @@ class OllamaService:
         Args:
             model: 모델 이름
             messages: 메시지 목록
+            profile: 요청 프로필 (출력 형식/생성 옵션)
             timeout: 타임아웃 (초)
 
         Returns:
             API 응답
         """
         request_timeout = timeout or 120.0
-        url = f"{self.base_url}/api/chat"
 
-        data = {
-            "model": model,
-            "messages": messages,
-            "stream": False,
-            "format": "json"
-        }
+        data = profile.build_request(model, messages, stream=False, keep_alive=self.pool.keep_alive)
 
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(request_timeout, connect=10.0),
-            limits=self.limits
-        ) as client:
-            try:
-                logger.info(f"Ollama 요청 시작 - 모델: {model}")
-                response = await client.post(url, json=data)
+        try:
+            logger.info(f"Ollama 요청 시작 - 모델: {model}, 프로필: {profile.name}")
+            async with self.pool.acquire(model=model) as endpoint:
+                response = await self.http.post(
+                    f"{endpoint.url}/api/chat",
+                    json=data,
+                    timeout=attempt_timeout(request_timeout)
+                )
                 response.raise_for_status()
-                result = response.json()
-                logger.info("Ollama 요청 완료")
-                return result
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-                raise Exception(f"Ollama API HTTP 오류: {e.response.status_code}")
-            except httpx.TimeoutException:
-                logger.error("Ollama API 타임아웃")
+            result = response.json()
+            logger.info("Ollama 요청 완료")
+            return result
+
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
+            raise Exception(f"Ollama API HTTP 오류: {e.response.status_code}")
+        except httpx.TimeoutException as e:
+            logger.error("Ollama API 타임아웃")
+            raise_if_expired(e)
+            raise
+        except httpx.NetworkError as e:
+            logger.error(f"네트워크 오류 (Ollama가 실행 중인지 확인하세요): {str(e)}")
+            # 연결 실패한 서버는 풀에서 퇴출되었으므로 다른 서버가 있으면 재시도
+            if isinstance(e, httpx.ConnectError) and self.pool.has_available(model):
                 raise
-            except httpx.NetworkError as e:
-                logger.error(f"네트워크 오류 (Ollama가 실행 중인지 확인하세요): {str(e)}")
-                raise Exception("Ollama 서버에 연결할 수 없습니다. Ollama가 실행 중인지 확인하세요.")
-            except Exception as e:
-                logger.error(f"API 요청 중 예상치 못한 오류: {str(e)}")
-                raise Exception(f"Ollama API 오류: {str(e)}")
+            raise Exception("Ollama 서버에 연결할 수 없습니다. Ollama가 실행 중인지 확인하세요.")
+        except Exception as e:
+            logger.error(f"API 요청 중 예상치 못한 오류: {str(e)}")
+            raise Exception(f"Ollama API 오류: {str(e)}")
+
+    def admission_for(self, model: Optional[str] = None) -> AdmissionController:
+        """모델별 대기열 (대형 모델 외에는 빠른 모델 슬롯 사용)"""
+        if model is None or model == self.image_model:
+            return self.admission
+        return self.fast_admission
+
+    def check_available(
+        self,
+        deadline: Optional[Deadline] = None,
+        admission: Optional[AdmissionController] = None,
+        model: Optional[str] = None
+    ) -> None:
+        """
+        모델 호출 전 빠른 거절 검사
+
+        Args:
+            deadline: 요청 마감 시간 (기본값: 현재 컨텍스트의 마감 시간)
+            admission: 예상 대기 시간을 볼 대기열 (기본값: 대형 모델 대기열)
+            model: 호출할 모델 (기본값: image_model, 다른 모델이면 설치된 서버가 있는지 확인)
+
+        Raises:
+            CircuitOpenError: 사용 가능한 Ollama 서버가 없는 경우
+            DeadlineExceededError: 예상 대기 시간이 요청의 남은 시간보다 긴 경우
+        """
+        self.pool.check_available(model)
+
+        deadline = deadline or current_deadline()
+        if deadline is not None:
+            expected_wait = (admission or self.admission).expected_wait()
+            if expected_wait >= deadline.remaining():
+                raise DeadlineExceededError(
+                    f"예상 대기 시간({expected_wait:.0f}초)이 요청 처리 시간 안에 끝나지 않습니다."
+                )
+
+    def build_analysis_prompt(
+        self,
+        custom_prompt: Optional[str] = None,
+        previous_ingredients: Optional[List[Dict]] = None
+    ) -> str:
+        """
+        이미지 분석 프롬프트 전체 (고정 시스템 프롬프트 + 요청별 내용, 분석 캐시 키로 사용)
+
+        Args:
+            custom_prompt: 커스텀 프롬프트 (optional)
+            previous_ingredients: 이전 분석 결과 (optional, 있으면 수정 사항만 요청)
+
+        Returns:
+            모델에 보낼 프롬프트
+        """
+        profile = PROFILES[CORRECTION if previous_ingredients else ANALYSIS]
+        return f"{profile.system}\n{self._build_user_content(custom_prompt, previous_ingredients)}"
+
+    def _build_user_content(
+        self,
+        custom_prompt: Optional[str] = None,
+        previous_ingredients: Optional[List[Dict]] = None
+    ) -> str:
+        """
+        요청별 user 메시지 내용 (정적인 지시문은 프로필의 system 메시지에 있음)
+
+        Args:
+            custom_prompt: 커스텀 프롬프트 (optional)
+            previous_ingredients: 이전 분석 결과 (optional, 재분석 시 출력 토큰 절감을 위해 수정 사항만 요청)
+
+        Returns:
+            user 메시지 내용
+        """
+        if previous_ingredients:
+            previous_json = json.dumps(
+                {"ingredients": previous_ingredients}, ensure_ascii=False
+            )
+            content = f"이 냉장고 사진의 이전 재료 분석 결과는 다음과 같습니다:\n{previous_json}"
+        else:
+            content = "이 냉장고 사진을 분석하여 보이는 모든 재료를 추출해주세요."
+
+        # 커스텀 프롬프트가 있으면 추가
+        if custom_prompt:
+            content = f"{content}\n\n추가 요청사항:\n{custom_prompt}"
+        return content
+
+    @staticmethod
+    def apply_corrections(previous_ingredients: List[Dict], corrections: Dict) -> List[Dict]:
+        """
+        이전 재료 목록에 수정 사항 반영
 
-    async def analyze_image(self, image_base64: str, custom_prompt: str = None) -> Dict:
+        Args:
+            previous_ingredients: 이전 분석 결과
+            corrections: {"ingredients": [추가/변경], "removed": [삭제할 이름]}
+
+        Returns:
+            수정된 전체 재료 목록
+        """
+        removed = {
+            name.strip() for name in corrections.get("removed") or []
+            if isinstance(name, str)
+        }
+        merged = {
+            ing["name"]: ing for ing in previous_ingredients
+            if ing.get("name") and ing["name"] not in removed
+        }
+        for ing in corrections.get("ingredients") or []:
+            if isinstance(ing, dict) and ing.get("name"):
+                merged[ing["name"]] = {**merged.get(ing["name"], {}), **ing}
+        return list(merged.values())
+
+    async def analyze_image(
+        self,
+        image_base64: str,
+        custom_prompt: str = None,
+        previous_ingredients: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+        profile: Optional[str] = None,
+        call_timeout: Optional[float] = None
+    ) -> Dict:
         """
         이미지에서 재료 추출
 
+        같은 이미지/모델/프롬프트의 분석이 이미 진행 중이면 새로 호출하지 않고 그 결과를 함께 받습니다.
+
         Args:
             image_base64: Base64 인코딩된 이미지
             custom_prompt: 커스텀 프롬프트 (optional)
+            previous_ingredients: 이전 분석 결과 (optional, 재분석 시 수정 사항만 요청)
+            model: 사용할 모델 (기본값: image_model, 다른 모델이면 별도 대기열 사용)
+            profile: 요청 프로필 이름 (기본값: 재분석이면 correction, 빠른 모델이면 fast, 그 외 analysis)
+            call_timeout: 모델 호출 시간 제한 (초, optional, 대기열 대기 시간은 포함하지 않음)
+
+        Raises:
+            asyncio.TimeoutError: 모델 호출이 call_timeout 안에 끝나지 않은 경우
 
         Returns:
             인식된 재료 목록
         """
-        logger.info(f"이미지 분석 시작 - 모델: {self.image_model}")
-
-        base_prompt = """이 냉장고 사진을 분석하여 보이는 모든 재료를 추출해주세요.
-
-반드시 다음 JSON 형식으로만 응답하세요. 다른 설명이나 스키마는 포함하지 마세요:
-{
-  "ingredients": [
-    {"name": "당근", "quantity": "3개", "freshness": "fresh", "confidence": 0.95},
-    {"name": "계란", "quantity": "10개", "freshness": "moderate", "confidence": 0.90}
-  ]
-}
-
-중요:
-- JSON 객체만 반환하세요
-- ingredients 배열 안에 실제 재료 정보를 넣으세요
-- 명확히 보이는 재료만 포함
-- 한글 재료명 사용
-- freshness: fresh, moderate, expiring 중 하나
-- confidence: 0.0~1.0 사이의 숫자
-"""
+        key = hashlib.sha256(json.dumps(
+            [model or self.image_model, profile, custom_prompt, previous_ingredients, image_base64],
+            ensure_ascii=False,
+            sort_keys=True
+        ).encode("utf-8")).hexdigest()
+        result = await self.single_flight.do(
+            key,
+            lambda: self._analyze_image(image_base64, custom_prompt, previous_ingredients, model, profile, call_timeout)
+        )
+        # 합쳐진 요청끼리 결과 객체를 공유하므로 요청별 사본 반환
+        return dict(result)
+
+    async def _analyze_image(
+        self,
+        image_base64: str,
+        custom_prompt: str = None,
+        previous_ingredients: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+        profile: Optional[str] = None,
+        call_timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        이미지에서 재료 추출 (실제 모델 호출)
+
+        Args:
+            image_base64: Base64 인코딩된 이미지
+            custom_prompt: 커스텀 프롬프트 (optional)
+            previous_ingredients: 이전 분석 결과 (optional, 재분석 시 수정 사항만 요청)
+            model: 사용할 모델 (기본값: image_model, 다른 모델이면 별도 대기열 사용)
+            profile: 요청 프로필 이름 (기본값: 재분석이면 correction, 빠른 모델이면 fast, 그 외 analysis)
+            call_timeout: 모델 호출 시간 제한 (초, optional, 슬롯을 얻은 뒤부터 적용)
+
+        Returns:
+            인식된 재료 목록
+        """
+        model = model or self.image_model
+        admission = self.admission_for(model)
+        if previous_ingredients:
+            profile = CORRECTION
+        request_profile = PROFILES[profile or (ANALYSIS if model == self.image_model else FAST)]
+        logger.info(f"이미지 분석 시작 - 모델: {model}, 프로필: {request_profile.name}")
 
-        # 커스텀 프롬프트가 있으면 추가
         if custom_prompt:
-            prompt = f"{base_prompt}\n\n추가 요청사항:\n{custom_prompt}"
             logger.info(f"커스텀 프롬프트 사용: {custom_prompt}")
-        else:
-            prompt = base_prompt
 
-        messages = [
-            {
-                "role": "user",
-                "content": prompt,
-                "images": [image_base64]
-            }
-        ]
+        messages = request_profile.messages(
+            self._build_user_content(custom_prompt, previous_ingredients),
+            images=[image_base64]
+        )
 
         try:
-            result = await self._make_chat_request(
-                model=self.image_model,
-                messages=messages,
-                timeout=240.0
-            )
+            # 회로가 열려 있거나 대기만으로 마감 시간을 넘길 것이 확실하면 대기열에 넣지 않음
+            self.check_available(admission=admission, model=model)
+
+            # 대기열이 가득 차면 ServiceOverloadedError로 즉시 거절
+            async with admission.slot():
+                started = time.monotonic()
+                result = await asyncio.wait_for(
+                    self._make_chat_request(
+                        model=model,
+                        messages=messages,
+                        profile=request_profile,
+                        timeout=240.0
+                    ),
+                    timeout=call_timeout
+                )
+                request_profile.observe(time.monotonic() - started, result)
 
             content = result.get("message", {}).get("content", "{}")
             logger.info(f"Ollama 이미지 분석 응답: {content[:500]}")
 
-            # JSON 파싱
-            parsed = self._parse_json_response(content)
+            # JSON 파싱 (앞뒤 텍스트/잘린 응답은 복구해서 완성된 재료를 살림)
+            parse_result = parse_llm_json(content, array_key="ingredients")
+            json_parse_metrics.record("ollama", parse_result.quality)
+            parsed = parse_result.value
 
             # 단일 객체를 배열로 변환 (qwen3-vl:4b가 단일 객체 반환 가능)
             if "name" in parsed and "ingredients" not in parsed:
@@ -155,10 +368,22 @@ class OllamaService:
             # ingredients가 없으면 빈 배열 반환
             if "ingredients" not in parsed or not isinstance(parsed["ingredients"], list):
                 logger.warning("재료 목록이 없거나 형식이 잘못되었습니다.")
-                parsed = {"ingredients": []}
-
-            # 모델 정보 추가
-            parsed["model"] = self.image_model
+                parsed = {"ingredients": [], "removed": parsed.get("removed")}
+
+            # 재분석: 수정 사항을 이전 결과에 반영
+            if previous_ingredients:
+                corrections = parsed
+                parsed = {
+                    "ingredients": self.apply_corrections(previous_ingredients, corrections),
+                    "corrections": {
+                        "updated": len(corrections.get("ingredients") or []),
+                        "removed": len(corrections.get("removed") or [])
+                    }
+                }
+
+            # 모델 정보와 파싱 품질 추가
+            parsed["model"] = model
+            parsed["parse_quality"] = parse_result.quality
 
             logger.info(f"파싱된 재료 개수: {len(parsed.get('ingredients', []))}")
             return parsed
@@ -168,32 +393,136 @@ class OllamaService:
             raise
 
 
-    def _parse_json_response(self, content: str) -> Dict:
+    async def stream_analyze_image(
+        self,
+        image_base64: str,
+        custom_prompt: str = None,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
         """
-        LLM 응답에서 JSON 추출 및 파싱
+        이미지에서 재료 추출 (스트리밍)
+
+        Ollama를 stream: true로 호출하고 부분 JSON을 증분 파싱하여
+        재료 객체가 닫히는 즉시 내보냅니다. 최상위 JSON이 닫히면 연결을 끊어
+        모델 생성을 중단합니다. 응답 도중에는 재시도하지 않습니다.
 
         Args:
-            content: LLM 응답 텍스트
+            image_base64: Base64 인코딩된 이미지
+            custom_prompt: 커스텀 프롬프트 (optional)
+            deadline: 요청 마감 시간 (optional, 연결/읽기 타임아웃을 남은 시간으로 제한)
 
-        Returns:
-            파싱된 JSON 객체
+        Yields:
+            ("ingredient", 재료) ... 마지막에 ("done", {"ingredients": [...], "model", "parse_quality", ...})
         """
+        logger.info(f"스트리밍 이미지 분석 시작 - 모델: {self.image_model}")
+
+        profile = PROFILES[ANALYSIS]
+        data = profile.build_request(
+            self.image_model,
+            profile.messages(self._build_user_content(custom_prompt), images=[image_base64]),
+            stream=True,
+            keep_alive=self.pool.keep_alive
+        )
+        final_chunk = None
+
+        parser = IncrementalJSONParser(array_key="ingredients")
+        ingredients = []
+        started = time.monotonic()
+        first_ingredient_at = None
+
         try:
-            # 코드 블록 제거
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                # 첫 번째 ```와 마지막 ``` 사이의 내용 추출
-                parts = content.split("```")
-                if len(parts) >= 3:
-                    content = parts[1]
-
-            # JSON 파싱
-            parsed = json.loads(content.strip())
-            return parsed
+            self.check_available(deadline)
+            async with self.admission.slot(), self.pool.acquire(deadline) as endpoint:
+                async with self.http.stream(
+                    "POST",
+                    f"{endpoint.url}/api/chat",
+                    json=data,
+                    timeout=attempt_timeout(240.0, deadline=deadline)
+                ) as response:
+                    if response.status_code >= 400:
+                        await response.aread()
+                        logger.error(f"HTTP 오류: {response.status_code} - {response.text}")
+                        raise Exception(f"Ollama API HTTP 오류: {response.status_code}")
+
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("error"):
+                            raise Exception(f"Ollama API 오류: {chunk['error']}")
+
+                        content = chunk.get("message", {}).get("content", "")
+                        for key, item in parser.feed(content):
+                            if key != "ingredients" or not item.get("name"):
+                                continue
+                            if first_ingredient_at is None:
+                                first_ingredient_at = time.monotonic() - started
+                                self.stream_first_ingredient.observe(first_ingredient_at)
+                            ingredients.append(item)
+                            yield "ingredient", item
+
+                        if chunk.get("done"):
+                            final_chunk = chunk
+                            break
+                        # 최상위 JSON이 닫히면 남은 생성을 기다리지 않고 연결 종료
+                        if parser.done:
+                            break
+
+        except httpx.TimeoutException as e:
+            logger.error("Ollama API 타임아웃 (스트리밍)")
+            raise_if_expired(e, deadline)
+            raise
+        except httpx.NetworkError as e:
+            logger.error(f"네트워크 오류 (Ollama가 실행 중인지 확인하세요): {str(e)}")
+            raise Exception("Ollama 서버에 연결할 수 없습니다. Ollama가 실행 중인지 확인하세요.")
+
+        # 최상위 JSON이 닫히지 않았으면 잘린 응답 (완성된 재료만 보냈으므로 일부가 빠졌을 수 있음)
+        if parser.done:
+            quality = PARSE_OK
+        elif ingredients:
+            quality = PARSE_REPAIRED
+        else:
+            parse_result = parse_llm_json(parser.buffer, array_key="ingredients")
+            quality = parse_result.quality
+            for item in parse_result.value.get("ingredients") or []:
+                if isinstance(item, dict) and item.get("name"):
+                    ingredients.append(item)
+                    yield "ingredient", item
+
+        # 배열 없이 단일 재료 객체만 반환한 경우 보정
+        if not ingredients:
+            parsed = parser.result() or parse_llm_json(parser.buffer, array_key="ingredients").value
+            if "name" in parsed and "ingredients" not in parsed:
+                ingredients = [parsed]
+                yield "ingredient", parsed
+        json_parse_metrics.record("ollama_stream", quality)
+
+        duration = time.monotonic() - started
+        self.stream_total.observe(duration)
+        profile.observe(duration, final_chunk)
+        logger.info(
+            f"스트리밍 이미지 분석 완료 - 재료 {len(ingredients)}개, "
+            f"첫 재료: {first_ingredient_at}s, 전체: {duration:.1f}s"
+        )
+        yield "done", {
+            "ingredients": ingredients,
+            "model": self.image_model,
+            "parse_quality": quality,
+            "time_to_first_ingredient": first_ingredient_at,
+            "duration": duration
+        }
+
+    def stream_stats(self) -> Dict:
+        """스트리밍 분석 지표 (초)"""
+        return {
+            "time_to_first_ingredient": self.stream_first_ingredient.snapshot(),
+            "total": self.stream_total.snapshot()
+        }
+
+    def profile_stats(self) -> Dict:
+        """요청 프로필별 설정/지연 시간/토큰 수"""
+        return profile_stats()
+
 
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON 파싱 실패: {str(e)}")
-            logger.error(f"원본 내용: {content}")
-            # 파싱 실패 시 빈 결과 반환
-            return {"error": "JSON 파싱 실패", "raw_content": content[:200]}
+# 애플리케이션 전역 인스턴스 (HTTP 클라이언트는 lifespan에서 시작/종료)
+ollama_service = OllamaService()
@@ -1,10 +1,13 @@
 """
 OpenRouter API 서비스
 """
+import asyncio
 import httpx
 import json
 import logging
-from typing import List, Dict, Optional
+import time
+from collections import Counter
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -13,11 +16,49 @@ from tenacity import (
     before_sleep_log
 )
 from app.config import settings
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.http_client import UpstreamClient
+from app.services.recipe_cache import canonical_request, normalize_name
+from app.utils.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    attempt_timeout,
+    current_deadline,
+    raise_if_expired,
+    stop_at_deadline,
+    wait_within_deadline
+)
+from app.utils.hedging import HedgedRequests
+from app.utils.json_stream import IncrementalJSONParser
+from app.utils.llm_json import (
+    PARSE_EXTRACTED,
+    PARSE_FAILED,
+    PARSE_OK,
+    PARSE_REPAIRED,
+    json_parse_metrics,
+    parse_llm_json
+)
 from app.utils.logger import get_logger
+from app.utils.metrics import RollingStats
+from app.utils.single_flight import SingleFlight
 
 # 로거 설정
 logger = get_logger(__name__)
 
+SINGLE_MODE = "single"
+FANOUT_MODE = "fanout"
+
+# 팬아웃 요청별 요리 종류 힌트 (레시피끼리 겹치지 않도록)
+RECIPE_DIVERSITY_HINTS = [
+    "밥/면 요리 (한 그릇 식사)",
+    "국/찌개/탕",
+    "볶음/구이/조림 반찬",
+    "무침/샐러드 등 가벼운 요리",
+    "간식/야식"
+]
+
+PARSE_QUALITY_ORDER = [PARSE_OK, PARSE_EXTRACTED, PARSE_REPAIRED, PARSE_FAILED]
+
 
 class OpenRouterService:
     """OpenRouter API 통합 서비스"""
@@ -28,9 +69,53 @@ class OpenRouterService:
         self.image_model = settings.IMAGE_MODEL
         self.text_model = settings.TEXT_MODEL
 
-        # httpx 클라이언트 설정
+        # httpx 클라이언트 설정 (lifespan 동안 공유되는 커넥션 풀, HTTP/2)
         self.timeout = httpx.Timeout(60.0, connect=10.0)
-        self.limits = httpx.Limits(max_keepalive_connections=5, max_connections=10)
+        self.limits = httpx.Limits(
+            max_keepalive_connections=settings.OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=settings.OPENROUTER_MAX_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+        self.http = UpstreamClient(
+            "openrouter",
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=settings.OPENROUTER_HTTP2
+        )
+
+        # 서킷 브레이커: 오류율/느린 호출 비율이 높으면 일정 시간 즉시 실패 (/health에 상태 표시)
+        self.breaker = CircuitBreaker(
+            "openrouter",
+            window=settings.CIRCUIT_BREAKER_WINDOW,
+            min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+            failure_rate_threshold=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+            slow_call_seconds=settings.OPENROUTER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=settings.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+            open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS
+        )
+
+        # 레시피 생성 헤지 요청 (느린 응답 꼬리 완화, 추가 요청은 OPENROUTER_HEDGE_BUDGET 비율 이내)
+        self.hedging = HedgedRequests(
+            "openrouter",
+            percentile=settings.OPENROUTER_HEDGE_PERCENTILE,
+            min_delay=settings.OPENROUTER_HEDGE_MIN_DELAY,
+            min_samples=settings.OPENROUTER_HEDGE_MIN_SAMPLES,
+            budget=settings.OPENROUTER_HEDGE_BUDGET,
+            holdout=settings.OPENROUTER_HEDGE_HOLDOUT
+        )
+        self.hedge_models = settings.openrouter_hedge_models
+        self._hedge_model_index = 0
+
+        # 같은 재료 집합/선호도(레시피 캐시와 같은 정규 키)의 진행 중 생성 합치기
+        self.single_flight = SingleFlight("openrouter")
+
+        # 생성 방식별 레시피 생성 시간 (초) / 팬아웃 요청 결과
+        self.generation_latency = {SINGLE_MODE: RollingStats(), FANOUT_MODE: RollingStats()}
+        self._fanout_outcomes = Counter()
+
+        # 스트리밍 레시피 생성 지표: 첫 레시피까지 걸린 시간 / 전체 시간 (초)
+        self.stream_first_recipe = RollingStats()
+        self.stream_total = RollingStats()
 
     def _create_headers(self) -> Dict[str, str]:
         """API 요청 헤더 생성"""
@@ -40,77 +125,106 @@ class OpenRouterService:
         }
 
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        # 요청 마감 시간이 있으면 시도 횟수와 관계없이 남은 시간 안에서만 재시도
+        stop=stop_after_attempt(3) | stop_at_deadline(),
+        wait=wait_within_deadline(wait_exponential(multiplier=1, min=2, max=10)),
         retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError)),
-        before_sleep=before_sleep_log(logger, logging.WARNING)
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
     )
     async def _make_api_request(
         self,
         data: Dict,
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        hedge: bool = False
     ) -> Dict:
         """
         OpenRouter API에 요청 보내기 (재시도 로직 포함)
 
+        hedge=True이고 OPENROUTER_HEDGE_ENABLED이면 시도마다 헤지 요청을 적용합니다:
+        응답이 적응형 임계값(최근 응답 시간 p90) 안에 없으면 대체 모델(없으면 같은 모델)로 두 번째 요청을 보내고
+        먼저 성공한 응답을 사용합니다. 진 요청은 취소합니다.
+
         Args:
             data: 요청 데이터
             timeout: 타임아웃 (초)
+            hedge: 헤지 요청 적용 여부 (이미지처럼 요청 본문이 큰 호출은 제외)
 
         Returns:
-            API 응답
+            API 응답 (헤지 요청이 이긴 경우 model은 대체 모델)
         """
-        headers = self._create_headers()
         request_timeout = timeout or 60.0
 
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(request_timeout, connect=10.0),
-            limits=self.limits
-        ) as client:
-            try:
-                response = await client.post(
-                    self.api_url,
-                    headers=headers,
-                    json=data
+        try:
+            if hedge and settings.OPENROUTER_HEDGE_ENABLED:
+                return await self.hedging.run(
+                    lambda: self._post(data, request_timeout),
+                    lambda: self._post(self._hedge_request(data), request_timeout)
                 )
-                response.raise_for_status()
-                return response.json()
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-                raise Exception(f"OpenRouter API HTTP 오류: {e.response.status_code}")
-            except httpx.TimeoutException:
-                logger.error("OpenRouter API 타임아웃")
-                raise
-            except httpx.NetworkError as e:
-                logger.error(f"네트워크 오류: {str(e)}")
-                raise
-            except Exception as e:
-                logger.error(f"API 요청 중 예상치 못한 오류: {str(e)}")
-                raise Exception(f"OpenRouter API 오류: {str(e)}")
+            return await self._post(data, request_timeout)
 
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
+            raise Exception(f"OpenRouter API HTTP 오류: {e.response.status_code}")
+        except httpx.TimeoutException as e:
+            logger.error("OpenRouter API 타임아웃")
+            raise_if_expired(e)
+            raise
+        except httpx.NetworkError as e:
+            logger.error(f"네트워크 오류: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"API 요청 중 예상치 못한 오류: {str(e)}")
+            raise Exception(f"OpenRouter API 오류: {str(e)}")
 
-    async def generate_recipes(
+
+    async def _post(self, data: Dict, request_timeout: float) -> Dict:
+        """OpenRouter API 요청 1회 (서킷 브레이커 적용)"""
+        async with self.breaker.call():
+            response = await self.http.post(
+                self.api_url,
+                headers=self._create_headers(),
+                json=data,
+                timeout=attempt_timeout(request_timeout)
+            )
+            response.raise_for_status()
+        return response.json()
+
+    def _hedge_request(self, data: Dict) -> Dict:
+        """헤지 요청 데이터 (대체 모델을 순서대로 돌아가며 사용)"""
+        if not self.hedge_models:
+            return data
+        model = self.hedge_models[self._hedge_model_index % len(self.hedge_models)]
+        self._hedge_model_index += 1
+        logger.info(f"헤지 요청 모델: {model}")
+        return {**data, "model": model}
+
+    def build_recipe_prompt(
         self,
         ingredients: List[str],
-        preferences: Optional[Dict] = None
-    ) -> Dict:
+        preferences: Optional[Dict] = None,
+        count: Optional[int] = None,
+        hint: Optional[str] = None
+    ) -> str:
         """
-        재료 기반 레시피 생성 (OpenRouter Solar 모델 사용)
+        레시피 생성 프롬프트
 
         Args:
             ingredients: 재료 목록
             preferences: 사용자 선호도
+            count: 레시피 수 (기본값: RECIPE_COUNT)
+            hint: 요리 종류 힌트 (optional)
 
         Returns:
-            레시피 목록
+            모델에 보낼 프롬프트
         """
-        logger.info(f"레시피 생성 시작 - 모델: {self.text_model}")
-
         ingredients_str = ", ".join(ingredients)
+        count = count or settings.RECIPE_COUNT
 
         prompt = f"""
-        다음 재료를 사용하여 만들 수 있는 레시피 3개를 추천해주세요:
+        다음 재료를 사용하여 만들 수 있는 레시피 {count}개를 추천해주세요:
         재료: {ingredients_str}
 
         다음 JSON 형식으로만 응답해주세요 (다른 설명 없이):
@@ -143,6 +257,156 @@ class OpenRouterService:
                 prompt += f"\n식단 제한: {', '.join(preferences['dietary_restrictions'])}"
             if preferences.get('excluded_ingredients'):
                 prompt += f"\n제외할 재료: {', '.join(preferences['excluded_ingredients'])}"
+        if hint:
+            prompt += f"\n요리 종류: {hint} (이 종류에 해당하는 요리로 추천)"
+
+        return prompt
+
+    async def generate_recipes(
+        self,
+        ingredients: List[str],
+        preferences: Optional[Dict] = None,
+        mode: Optional[str] = None
+    ) -> Dict:
+        """
+        재료 기반 레시피 생성 (OpenRouter Solar 모델 사용)
+
+        정규화한 재료 집합과 선호도가 같은 생성이 이미 진행 중이면 새로 호출하지 않고 그 결과를 함께 받습니다.
+
+        Args:
+            ingredients: 재료 목록
+            preferences: 사용자 선호도
+            mode: single (프롬프트 하나로 RECIPE_COUNT개) | fanout (1개씩 동시 요청, 기본값: RECIPE_GENERATION_MODE)
+
+        Returns:
+            레시피 목록
+        """
+        mode = mode or settings.RECIPE_GENERATION_MODE
+        key, _ = canonical_request(ingredients, preferences, self.text_model)
+        if mode == FANOUT_MODE:
+            call = lambda: self._generate_recipes_fanout(ingredients, preferences, settings.RECIPE_COUNT)
+        else:
+            call = lambda: self._generate_recipes(ingredients, preferences, settings.RECIPE_COUNT)
+
+        started = time.monotonic()
+        result = await self.single_flight.do(f"{key}:{mode}", call)
+        self.generation_latency[mode if mode == FANOUT_MODE else SINGLE_MODE].observe(time.monotonic() - started)
+        # 합쳐진 요청끼리 결과 객체를 공유하므로 요청별 사본 반환
+        return dict(result)
+
+    async def _generate_recipes_fanout(
+        self,
+        ingredients: List[str],
+        preferences: Optional[Dict],
+        count: int
+    ) -> Dict:
+        """
+        레시피 count개를 1개씩 동시에 요청해 합치기
+
+        요청마다 다른 요리 종류 힌트를 주어 결과가 겹치지 않게 하고, 도착하는 대로 합칩니다.
+        RECIPE_FANOUT_TIMEOUT(요청 마감 시간이 더 짧으면 그 시간)이 지나면 끝나지 않은 요청은 취소하고
+        그때까지 도착한 레시피만 반환합니다. 그때까지 하나도 도착하지 않았으면 첫 결과까지 기다립니다.
+
+        Args:
+            ingredients: 재료 목록
+            preferences: 사용자 선호도
+            count: 레시피 수 (동시 요청 수)
+
+        Returns:
+            레시피 목록 (fanout: 요청/완료/실패/중단 수, partial: count개보다 적은지 여부)
+        """
+        started = time.monotonic()
+        cutoff_at = started + settings.RECIPE_FANOUT_TIMEOUT
+        deadline = current_deadline()
+        if deadline is not None:
+            cutoff_at = min(cutoff_at, time.monotonic() + deadline.remaining())
+
+        hints = [RECIPE_DIVERSITY_HINTS[i % len(RECIPE_DIVERSITY_HINTS)] for i in range(count)]
+        pending = {
+            asyncio.ensure_future(self._generate_recipes(ingredients, preferences, count=1, hint=hint))
+            for hint in hints
+        }
+        logger.info(f"레시피 팬아웃 생성 시작 - {count}개 동시 요청")
+
+        recipes, titles, qualities, errors = [], set(), [], []
+        try:
+            while pending:
+                # 아직 레시피가 하나도 없으면 중단 시각이 지나도 첫 결과까지 대기 (업스트림 타임아웃/마감 시간으로 제한)
+                timeout = max(cutoff_at - time.monotonic(), 0) if recipes else None
+                if timeout == 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"팬아웃 레시피 요청 실패: {str(e)}")
+                        errors.append(e)
+                        continue
+                    qualities.append(result["parse_quality"])
+                    for recipe in result["recipes"]:
+                        title = normalize_name(str(recipe.get("title", "")))
+                        if title and title not in titles:
+                            titles.add(title)
+                            recipes.append(recipe)
+        finally:
+            # 마감 시각을 넘긴 요청(또는 호출 측 취소 시 전체) 취소
+            cut_off = len(pending)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if not recipes and errors:
+            raise errors[0]
+
+        duration = time.monotonic() - started
+        self._fanout_outcomes["completed"] += len(qualities)
+        self._fanout_outcomes["failed"] += len(errors)
+        self._fanout_outcomes["cut_off"] += cut_off
+        logger.info(
+            f"레시피 팬아웃 생성 완료 - 레시피 {len(recipes)}/{count}개, "
+            f"실패 {len(errors)}개, 중단 {cut_off}개, {duration:.1f}s"
+        )
+        return {
+            "recipes": recipes[:count],
+            # 도착한 응답 중 가장 나쁜 파싱 품질
+            "parse_quality": max(qualities, key=PARSE_QUALITY_ORDER.index) if recipes else PARSE_FAILED,
+            "partial": len(recipes) < count,
+            "fanout": {
+                "requested": count,
+                "completed": len(qualities),
+                "failed": len(errors),
+                "cut_off": cut_off,
+                "duration": round(duration, 3)
+            }
+        }
+
+    async def _generate_recipes(
+        self,
+        ingredients: List[str],
+        preferences: Optional[Dict] = None,
+        count: Optional[int] = None,
+        hint: Optional[str] = None
+    ) -> Dict:
+        """
+        재료 기반 레시피 생성 (실제 모델 호출)
+
+        Args:
+            ingredients: 재료 목록
+            preferences: 사용자 선호도
+            count: 레시피 수 (기본값: RECIPE_COUNT)
+            hint: 요리 종류 힌트 (optional, 팬아웃 요청끼리 겹치지 않도록)
+
+        Returns:
+            레시피 목록
+        """
+        logger.info(f"레시피 생성 시작 - 모델: {self.text_model}" + (f", 종류: {hint}" if hint else ""))
+
+        prompt = self.build_recipe_prompt(ingredients, preferences, count=count, hint=hint)
 
         data = {
             "model": self.text_model,
@@ -152,12 +416,18 @@ class OpenRouterService:
         }
 
         try:
-            result = await self._make_api_request(data, timeout=60.0)
+            result = await self._make_api_request(data, timeout=60.0, hedge=True)
             content = result["choices"][0]["message"]["content"]
 
-            # JSON 파싱
-            parsed = self._parse_json_response(content)
-            logger.info(f"생성된 레시피 개수: {len(parsed.get('recipes', []))}")
+            # JSON 파싱 (앞뒤 텍스트/잘린 응답은 복구해서 완성된 레시피를 살림)
+            parse_result = parse_llm_json(content, array_key="recipes")
+            json_parse_metrics.record("openrouter", parse_result.quality)
+            parsed = parse_result.value
+            if not isinstance(parsed.get("recipes"), list):
+                logger.warning("레시피 목록이 없거나 형식이 잘못되었습니다.")
+                parsed = {"recipes": []}
+            parsed["parse_quality"] = parse_result.quality
+            logger.info(f"생성된 레시피 개수: {len(parsed['recipes'])} (파싱: {parse_result.quality})")
 
             return parsed
 
@@ -165,26 +435,190 @@ class OpenRouterService:
             logger.error(f"레시피 생성 실패: {str(e)}")
             raise
 
-    def _parse_json_response(self, content: str) -> Dict:
+    async def stream_generate_recipes(
+        self,
+        ingredients: List[str],
+        preferences: Optional[Dict] = None,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        재료 기반 레시피 생성 (스트리밍)
+
+        OpenRouter를 stream: true로 호출하고 토큰 스트림을 증분 파싱하여
+        레시피 객체가 닫히는 즉시 내보냅니다. 최상위 JSON이 닫히면 연결을 끊어
+        남은 생성을 중단합니다. 응답 도중에는 재시도하지 않습니다.
+
+        Args:
+            ingredients: 재료 목록
+            preferences: 사용자 선호도
+            deadline: 요청 마감 시간 (optional, 연결/읽기 타임아웃을 남은 시간으로 제한)
+
+        Yields:
+            ("recipe", 레시피) ... 마지막에 ("done", {"recipes": [...], "model", "parse_quality", ...})
+        """
+        logger.info(f"스트리밍 레시피 생성 시작 - 모델: {self.text_model}")
+
+        data = {
+            "model": self.text_model,
+            "messages": [
+                {"role": "user", "content": self.build_recipe_prompt(ingredients, preferences)}
+            ],
+            "stream": True
+        }
+
+        parser = IncrementalJSONParser(array_key="recipes")
+        recipes = []
+        started = time.monotonic()
+        first_recipe_at = None
+
+        try:
+            async with self.breaker.call(deadline), self.http.stream(
+                "POST",
+                self.api_url,
+                headers=self._create_headers(),
+                json=data,
+                timeout=attempt_timeout(60.0, deadline=deadline)
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    logger.error(f"HTTP 오류: {response.status_code} - {response.text}")
+                    response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    # 빈 줄과 ": OPENROUTER PROCESSING" 같은 주석(keep-alive)은 무시
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == "[DONE]":
+                        break
+                    chunk = json.loads(payload)
+                    if chunk.get("error"):
+                        raise Exception(f"OpenRouter API 오류: {chunk['error'].get('message', chunk['error'])}")
+
+                    choices = chunk.get("choices") or [{}]
+                    content = (choices[0].get("delta") or {}).get("content") or ""
+                    for key, item in parser.feed(content):
+                        if key != "recipes" or not item.get("title"):
+                            continue
+                        if first_recipe_at is None:
+                            first_recipe_at = time.monotonic() - started
+                            self.stream_first_recipe.observe(first_recipe_at)
+                        recipes.append(item)
+                        yield "recipe", item
+
+                    # 최상위 JSON이 닫히면 남은 생성을 기다리지 않고 연결 종료
+                    if parser.done:
+                        break
+
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"OpenRouter API HTTP 오류: {e.response.status_code}")
+        except httpx.TimeoutException as e:
+            logger.error("OpenRouter API 타임아웃 (스트리밍)")
+            raise_if_expired(e, deadline)
+            raise
+        except httpx.NetworkError as e:
+            logger.error(f"네트워크 오류 (스트리밍): {str(e)}")
+            raise Exception("OpenRouter 서버에 연결할 수 없습니다.")
+
+        # 증분 파싱으로 완성된 레시피가 없으면 전체 텍스트에서 복구 (잘린 응답/다른 형식)
+        if parser.done:
+            quality = PARSE_OK
+        elif recipes:
+            quality = PARSE_REPAIRED
+        else:
+            parse_result = parse_llm_json(parser.buffer, array_key="recipes")
+            quality = parse_result.quality
+            for item in parse_result.value.get("recipes") or []:
+                if isinstance(item, dict) and item.get("title"):
+                    recipes.append(item)
+                    yield "recipe", item
+        json_parse_metrics.record("openrouter_stream", quality)
+
+        duration = time.monotonic() - started
+        self.stream_total.observe(duration)
+        logger.info(
+            f"스트리밍 레시피 생성 완료 - 레시피 {len(recipes)}개, "
+            f"첫 레시피: {first_recipe_at}s, 전체: {duration:.1f}s"
+        )
+        yield "done", {
+            "recipes": recipes,
+            "model": self.text_model,
+            "parse_quality": quality,
+            "time_to_first_recipe": first_recipe_at,
+            "duration": duration
+        }
+
+    def generation_stats(self) -> Dict:
+        """생성 방식별 레시피 생성 시간 (초)과 팬아웃 요청 결과"""
+        return {
+            "default_mode": settings.RECIPE_GENERATION_MODE,
+            "latency": {mode: stats.snapshot() for mode, stats in self.generation_latency.items()},
+            "fanout_requests": dict(self._fanout_outcomes)
+        }
+
+    def hedge_stats(self) -> Dict:
+        """레시피 생성 헤지 요청 지표 (응답 시간: 초)"""
+        return {
+            "enabled": settings.OPENROUTER_HEDGE_ENABLED,
+            "models": self.hedge_models,
+            **self.hedging.stats()
+        }
+
+    def stream_stats(self) -> Dict:
+        """스트리밍 레시피 생성 지표 (초)"""
+        return {
+            "time_to_first_recipe": self.stream_first_recipe.snapshot(),
+            "total": self.stream_total.snapshot()
+        }
+
+    async def analyze_image(self, image_base64: str, prompt: str) -> Dict:
         """
-        LLM 응답에서 JSON 추출 및 파싱
+        이미지에서 재료 추출 (OpenRouter 멀티모달 모델, 부하가 높을 때의 빠른 티어)
 
         Args:
-            content: LLM 응답 텍스트
+            image_base64: Base64 인코딩된 JPEG 이미지
+            prompt: 분석 프롬프트 (Ollama와 같은 프롬프트 사용)
 
         Returns:
-            파싱된 JSON 객체
+            인식된 재료 목록
         """
+        logger.info(f"이미지 분석 시작 - 모델: {self.image_model}")
+
+        data = {
+            "model": self.image_model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"}}
+                    ]
+                }
+            ]
+        }
+
         try:
-            # 코드 블록 제거
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-
-            # JSON 파싱
-            return json.loads(content.strip())
-
-        except json.JSONDecodeError as e:
-            # 파싱 실패 시 원본 텍스트 반환
-            return {"error": "JSON 파싱 실패", "raw_content": content}
+            result = await self._make_api_request(data, timeout=60.0)
+            content = result["choices"][0]["message"]["content"]
+
+            parse_result = parse_llm_json(content, array_key="ingredients")
+            json_parse_metrics.record("openrouter", parse_result.quality)
+            parsed = parse_result.value
+            if "name" in parsed and "ingredients" not in parsed:
+                parsed = {"ingredients": [parsed]}
+            if not isinstance(parsed.get("ingredients"), list):
+                logger.warning("재료 목록이 없거나 형식이 잘못되었습니다.")
+                parsed = {"ingredients": []}
+
+            parsed["model"] = self.image_model
+            parsed["parse_quality"] = parse_result.quality
+            logger.info(f"파싱된 재료 개수: {len(parsed['ingredients'])}")
+            return parsed
+
+        except Exception as e:
+            logger.error(f"이미지 분석 실패: {str(e)}")
+            raise
+
+
+# 애플리케이션 전역 인스턴스 (HTTP 클라이언트는 lifespan에서 시작/종료)
+openrouter_service = OpenRouterService()
@@ -0,0 +1,328 @@
+"""
+레시피 생성 결과 캐시 서비스
+
+많은 사용자가 같은 기본 재료(김치, 계란, 밥...)와 같은 선호도로 레시피를 요청하므로
+5~60초 걸리는 LLM 호출 대신 이전 생성 결과를 반환합니다.
+- 키: 정규화한 재료 이름(NFC, 공백 정리, 소문자, 중복 제거, 정렬) + 프롬프트에 쓰이는 선호도 필드 + 모델의 SHA-256
+- 1단계: 프로세스 메모리 LRU (최대 RECIPE_CACHE_MEMORY_ENTRIES개)
+- 2단계: SQLite recipe_cache 테이블 (프로세스 재시작/여러 프로세스 간 공유)
+- 정리: TTL 만료 항목 삭제 + 최대 개수 초과 시 최근 사용(LRU) 순으로 삭제
+
+메모리 계층은 프로세스별이므로 관리자 삭제(purge)는 요청을 받은 프로세스의 메모리와 DB만 비웁니다.
+다른 프로세스의 메모리 항목은 TTL이 지나면 사라집니다.
+"""
+import hashlib
+import json
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.recipe_cache import RecipeCacheEntry
+from app.utils.llm_json import PARSE_EXTRACTED, PARSE_OK
+from app.utils.logger import get_logger
+from app.utils.metrics import RollingStats
+
+logger = get_logger(__name__)
+
+# 레시피 프롬프트에 반영되는 선호도 필드 (그 외 필드는 결과에 영향이 없으므로 키에서 제외)
+PREFERENCE_FIELDS = ("dietary_restrictions", "excluded_ingredients")
+
+MEMORY_TIER = "memory"
+DB_TIER = "db"
+
+
+def normalize_name(name: str) -> str:
+    """재료/선호도 이름 정규화 (NFC, 공백 정리, 소문자)"""
+    return " ".join(unicodedata.normalize("NFC", name).split()).lower()
+
+
+def normalize_names(names: List[str]) -> List[str]:
+    """이름 목록 정규화 (빈 값 제외, 중복 제거, 정렬)"""
+    return sorted({normalize_name(name) for name in names if isinstance(name, str) and name.strip()})
+
+
+def canonical_request(
+    ingredients: List[str],
+    preferences: Optional[Dict],
+    model: str
+) -> Tuple[str, Dict]:
+    """
+    레시피 요청의 정규형과 캐시 키
+
+    Args:
+        ingredients: 재료 목록
+        preferences: 사용자 선호도 (optional)
+        model: 레시피 생성 모델
+
+    Returns:
+        (캐시 키, 정규형 {"ingredients", "preferences", "model"})
+    """
+    relevant = {}
+    for field in PREFERENCE_FIELDS:
+        values = (preferences or {}).get(field)
+        if isinstance(values, list):
+            values = normalize_names(values)
+        if values:
+            relevant[field] = values
+
+    canonical = {
+        "ingredients": normalize_names(ingredients),
+        "preferences": relevant,
+        "model": model
+    }
+    encoded = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest(), canonical
+
+
+class RecipeCache:
+    """메모리 LRU + SQLite 2단계 레시피 생성 결과 캐시"""
+
+    def __init__(self):
+        self.enabled = settings.RECIPE_CACHE_ENABLED
+        self.ttl = timedelta(hours=settings.RECIPE_CACHE_TTL_HOURS)
+        self.max_entries = settings.RECIPE_CACHE_MAX_ENTRIES
+        self.memory_entries = settings.RECIPE_CACHE_MEMORY_ENTRIES
+
+        self._memory: "OrderedDict[str, Tuple[datetime, Dict]]" = OrderedDict()  # 키 → (생성 시각, 결과)
+
+        # 통계
+        self._memory_hits = 0
+        self._db_hits = 0
+        self._misses = 0
+        self._stored = 0
+        self._skipped = 0  # 부분 결과 등으로 저장하지 않은 수
+        self.hit_latency = RollingStats()  # 적중 시 조회 시간 (초)
+
+    def _memory_get(self, key: str) -> Optional[Tuple[datetime, Dict]]:
+        """메모리 계층 조회 (만료 항목은 삭제)"""
+        item = self._memory.get(key)
+        if item is None:
+            return None
+        if datetime.utcnow() - item[0] >= self.ttl:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return item
+
+    def _memory_put(self, key: str, created_at: datetime, result: Dict) -> None:
+        """메모리 계층 저장 (최대 개수 초과 시 가장 오래 사용하지 않은 항목 삭제)"""
+        self._memory[key] = (created_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _hit(result: Dict, key: str, tier: str, created_at: datetime) -> Dict:
+        return {
+            **result,
+            "cached": True,
+            "cache": {
+                "tier": tier,
+                "key": key,
+                "age_seconds": int((datetime.utcnow() - created_at).total_seconds())
+            }
+        }
+
+    async def lookup(
+        self,
+        ingredients: List[str],
+        preferences: Optional[Dict],
+        model: str
+    ) -> Optional[Dict]:
+        """
+        캐시된 레시피 생성 결과 조회 (메모리 → DB)
+
+        Args:
+            ingredients: 재료 목록
+            preferences: 사용자 선호도 (optional)
+            model: 레시피 생성 모델
+
+        Returns:
+            캐시된 결과 (없으면 None)
+        """
+        if not self.enabled:
+            return None
+
+        started = time.monotonic()
+        key, _ = canonical_request(ingredients, preferences, model)
+
+        item = self._memory_get(key)
+        if item is not None:
+            self._memory_hits += 1
+            self.hit_latency.observe(time.monotonic() - started)
+            return self._hit(item[1], key, MEMORY_TIER, item[0])
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(RecipeCacheEntry).where(
+                    RecipeCacheEntry.cache_key == key,
+                    RecipeCacheEntry.created_at >= datetime.utcnow() - self.ttl
+                )
+            )
+            entry = result.scalar_one_or_none()
+            if entry is None:
+                self._misses += 1
+                return None
+
+            # LRU 갱신
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_used_at = datetime.utcnow()
+            await db.commit()
+
+        self._db_hits += 1
+        self._memory_put(key, entry.created_at, entry.result)
+        self.hit_latency.observe(time.monotonic() - started)
+        logger.info(f"레시피 캐시 적중 (DB) - 키: {key[:12]}")
+        return self._hit(entry.result, key, DB_TIER, entry.created_at)
+
+    async def store(
+        self,
+        ingredients: List[str],
+        preferences: Optional[Dict],
+        model: str,
+        result: Dict
+    ) -> None:
+        """
+        레시피 생성 결과 저장
+
+        빈 결과, 잘린 응답에서 복구한 결과(parse_quality=repaired), 팬아웃에서 일부 요청만 도착한 결과(partial)는
+        일부 레시피가 빠졌을 수 있으므로 저장하지 않습니다.
+
+        Args:
+            ingredients: 재료 목록
+            preferences: 사용자 선호도 (optional)
+            model: 레시피 생성 모델
+            result: 생성 결과 {"recipes": [...], "parse_quality": ...}
+        """
+        if not self.enabled:
+            return
+        recipes = result.get("recipes") or []
+        if (
+            not recipes
+            or result.get("partial")
+            or result.get("parse_quality", PARSE_OK) not in (PARSE_OK, PARSE_EXTRACTED)
+        ):
+            self._skipped += 1
+            return
+
+        key, canonical = canonical_request(ingredients, preferences, model)
+        cached = {"recipes": recipes, "parse_quality": result.get("parse_quality", PARSE_OK)}
+        now = datetime.utcnow()
+        self._memory_put(key, now, cached)
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await self.evict(db)
+                # 만료되었거나 동시에 저장된 같은 키 항목은 교체
+                await db.execute(delete(RecipeCacheEntry).where(RecipeCacheEntry.cache_key == key))
+                db.add(RecipeCacheEntry(
+                    cache_key=key,
+                    model=model,
+                    ingredients=canonical["ingredients"],
+                    preferences=canonical["preferences"] or None,
+                    result=cached,
+                    created_at=now,
+                    last_used_at=now
+                ))
+                await db.commit()
+            self._stored += 1
+        except Exception as e:
+            # 캐시 저장 실패는 응답에 영향을 주지 않음
+            logger.warning(f"레시피 캐시 저장 실패: {str(e)}")
+
+    async def evict(self, db: AsyncSession) -> None:
+        """TTL 만료 항목과 최대 개수 초과분(LRU) 삭제 (호출 측 커밋 시 반영)"""
+        await db.execute(
+            delete(RecipeCacheEntry)
+            .where(RecipeCacheEntry.created_at < datetime.utcnow() - self.ttl)
+        )
+
+        count_result = await db.execute(select(func.count()).select_from(RecipeCacheEntry))
+        overflow = count_result.scalar() - self.max_entries + 1
+        if overflow > 0:
+            oldest = (
+                select(RecipeCacheEntry.id)
+                .order_by(RecipeCacheEntry.last_used_at.asc())
+                .limit(overflow)
+            )
+            await db.execute(
+                delete(RecipeCacheEntry).where(RecipeCacheEntry.id.in_(oldest))
+            )
+            logger.info(f"레시피 캐시 LRU 정리 - {overflow}개 삭제")
+
+    async def entries(self, db: AsyncSession, limit: int = 50) -> Dict:
+        """
+        캐시 항목 조회 (최근 사용 순)
+
+        Args:
+            db: 데이터베이스 세션
+            limit: 최대 항목 수
+
+        Returns:
+            {"total": DB 항목 수, "entries": [...]}
+        """
+        total = (await db.execute(select(func.count()).select_from(RecipeCacheEntry))).scalar()
+        result = await db.execute(
+            select(RecipeCacheEntry)
+            .order_by(RecipeCacheEntry.last_used_at.desc())
+            .limit(limit)
+        )
+        entries = []
+        for entry in result.scalars():
+            expires_at = entry.created_at + self.ttl
+            entries.append({
+                **entry.to_dict(),
+                "in_memory": entry.cache_key in self._memory,
+                "expires_at": expires_at.isoformat(),
+                "expired": expires_at <= datetime.utcnow()
+            })
+        return {"total": total, "entries": entries}
+
+    async def purge(self, db: AsyncSession, key: Optional[str] = None) -> int:
+        """
+        캐시 삭제 (메모리 + DB)
+
+        Args:
+            db: 데이터베이스 세션
+            key: 삭제할 캐시 키 (optional, 없으면 전체)
+
+        Returns:
+            삭제된 DB 항목 수
+        """
+        statement = delete(RecipeCacheEntry)
+        if key is None:
+            self._memory.clear()
+        else:
+            self._memory.pop(key, None)
+            statement = statement.where(RecipeCacheEntry.cache_key == key)
+        result = await db.execute(statement)
+        await db.commit()
+        return result.rowcount
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        hits = self._memory_hits + self._db_hits
+        lookups = hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "ttl_hours": settings.RECIPE_CACHE_TTL_HOURS,
+            "memory_entries": len(self._memory),
+            "memory_hits": self._memory_hits,
+            "db_hits": self._db_hits,
+            "misses": self._misses,
+            "stored": self._stored,
+            "skipped": self._skipped,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "hit_latency": self.hit_latency.snapshot(6)
+        }
+
+
+# 애플리케이션 전역 인스턴스
+recipe_cache = RecipeCache()
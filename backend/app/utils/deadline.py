@@ -0,0 +1,152 @@
+"""
+요청 단위 종단 간 마감 시간(deadline) 전파
+
+클라이언트 헤더(X-Request-Timeout, 초) 또는 라우트 기본값으로 마감 시간을 정하고,
+contextvars로 서비스 계층까지 전달합니다. 업스트림 호출은 시도별 타임아웃과 재시도 대기를
+남은 시간 안으로 줄이고, 남은 시간이 없으면 재시도하지 않습니다.
+
+사용 예:
+    deadline: Deadline = Depends(request_deadline(settings.ANALYZE_DEADLINE_SECONDS))
+    with deadline:
+        result = await ollama_service.analyze_image(...)
+
+스트리밍 생성기처럼 yield를 사이에 두고 실행되는 코드는 컨텍스트 대신 deadline 인자로 넘깁니다.
+"""
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+import httpx
+from fastapi import HTTPException, Request
+from tenacity import RetryCallState
+from tenacity.stop import stop_base
+from tenacity.wait import wait_base
+
+from app.config import settings
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("current_deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """요청 마감 시간 초과"""
+    pass
+
+
+class Deadline:
+    """요청 마감 시간 (with 블록 안에서 현재 마감 시간으로 설정됨)"""
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._tokens = []
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 음수 가능)"""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        """마감 시간 경과 여부"""
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """
+        이번 시도에 쓸 타임아웃 (cap과 남은 시간 중 작은 값)
+
+        Raises:
+            DeadlineExceededError: 남은 시간이 없는 경우
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError(f"요청 처리 시간({self.budget:g}초)을 초과했습니다.")
+        return min(cap, remaining)
+
+    def __enter__(self) -> "Deadline":
+        self._tokens.append(_current_deadline.set(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _current_deadline.reset(self._tokens.pop())
+
+
+def current_deadline() -> Optional[Deadline]:
+    """현재 컨텍스트의 마감 시간 (없으면 None)"""
+    return _current_deadline.get()
+
+
+def attempt_timeout(cap: float, connect: float = 10.0, deadline: Optional[Deadline] = None) -> httpx.Timeout:
+    """
+    현재 마감 시간을 반영한 시도별 httpx 타임아웃
+
+    Args:
+        cap: 마감 시간이 없을 때의 읽기 타임아웃 (초)
+        connect: 연결 타임아웃 상한 (초)
+        deadline: 마감 시간 (기본값: 현재 컨텍스트의 마감 시간)
+
+    Raises:
+        DeadlineExceededError: 남은 시간이 없는 경우
+    """
+    deadline = deadline or current_deadline()
+    if deadline is None:
+        return httpx.Timeout(cap, connect=connect)
+    read = deadline.timeout(cap)
+    return httpx.Timeout(read, connect=min(connect, read))
+
+
+def raise_if_expired(error: BaseException, deadline: Optional[Deadline] = None) -> None:
+    """마감 시간이 지났다면 업스트림 오류(타임아웃 등)를 DeadlineExceededError로 바꿔서 발생"""
+    deadline = deadline or current_deadline()
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceededError(
+            f"요청 처리 시간({deadline.budget:g}초)을 초과했습니다."
+        ) from error
+
+
+class stop_at_deadline(stop_base):
+    """남은 시간이 다음 시도를 하기에 부족하면 재시도 중단"""
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        deadline = current_deadline()
+        return deadline is not None and deadline.remaining() <= settings.DEADLINE_MIN_ATTEMPT_SECONDS
+
+
+class wait_within_deadline(wait_base):
+    """재시도 대기 시간을 남은 시간 안으로 제한"""
+
+    def __init__(self, wait: wait_base):
+        self.wait = wait
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        seconds = self.wait(retry_state)
+        deadline = current_deadline()
+        if deadline is None:
+            return seconds
+        return max(0.0, min(seconds, deadline.remaining() - settings.DEADLINE_MIN_ATTEMPT_SECONDS))
+
+
+def request_deadline(default_seconds: float) -> Callable[[Request], Deadline]:
+    """
+    요청 마감 시간 의존성 생성
+
+    X-Request-Timeout 헤더(초)가 있으면 사용하고, 없으면 라우트 기본값을 씁니다.
+    헤더 값은 MAX_REQUEST_TIMEOUT_SECONDS를 넘을 수 없습니다.
+
+    Args:
+        default_seconds: 라우트 기본 마감 시간 (초)
+    """
+    async def dependency(request: Request) -> Deadline:
+        header = request.headers.get(REQUEST_TIMEOUT_HEADER)
+        if header is None:
+            return Deadline(default_seconds)
+
+        try:
+            seconds = float(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"{REQUEST_TIMEOUT_HEADER} 헤더는 초 단위 숫자여야 합니다.")
+        if seconds <= 0:
+            raise HTTPException(status_code=400, detail=f"{REQUEST_TIMEOUT_HEADER} 헤더는 0보다 커야 합니다.")
+        return Deadline(min(seconds, settings.MAX_REQUEST_TIMEOUT_SECONDS))
+
+    return dependency
@@ -0,0 +1,98 @@
+"""
+클라이언트 연결 종료 감지 및 업스트림 호출 취소
+
+사용자가 탭을 닫거나 프론트엔드가 타임아웃되어도 핸들러는 Ollama/OpenRouter 응답을 계속 기다리고
+tenacity는 재시도까지 합니다. 업스트림 호출을 태스크로 실행하면서 request.is_disconnected()를
+주기적으로 확인하고, 연결이 끊기면 태스크를 취소합니다.
+취소는 httpx 요청을 중단하고 연결을 닫으므로 Ollama도 생성을 멈춥니다.
+
+SSE 스트리밍 응답은 Starlette가 http.disconnect를 받으면 스트림 태스크를 취소하므로
+생성기 안의 `async with` 블록이 정리되며 업스트림 연결이 닫힙니다.
+"""
+import asyncio
+from collections import Counter
+from typing import Awaitable, Dict, TypeVar
+
+from fastapi import HTTPException, Request
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 클라이언트가 응답 전에 연결을 끊음 (nginx 관례)
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnectedError(Exception):
+    """응답을 받을 클라이언트가 연결을 끊음"""
+    pass
+
+
+class CancellationMetrics:
+    """연결 종료로 취소된 업스트림 호출 수"""
+
+    def __init__(self):
+        self._cancelled = Counter()
+
+    def record(self, upstream: str) -> None:
+        """취소 1건 기록"""
+        self._cancelled[upstream] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """업스트림별 취소 횟수"""
+        return dict(self._cancelled)
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    awaitable: Awaitable[T],
+    upstream: str,
+    poll_interval: float = None
+) -> T:
+    """
+    클라이언트가 연결을 유지하는 동안만 업스트림 호출 실행
+
+    Args:
+        request: 현재 요청 (연결 종료 확인용)
+        awaitable: 업스트림 호출 코루틴
+        upstream: 지표용 업스트림 이름 (예: "ollama", "openrouter")
+        poll_interval: 연결 확인 간격 (기본값: settings.DISCONNECT_POLL_INTERVAL)
+
+    Returns:
+        업스트림 호출 결과
+
+    Raises:
+        ClientDisconnectedError: 호출 완료 전에 클라이언트가 연결을 끊은 경우
+    """
+    if poll_interval is None:
+        poll_interval = settings.DISCONNECT_POLL_INTERVAL
+
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+
+            if await request.is_disconnected():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                cancellation_metrics.record(upstream)
+                logger.info(f"클라이언트 연결 종료 - {upstream} 호출 취소 ({request.url.path})")
+                raise ClientDisconnectedError(f"{upstream} 호출 중 클라이언트 연결이 끊어졌습니다.")
+    finally:
+        # 핸들러 자체가 취소된 경우(서버 종료 등)에도 업스트림 호출을 남기지 않음
+        if not task.done():
+            task.cancel()
+
+
+def disconnected_exception() -> HTTPException:
+    """연결 종료 → 499 (클라이언트는 받지 못하지만 접근 로그에 남음)"""
+    return HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="클라이언트 연결이 끊어졌습니다.")
+
+
+# 애플리케이션 전역 인스턴스
+cancellation_metrics = CancellationMetrics()
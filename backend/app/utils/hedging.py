@@ -0,0 +1,165 @@
+"""
+헤지 요청 (hedged requests)
+
+무료 티어 모델처럼 응답 시간 꼬리가 긴 업스트림에서, 첫 요청이 적응형 임계값(최근 응답 시간의 p90 등) 안에
+끝나지 않으면 두 번째 요청을 보내고 먼저 성공한 응답을 사용합니다. 진 요청은 취소합니다.
+- 임계값: 최근 첫 요청 응답 시간의 백분위 (min_delay 이상). 기록이 min_samples개 미만이면 헤지하지 않음
+- 예산: 요청마다 budget개의 토큰이 쌓이고 헤지 1번에 1개를 사용 (추가 요청 수 ≤ 요청 수 × budget + 최대 적립량)
+- 대조군: 요청의 holdout 비율은 헤지하지 않고 응답 시간을 "헤지 없음" 분포로 기록
+  (헤지가 이겨 취소된 첫 요청은 실제 응답 시간을 알 수 없으므로 헤지 효과는 대조군과 비교)
+- 첫 요청이 헤지 전에 실패하면 그대로 예외 전달 (재시도는 호출 측 담당)
+- 헤지 후에는 둘 중 하나라도 성공하면 성공, 둘 다 실패하면 먼저 난 예외 전달
+
+사용 예:
+    result = await self.hedging.run(lambda: self._post(data), lambda: self._post(backup_data))
+"""
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.utils.logger import get_logger
+from app.utils.metrics import RollingStats
+
+logger = get_logger(__name__)
+
+
+class HedgedRequests:
+    """적응형 임계값 + 예산 기반 헤지 요청"""
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 90.0,
+        min_delay: float = 2.0,
+        min_samples: int = 20,
+        budget: float = 0.1,
+        max_tokens: float = 5.0,
+        holdout: float = 0.05
+    ):
+        """
+        Args:
+            name: 업스트림 이름 (로그/지표용)
+            percentile: 헤지 임계값으로 쓸 첫 요청 응답 시간 백분위
+            min_delay: 헤지 임계값 하한 (초)
+            min_samples: 헤지를 시작하기 위한 최소 응답 시간 기록 수
+            budget: 요청 대비 추가(헤지) 요청 비율 상한
+            max_tokens: 최대 적립 토큰 수 (한가한 뒤 몰아서 헤지하는 양 제한)
+            holdout: 헤지하지 않는 대조군 요청 비율
+        """
+        self.name = name
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.budget = budget
+        self.max_tokens = max_tokens
+        self.holdout = holdout
+        self._tokens = 0.0
+
+        # 첫 요청 응답 시간 (초, 임계값 계산용)
+        # 헤지 요청이 이겨 첫 요청이 취소된 경우 그 시점까지의 시간(하한값)을 기록 - 이미 임계값보다 크므로 백분위 순위는 정확함
+        self.primary_latency = RollingStats()
+        # 실제 응답 시간 (초): 헤지 적용 요청 / 대조군(헤지 없음) 요청
+        self.hedged_latency = RollingStats()
+        self.unhedged_latency = RollingStats()
+
+        # 통계
+        self._requests = 0
+        self._hedged = 0  # 헤지 요청을 보낸 수
+        self._hedge_wins = 0  # 헤지 요청이 먼저 성공한 수
+        self._budget_exhausted = 0  # 임계값을 넘었지만 예산이 없어 헤지하지 않은 수
+
+    def delay(self) -> Optional[float]:
+        """현재 헤지 임계값 (초, 기록이 부족하면 None)"""
+        if self.primary_latency.count < self.min_samples:
+            return None
+        return max(self.primary_latency.percentile(self.percentile), self.min_delay)
+
+    def _try_spend(self) -> bool:
+        """헤지 예산 토큰 1개 사용"""
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    async def run(
+        self,
+        primary: Callable[[], Awaitable[Any]],
+        backup: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        헤지 요청 실행
+
+        Args:
+            primary: 첫 요청
+            backup: 헤지 요청 (임계값을 넘고 예산이 있을 때만 실행, 대체 모델 등)
+
+        Returns:
+            먼저 성공한 요청의 결과
+
+        Raises:
+            Exception: 첫 요청이 헤지 전에 실패했거나 두 요청이 모두 실패한 경우 (먼저 난 예외)
+        """
+        self._requests += 1
+        self._tokens = min(self._tokens + self.budget, self.max_tokens)
+
+        holdout = random.random() < self.holdout
+        started = time.monotonic()
+        primary_task = asyncio.ensure_future(primary())
+        pending = {primary_task}
+        errors = []
+
+        try:
+            delay = None if holdout else self.delay()
+            if delay is not None:
+                done, pending = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    if self._try_spend():
+                        self._hedged += 1
+                        logger.info(f"{self.name} 응답이 {delay:.1f}s 안에 없어 헤지 요청 시작")
+                        pending.add(asyncio.ensure_future(backup()))
+                    else:
+                        self._budget_exhausted += 1
+                else:
+                    pending = done
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+
+                    elapsed = time.monotonic() - started
+                    self.primary_latency.observe(elapsed)
+                    (self.unhedged_latency if holdout else self.hedged_latency).observe(elapsed)
+                    if task is not primary_task:
+                        self._hedge_wins += 1
+                        logger.info(f"{self.name} 헤지 요청이 먼저 응답 - {elapsed:.1f}s")
+                    return task.result()
+
+            raise errors[0]
+        finally:
+            # 진 요청(또는 호출 측 취소 시 전체) 취소
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """헤지 통계 (응답 시간: 초)"""
+        delay = self.delay()
+        return {
+            "threshold": round(delay, 3) if delay is not None else None,
+            "requests": self._requests,
+            "hedged": self._hedged,
+            "hedge_wins": self._hedge_wins,
+            "budget_exhausted": self._budget_exhausted,
+            "hedge_rate": round(self._hedged / self._requests, 3) if self._requests else 0.0,
+            "budget": self.budget,
+            "holdout": self.holdout,
+            "latency": {
+                "with_hedging": self.hedged_latency.snapshot(),
+                "without_hedging": self.unhedged_latency.snapshot()  # 대조군
+            }
+        }
@@ -5,46 +5,356 @@
 - 중간 버퍼를 명시적으로 해제하여 메모리 사용량 최소화
 - PIL Image 객체를 close()로 즉시 정리
 - 대용량 파일 처리 시 메모리 피크를 줄임
+
+지각 해시(dHash):
+- 정규화(리사이징)된 이미지에서 64비트 dHash를 계산하여 분석 결과 캐시 키로 사용
+- 재촬영/재업로드된 거의 같은 사진은 해밍 거리가 작음
+
+JPEG 축소 디코딩(draft):
+- JPEG은 DCT 단계에서 1/2, 1/4, 1/8 배율로 바로 디코딩 가능
+- 목표 크기(IMAGE_RESIZE_MAX) 이상인 가장 작은 배율로 디코딩한 뒤 LANCZOS로 최종 리사이징
+- 4000x3000 원본 기준 디코딩 비트맵 크기/CPU 시간이 수 배 감소
+
+패스스루:
+- 이미 모델 입력 조건(JPEG, RGB/L, 최대 크기 이하, 용량 제한 이하)을 만족하는 업로드는
+  헤더만 확인하고 디코딩/재인코딩 없이 원본 바이트를 그대로 사용
+- EXIF/XMP(APP1, GPS·카메라 정보 포함)가 있으면 원본 바이트가 그대로 저장/제공되므로 재인코딩 경로 사용
+
+캐스케이드 미리보기:
+- 2단계 분석용 저해상도(CASCADE_PREVIEW_SIZE) JPEG을 같은 디코딩 결과에서 함께 생성
+- 패스스루 경로의 해시는 미리보기 생성 여부와 관계없이 항상 1/8 축소 디코딩(compute_dhash_fast)으로 계산
+  (동기 분석과 스트리밍/작업 분석이 같은 이미지에 같은 해시를 써야 캐시가 정확히 일치)
+
+워커 풀:
+- 디코딩/리사이징/인코딩은 CPU 작업이므로 이벤트 루프가 아닌 스레드/프로세스 풀에서 실행
+- 세마포어로 동시에 디코딩되는 원본 비트맵 수를 제한하여 메모리 피크를 제한
 """
+import asyncio
 import base64
 import io
 import gc
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Optional, Tuple
 from PIL import Image
 from fastapi import UploadFile, HTTPException
 from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.metrics import RollingStats
+
+logger = get_logger(__name__)
+
+# Pillow 자체 디컴프레션 밤 제한도 설정값과 일치시킴
+Image.MAX_IMAGE_PIXELS = settings.MAX_IMAGE_PIXELS
+
+# 이미지 처리 워커 풀 (지연 생성, lifespan 종료 시 정리)
+_executor: Optional[Executor] = None
+_decode_semaphore: Optional[asyncio.Semaphore] = None
+
+
+@dataclass
+class ProcessedImage:
+    """전처리(리사이징 + JPEG 재인코딩)된 이미지"""
+    data: bytes  # 정규화된 JPEG 바이트 (이미지 저장소에 보관)
+    dhash: str  # 64비트 지각 해시 (16자리 hex)
+    width: int
+    height: int
+    path: str = "transcode"  # 처리 경로 (transcode | passthrough)
+    preview: Optional[bytes] = None  # 캐스케이드 1단계용 저해상도 JPEG (비활성화 시 None)
+
+    @cached_property
+    def base64(self) -> str:
+        """모델 입력용 Base64 JPEG"""
+        return base64.b64encode(self.data).decode('utf-8')
+
+    @cached_property
+    def preview_base64(self) -> Optional[str]:
+        """미리보기 Base64 JPEG"""
+        return base64.b64encode(self.preview).decode('utf-8') if self.preview else None
+
+
+class ImagePipelineMetrics:
+    """이미지 처리 파이프라인 지표 (대기 시간 + 단계별 CPU 시간)"""
+
+    def __init__(self):
+        self.queue_wait = RollingStats()
+        self.stages: Dict[str, RollingStats] = {}
+        self.paths: Dict[str, int] = {}
+
+    def record(self, timings: Dict[str, float]) -> None:
+        """워커가 반환한 단계별 측정값 기록"""
+        self.queue_wait.observe(timings.pop("queue_wait", 0.0))
+        for stage, cpu_seconds in timings.items():
+            self.stages.setdefault(stage, RollingStats()).observe(cpu_seconds)
+
+    def record_path(self, path: str) -> None:
+        """처리 경로(transcode/passthrough) 카운트"""
+        self.paths[path] = self.paths.get(path, 0) + 1
+
+    def stats(self) -> Dict:
+        """지표 스냅샷 (초 단위)"""
+        return {
+            "worker_kind": settings.IMAGE_WORKER_KIND,
+            "workers": settings.IMAGE_WORKERS,
+            "max_concurrent_decodes": settings.IMAGE_MAX_CONCURRENT_DECODES,
+            "paths": dict(self.paths),
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "stage_cpu_seconds": {
+                stage: stats.snapshot() for stage, stats in self.stages.items()
+            }
+        }
+
+
+pipeline_metrics = ImagePipelineMetrics()
+
+
+def _get_executor() -> Executor:
+    """이미지 처리 워커 풀 (설정에 따라 스레드 또는 프로세스)"""
+    global _executor
+    if _executor is None:
+        if settings.IMAGE_WORKER_KIND == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_WORKERS,
+                thread_name_prefix="image-worker"
+            )
+        logger.info(
+            f"이미지 워커 풀 시작 - {settings.IMAGE_WORKER_KIND} x {settings.IMAGE_WORKERS}"
+        )
+    return _executor
+
+
+def _get_decode_semaphore() -> asyncio.Semaphore:
+    """동시 디코딩 수 제한 세마포어"""
+    global _decode_semaphore
+    if _decode_semaphore is None:
+        _decode_semaphore = asyncio.Semaphore(settings.IMAGE_MAX_CONCURRENT_DECODES)
+    return _decode_semaphore
 
 
-async def validate_image(file: UploadFile) -> None:
+def shutdown_image_workers() -> None:
+    """이미지 처리 워커 풀 종료"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        logger.info("이미지 워커 풀 종료")
+
+
+async def run_in_image_worker(func, *args):
     """
-    이미지 파일 유효성 검사
+    이미지 처리 함수를 워커 풀에서 실행
+
+    func는 (queued_at, *args)를 받아 (결과, 단계별 측정값)을 반환하는
+    모듈 최상위 함수여야 합니다 (프로세스 풀에서 pickle 가능).
 
     Args:
-        file: 업로드된 파일
+        func: 워커에서 실행할 함수
+        *args: 함수 인자
+
+    Returns:
+        func의 결과
+    """
+    queued_at = time.time()
+    async with _get_decode_semaphore():
+        loop = asyncio.get_running_loop()
+        result, timings = await loop.run_in_executor(_get_executor(), func, queued_at, *args)
+    pipeline_metrics.record(timings)
+    return result
+
+
+def compute_dhash(image: Image.Image, hash_size: int = 8) -> str:
+    """
+    이미지의 dHash(difference hash) 계산
+
+    (hash_size+1) x hash_size 흑백 이미지로 축소한 뒤
+    가로로 인접한 픽셀의 밝기 증감을 비트로 기록합니다.
+
+    Args:
+        image: PIL Image 객체
+        hash_size: 해시 한 변의 크기 (기본 8 → 64비트)
+
+    Returns:
+        16진수 해시 문자열
+    """
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = list(small.getdata())
+    small.close()
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+
+    return f"{value:0{hash_size * hash_size // 4}x}"
+
+
+def compute_dhash_fast(image: Image.Image) -> str:
+    """
+    로드 전 이미지의 dHash를 축소 디코딩으로 빠르게 계산
+
+    JPEG은 1/8 배율로 디코딩한 흑백 이미지에서 해시를 계산합니다.
+
+    Args:
+        image: 아직 로드되지 않은 PIL Image 객체
+
+    Returns:
+        16진수 해시 문자열
+    """
+    if image.format == "JPEG":
+        image.draft("L", (64, 64))
+    return compute_dhash(image)
+
+
+def is_passthrough_candidate(image: Image.Image, byte_size: int) -> bool:
+    """
+    헤더 정보만으로 재인코딩 없이 모델에 보낼 수 있는지 판단
+
+    EXIF/XMP 메타데이터가 있으면 패스스루하지 않습니다. 원본 바이트는 정규화 이미지로 저장되어
+    /api/images/{id}/file로 제공되므로, 재인코딩 경로와 마찬가지로 위치 정보 등을 제거해야 합니다.
+
+    Args:
+        image: 아직 로드되지 않은 PIL Image 객체
+        byte_size: 원본 파일 크기 (바이트)
+
+    Returns:
+        패스스루 가능 여부
+    """
+    return (
+        settings.IMAGE_PASSTHROUGH_ENABLED
+        and image.format == "JPEG"
+        and image.mode in ("RGB", "L")
+        and max(image.size) <= settings.IMAGE_RESIZE_MAX
+        and byte_size <= settings.IMAGE_PASSTHROUGH_MAX_BYTES
+        and "exif" not in image.info
+        and "xmp" not in image.info
+    )
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    """
+    두 16진수 해시 간 해밍 거리
+
+    Args:
+        hash_a: 해시 A
+        hash_b: 해시 B
+
+    Returns:
+        서로 다른 비트 수
+    """
+    return (int(hash_a, 16) ^ int(hash_b, 16)).bit_count()
+
+
+# 매직 바이트 → MIME 타입 (클라이언트가 보낸 content_type은 신뢰하지 않음)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+)
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """
+    파일 앞부분의 매직 바이트로 이미지 형식 판별
+
+    Args:
+        head: 파일 앞부분 바이트
+
+    Returns:
+        MIME 타입 (판별 불가 시 None)
+    """
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    return None
+
+
+def probe_image_header(contents: bytes) -> Tuple[int, int]:
+    """
+    픽셀 디코딩 없이 헤더에서 해상도 확인 (디컴프레션 밤 차단)
+
+    Args:
+        contents: 이미지 바이트
+
+    Returns:
+        (너비, 높이)
 
     Raises:
-        HTTPException: 유효하지 않은 파일인 경우
+        HTTPException: 헤더를 읽을 수 없거나 픽셀 수가 제한을 넘는 경우
     """
-    # 파일 타입 검사
-    if file.content_type not in settings.ALLOWED_IMAGE_TYPES:
+    try:
+        with Image.open(io.BytesIO(contents)) as image:  # 헤더만 읽음
+            width, height = image.size
+    except (Image.DecompressionBombError, OSError, SyntaxError) as e:
+        raise HTTPException(status_code=400, detail=f"이미지 헤더를 읽을 수 없습니다: {e}")
+
+    if width * height > settings.MAX_IMAGE_PIXELS:
         raise HTTPException(
             status_code=400,
-            detail=f"지원하지 않는 파일 형식입니다. {settings.ALLOWED_IMAGE_TYPES}만 가능합니다."
+            detail=f"이미지 해상도가 너무 큽니다 ({width}x{height}). "
+                   f"최대 {settings.MAX_IMAGE_PIXELS // 1_000_000}MP까지 가능합니다."
         )
+    return width, height
 
-    # 파일 크기 검사
-    file.file.seek(0, 2)  # 파일 끝으로 이동
-    file_size = file.file.tell()
-    file.file.seek(0)  # 파일 시작으로 복귀
 
-    if file_size > settings.MAX_IMAGE_SIZE:
-        max_size_mb = settings.MAX_IMAGE_SIZE / (1024 * 1024)
-        raise HTTPException(
-            status_code=400,
-            detail=f"파일 크기가 너무 큽니다. 최대 {max_size_mb}MB까지 가능합니다."
-        )
+async def validate_image(file: UploadFile) -> bytes:
+    """
+    이미지 파일을 청크 단위로 읽으며 유효성 검사
+
+    - 첫 청크의 매직 바이트로 형식 판별 (허용되지 않으면 나머지를 읽지 않고 거절)
+    - 누적 크기가 MAX_IMAGE_SIZE를 넘는 즉시 중단
+    - 디코딩 전에 헤더의 해상도로 디컴프레션 밤 거절
 
+    Args:
+        file: 업로드된 파일
+
+    Returns:
+        이미지 바이트
 
-async def process_image(file: UploadFile) -> str:
+    Raises:
+        HTTPException: 유효하지 않은 파일인 경우
+    """
+    chunks = []
+    total = 0
+
+    while True:
+        chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        # 파일 타입 검사 (매직 바이트)
+        if total == 0:
+            sniffed_type = sniff_image_type(chunk)
+            if sniffed_type not in settings.ALLOWED_IMAGE_TYPES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"지원하지 않는 파일 형식입니다. {settings.ALLOWED_IMAGE_TYPES}만 가능합니다."
+                )
+            if file.content_type != sniffed_type:
+                logger.debug(f"content_type 불일치 - 선언: {file.content_type}, 실제: {sniffed_type}")
+
+        # 파일 크기 검사
+        total += len(chunk)
+        if total > settings.MAX_IMAGE_SIZE:
+            max_size_mb = settings.MAX_IMAGE_SIZE / (1024 * 1024)
+            raise HTTPException(
+                status_code=400,
+                detail=f"파일 크기가 너무 큽니다. 최대 {max_size_mb}MB까지 가능합니다."
+            )
+        chunks.append(chunk)
+
+    if total == 0:
+        raise HTTPException(status_code=400, detail="빈 파일입니다.")
+
+    contents = b"".join(chunks)
+    probe_image_header(contents)
+    return contents
+
+
+async def process_image(file: UploadFile, with_preview: bool = True) -> ProcessedImage:
     """
     이미지 처리 및 Base64 인코딩 (메모리 최적화 버전)
 
@@ -53,25 +363,100 @@ async def process_image(file: UploadFile) -> str:
 
     Args:
         file: 업로드된 이미지 파일
+        with_preview: 캐스케이드 미리보기 생성 여부 (미리보기를 쓰지 않는 동기 분석은 False)
+
+    Returns:
+        정규화된 JPEG 바이트와 지각 해시를 담은 ProcessedImage
+    """
+    # 유효성 검사 (청크 단위 읽기 + 매직 바이트 + 헤더 해상도)
+    contents = await validate_image(file)
+    return await process_image_bytes(contents, with_preview)
+
+
+async def process_image_bytes(contents: bytes, with_preview: bool = True) -> ProcessedImage:
+    """
+    검증된 업로드 바이트 처리 (비동기 작업 워커 등 UploadFile이 없는 경우)
+
+    Args:
+        contents: validate_image를 통과한 원본 바이트
+        with_preview: 캐스케이드 미리보기 생성 여부
 
     Returns:
-        Base64 인코딩된 이미지 문자열
+        정규화된 JPEG 바이트와 지각 해시를 담은 ProcessedImage
+    """
+    # 워커 풀에서 처리 (이벤트 루프 블로킹 방지)
+    processed = await run_in_image_worker(_process_image_bytes, contents, with_preview)
+    pipeline_metrics.record_path(processed.path)
+    return processed
+
+
+def _process_image_bytes(
+    queued_at: float,
+    contents: bytes,
+    with_preview: bool = True
+) -> Tuple[ProcessedImage, Dict[str, float]]:
     """
-    # 유효성 검사
-    await validate_image(file)
+    이미지 디코딩 → 리사이징 → 해시 → JPEG 인코딩 (워커 풀에서 실행)
 
-    # 이미지 읽기 및 처리
-    contents = await file.read()
+    모델 입력 조건을 이미 만족하는 JPEG은 헤더만 확인하고 원본 바이트를 그대로 사용합니다.
+
+    Args:
+        queued_at: 작업 제출 시각 (time.time())
+        contents: 원본 이미지 바이트
+        with_preview: 캐스케이드 미리보기 생성 여부 (CASCADE_ENABLED가 꺼져 있으면 무시)
+
+    Returns:
+        (ProcessedImage, 단계별 측정값) - queue_wait는 벽시계, 나머지는 CPU 시간(초)
+    """
+    timings = {"queue_wait": max(time.time() - queued_at, 0.0)}
+    with_preview = with_preview and settings.CASCADE_ENABLED
+    cpu = time.thread_time()
+
+    def lap(stage: str) -> None:
+        nonlocal cpu
+        now = time.thread_time()
+        timings[stage] = now - cpu
+        cpu = now
 
     try:
         # BytesIO로 PIL Image 생성
         input_buffer = io.BytesIO(contents)
-        image = Image.open(input_buffer)
+        image = Image.open(input_buffer)  # 헤더만 읽음 (픽셀 디코딩 전)
+        lap("probe")
+
+        # 패스스루: 디코딩/재인코딩 없이 원본 바이트 사용
+        if is_passthrough_candidate(image, len(contents)):
+            width, height = image.size
+            # 해시는 미리보기 여부와 무관한 하나의 렌디션(1/8 축소 디코딩)에서 계산
+            dhash = compute_dhash_fast(image)
+            image.close()
+            lap("hash")
+
+            preview = None
+            if with_preview:
+                # 미리보기 크기에 가까운 배율로 다시 축소 디코딩 (헤더만 다시 읽음)
+                image = Image.open(io.BytesIO(contents))
+                apply_draft_decode(image, settings.CASCADE_PREVIEW_SIZE)
+                image.load()
+                lap("decode")
+                image = optimize_image(image, settings.CASCADE_PREVIEW_SIZE)
+                preview = encode_preview(image)
+                image.close()
+                lap("encode")
+
+            return ProcessedImage(
+                data=contents, dhash=dhash, width=width, height=height, path="passthrough", preview=preview
+            ), timings
+
+        # JPEG은 목표 크기에 가까운 배율로 축소 디코딩 (load 전에 설정해야 함)
+        if settings.IMAGE_DRAFT_DECODE:
+            apply_draft_decode(image)
 
         # 원본 바이트 데이터 즉시 해제 (PIL이 이미 디코딩 완료)
         image.load()  # 지연 로딩 강제 완료
         del contents
         input_buffer.close()
+        lap("decode")
 
         # 이미지 최적화 (리사이징 + RGB 변환)
         optimized_image = optimize_image(image)
@@ -80,19 +465,31 @@ async def process_image(file: UploadFile) -> str:
         if optimized_image is not image:
             image.close()
         del image
+        lap("resize")
+
+        # 정규화된 이미지 기준 지각 해시 (분석 결과 캐시 키)
+        dhash = compute_dhash(optimized_image)
+        width, height = optimized_image.size
+        lap("hash")
 
-        # Base64 인코딩
+        # JPEG 인코딩 (Base64는 ProcessedImage.base64에서 필요할 때 변환)
         output_buffer = io.BytesIO()
         optimized_image.save(output_buffer, format="JPEG", quality=85, optimize=True)
+
+        # 캐스케이드 미리보기: 인코딩을 마친 이미지를 그대로 축소 (재디코딩 없음)
+        preview = None
+        if with_preview:
+            optimized_image.thumbnail(
+                (settings.CASCADE_PREVIEW_SIZE, settings.CASCADE_PREVIEW_SIZE), Image.Resampling.LANCZOS
+            )
+            preview = encode_preview(optimized_image)
         optimized_image.close()
 
         img_bytes = output_buffer.getvalue()
         output_buffer.close()
+        lap("encode")
 
-        img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-        del img_bytes
-
-        return img_base64
+        return ProcessedImage(data=img_bytes, dhash=dhash, width=width, height=height, preview=preview), timings
 
     except Exception:
         # 에러 발생 시에도 메모리 정리 (이미 해제된 경우 무시)
@@ -100,6 +497,37 @@ async def process_image(file: UploadFile) -> str:
         raise
 
 
+def apply_draft_decode(image: Image.Image, max_size: int = None) -> bool:
+    """
+    JPEG 축소 디코딩 설정 (Image.load() 전에 호출)
+
+    디코딩 결과가 목표 크기보다 작아지지 않는 가장 큰 1/2^n 배율을 선택하므로
+    이후 LANCZOS 리사이징 품질은 유지됩니다.
+
+    Args:
+        image: 아직 로드되지 않은 PIL Image 객체
+        max_size: 최대 너비/높이 (기본값: settings.IMAGE_RESIZE_MAX)
+
+    Returns:
+        축소 디코딩 적용 여부
+    """
+    if max_size is None:
+        max_size = settings.IMAGE_RESIZE_MAX
+
+    if image.format != "JPEG":
+        return False
+
+    width, height = image.size
+    scale = max(width, height) / max_size
+    if scale < 2:
+        return False
+
+    # 최종 리사이징 결과 크기를 요청하면 draft가 그 이상인 배율을 고름
+    target = (max(int(width / scale), 1), max(int(height / scale), 1))
+    image.draft(image.mode, target)
+    return image.size != (width, height)
+
+
 def optimize_image(image: Image.Image, max_size: int = None) -> Image.Image:
     """
     이미지 리사이징 및 최적화
@@ -124,6 +552,21 @@ def optimize_image(image: Image.Image, max_size: int = None) -> Image.Image:
     return image
 
 
+def encode_preview(image: Image.Image) -> bytes:
+    """
+    캐스케이드 미리보기 JPEG 인코딩
+
+    Args:
+        image: 미리보기 크기로 축소된 RGB/L 이미지
+
+    Returns:
+        JPEG 바이트
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
 def image_to_base64(image_path: str) -> str:
     """
     이미지 파일을 Base64로 변환
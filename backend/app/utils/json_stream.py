@@ -0,0 +1,133 @@
+"""
+LLM 스트리밍 응답용 증분 JSON 파서
+
+토큰 단위로 도착하는 텍스트에서 최상위 객체 안 배열의 원소 객체가 닫히는 즉시 꺼냅니다.
+예) {"ingredients": [{...}, {...}]} → 각 {...}가 닫힐 때마다 ("ingredients", {...})
+최상위가 배열이면 원소 객체를 생성자에 준 array_key로 꺼냅니다.
+예) [{...}, {...}] → ("ingredients", {...}) (array_key="ingredients")
+
+- 첫 '{' 또는 '[' 이전 텍스트(코드 블록 표시 등)는 무시
+- 문자열 내부의 괄호/따옴표 이스케이프를 올바르게 처리
+- 최상위 값이 닫히면 done=True (이후 텍스트는 무시 → 생성 중단 신호로 사용)
+"""
+import json
+from typing import List, Optional, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IncrementalJSONParser:
+    """최상위 객체의 배열 원소 객체를 증분 추출하는 파서"""
+
+    def __init__(self, array_key: Optional[str] = None):
+        self.buffer = ""
+        self.done = False
+        self.array_key = array_key  # 최상위 배열 원소에 붙일 키
+
+        self._pos = 0  # 다음에 검사할 buffer 위치
+        self._start = -1  # 최상위 값 시작 위치
+        self._stack: List[str] = []  # 열린 컨테이너 ('{' 또는 '[')
+        self._in_string = False
+        self._escape = False
+
+        self._string_start = 0
+        self._last_key: Optional[str] = None  # 최상위 객체에서 마지막으로 읽은 문자열
+        self._array_key: Optional[str] = None  # 현재 열린 최상위 배열의 키
+        self._item_start = 0
+
+    def feed(self, text: str) -> List[Tuple[Optional[str], dict]]:
+        """
+        텍스트 조각 추가
+
+        Args:
+            text: 새로 도착한 텍스트
+
+        Returns:
+            이번 조각으로 완성된 (배열 키, 원소 객체) 목록
+        """
+        if self.done:
+            return []
+
+        self.buffer += text
+        completed = []
+
+        while self._pos < len(self.buffer):
+            index = self._pos
+            char = self.buffer[index]
+            self._pos += 1
+
+            if self._start == -1:
+                if char in "{[":
+                    self._start = index
+                    self._stack.append(char)
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_key = self.buffer[self._string_start:index]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index + 1
+            elif char in "{[":
+                self._stack.append(char)
+                if len(self._stack) == 2 and char == "[":
+                    self._array_key = self._last_key
+                elif len(self._stack) == 3 and char == "{" and self._stack[1] == "[":
+                    self._item_start = index
+                elif len(self._stack) == 2 and char == "{" and self._stack[0] == "[":
+                    self._item_start = index
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                closed = self._stack.pop()
+
+                # 배열 원소 객체 완성
+                if closed == "{" and len(self._stack) == 2 and self._stack[1] == "[":
+                    item = self._load(self.buffer[self._item_start:index + 1])
+                    if item is not None:
+                        completed.append((self._array_key, item))
+
+                # 최상위 배열 원소 객체 완성
+                elif closed == "{" and self._stack == ["["]:
+                    item = self._load(self.buffer[self._item_start:index + 1])
+                    if item is not None:
+                        completed.append((self.array_key, item))
+
+                # 최상위 값 완성
+                if not self._stack:
+                    self.done = True
+                    break
+
+        return completed
+
+    @staticmethod
+    def _load(fragment: str) -> Optional[dict]:
+        """완성된 객체 조각 파싱 (실패 시 None)"""
+        try:
+            item = json.loads(fragment)
+        except json.JSONDecodeError:
+            logger.warning(f"스트리밍 JSON 원소 파싱 실패: {fragment[:100]}")
+            return None
+        return item if isinstance(item, dict) else None
+
+    def result(self) -> Optional[dict]:
+        """최상위 값이 닫혔으면 전체 파싱 결과 (아니면 None, 최상위 배열은 {array_key: 배열})"""
+        if not self.done:
+            return None
+        try:
+            value = json.loads(self.buffer[self._start:self._pos])
+        except json.JSONDecodeError:
+            return None
+        if isinstance(value, list):
+            return {self.array_key: value}
+        return value if isinstance(value, dict) else None
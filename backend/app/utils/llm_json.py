@@ -0,0 +1,196 @@
+"""
+LLM 응답용 관대한 JSON 파서
+
+모델이 JSON 앞뒤에 설명/코드 블록을 붙이거나 출력이 중간에 잘려도 추론 결과를 버리지 않도록
+첫 번째 균형 잡힌 JSON 객체를 찾고, 잘린 배열/객체는 닫아서 완성된 원소를 모두 살립니다.
+최상위가 객체 배열이면 배열 전체를 {array_key: [...]}로 감싸 돌려줍니다.
+실패 대신 파싱 품질을 함께 돌려줍니다.
+- ok: 응답 전체가 올바른 JSON
+- extracted: 앞뒤 텍스트(코드 블록 등)를 제외하고 찾은 JSON 객체/배열
+- repaired: 잘리거나 깨진 JSON을 마지막으로 완성된 값까지 잘라 닫은 결과 (일부 원소가 빠졌을 수 있음)
+- failed: JSON 객체를 찾지 못함 (빈 객체 반환)
+
+사용 예:
+    parsed = parse_llm_json(content, array_key="ingredients")
+    json_parse_metrics.record("ollama", parsed.quality)
+    ingredients = parsed.value.get("ingredients", [])
+"""
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PARSE_OK = "ok"
+PARSE_EXTRACTED = "extracted"
+PARSE_REPAIRED = "repaired"
+PARSE_FAILED = "failed"
+
+# 복구할 때 시도할 잘라낼 위치 수 (뒤에서부터, 응답 길이와 무관하게 비용 제한)
+MAX_REPAIR_ATTEMPTS = 64
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+@dataclass
+class ParsedJSON:
+    """파싱 결과"""
+    value: Dict = field(default_factory=dict)
+    quality: str = PARSE_FAILED
+
+    @property
+    def ok(self) -> bool:
+        """JSON 객체를 얻었는지 여부 (복구 포함)"""
+        return self.quality != PARSE_FAILED
+
+
+def _loads_object(text: str, array_key: str):
+    """
+    JSON 객체 파싱 (실패하면 None)
+
+    객체 배열은 {array_key: 배열}로 감쌉니다. 객체가 아닌 값이나 객체가 아닌 원소가 섞인 배열
+    (설명 문장 속 "[1]" 등)은 None입니다.
+    """
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+        return {array_key: value}
+    return value if isinstance(value, dict) else None
+
+
+def _scan(text: str, start: int) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    start 위치의 '{' 또는 '['부터 문자열/이스케이프를 고려해 괄호 균형 검사
+
+    Returns:
+        (닫힌 위치 다음 인덱스, 잘라낼 수 있는 위치 목록)
+        값이 닫히지 않았으면 첫 값은 -1입니다. 잘라낼 위치는 (위치, 그 시점에 닫아야 할 괄호)이며
+        완성된 값 바로 뒤(닫는 괄호 다음, 쉼표 앞)와 빈 배열을 만들 수 있는 '[' 바로 뒤입니다.
+        배열 원소 객체 등 중첩 객체 안은 잘라내지 않아 반쯤 생성된 원소는 통째로 버립니다.
+    """
+    stack: List[str] = []
+    cuts: List[Tuple[int, str]] = []
+    in_string = False
+    escape = False
+
+    def add_cut(position: int) -> None:
+        if "{" not in stack[1:]:
+            cuts.append((position, "".join(_CLOSERS[opener] for opener in reversed(stack))))
+
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+            if char == "[":
+                add_cut(index + 1)
+        elif char in "}]":
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                return index + 1, cuts
+            add_cut(index + 1)
+        elif char == ",":
+            add_cut(index)
+
+    return -1, cuts
+
+
+def _repair(text: str, start: int, cuts: List[Tuple[int, str]], array_key: str):
+    """잘라낼 수 있는 위치를 뒤에서부터 시도해 처음으로 파싱되는 객체 반환 (없으면 None)"""
+    for cut, closers in reversed(cuts[-MAX_REPAIR_ATTEMPTS:]):
+        candidate = _TRAILING_COMMA.sub(r"\1", text[start:cut].rstrip().rstrip(",") + closers)
+        value = _loads_object(candidate, array_key)
+        if value is not None:
+            return value
+    return None
+
+
+def _find_start(text: str, position: int) -> int:
+    """position 이후 첫 '{' 또는 '[' 위치 (없으면 -1)"""
+    starts = [index for index in (text.find("{", position), text.find("[", position)) if index != -1]
+    return min(starts, default=-1)
+
+
+def parse_llm_json(content: str, array_key: str = "items") -> ParsedJSON:
+    """
+    LLM 응답에서 JSON 객체 추출 (실패 없이 품질 표시와 함께 반환)
+
+    Args:
+        content: LLM 응답 텍스트
+        array_key: 최상위가 객체 배열일 때 배열을 담을 키 (예: "ingredients", "recipes")
+
+    Returns:
+        ParsedJSON (value: 파싱된 객체, 실패 시 빈 dict / quality: ok | extracted | repaired | failed)
+    """
+    content = content or ""
+    value = _loads_object(content.strip(), array_key)
+    if value is not None:
+        return ParsedJSON(value, PARSE_OK)
+
+    # 앞뒤 텍스트가 붙은 경우: '{'/'['마다 균형 잡힌 값을 찾아 처음 파싱되는 것 사용
+    start = _find_start(content, 0)
+    while start != -1:
+        end, cuts = _scan(content, start)
+        if end == -1:
+            break
+        segment = content[start:end]
+        value = _loads_object(segment, array_key)
+        if value is None:
+            # 후행 쉼표 등 사소한 형식 오류
+            value = _loads_object(_TRAILING_COMMA.sub(r"\1", segment), array_key)
+            if value is not None:
+                return ParsedJSON(value, PARSE_REPAIRED)
+        else:
+            return ParsedJSON(value, PARSE_EXTRACTED)
+        start = _find_start(content, start + 1)
+
+    # 잘린 응답: 닫히지 않은 값을 마지막으로 완성된 값까지 잘라서 닫기
+    if start != -1:
+        value = _repair(content, start, cuts, array_key)
+        if value is not None:
+            logger.warning(f"잘린 JSON 응답 복구 ({len(content)}자)")
+            return ParsedJSON(value, PARSE_REPAIRED)
+
+    logger.error(f"JSON 파싱 실패 - 원본 내용: {content[:200]}")
+    return ParsedJSON({}, PARSE_FAILED)
+
+
+class JSONParseMetrics:
+    """업스트림별 파싱 품질 집계"""
+
+    def __init__(self):
+        self._counts = Counter()  # (업스트림, 품질)
+
+    def record(self, source: str, quality: str) -> None:
+        """파싱 품질 기록"""
+        self._counts[(source, quality)] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """업스트림별 품질 횟수"""
+        result: Dict[str, Dict[str, int]] = {}
+        for (source, quality), count in self._counts.items():
+            result.setdefault(source, {})[quality] = count
+        return result
+
+
+# 애플리케이션 전역 인스턴스
+json_parse_metrics = JSONParseMetrics()
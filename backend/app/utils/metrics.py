@@ -0,0 +1,69 @@
+"""
+경량 인프로세스 성능 지표
+
+외부 모니터링 의존성 없이 최근 N개 관측값의 평균/백분위를 계산합니다.
+결과는 /api/admin/metrics에서 조회합니다.
+"""
+import math
+from collections import deque
+from typing import Dict, Iterable
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    정렬된 값 목록의 백분위 (nearest-rank)
+
+    Args:
+        sorted_values: 오름차순 정렬된 값 목록
+        pct: 백분위 (0~100)
+
+    Returns:
+        백분위 값 (값이 없으면 0.0)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class RollingStats:
+    """최근 window개 관측값의 통계"""
+
+    def __init__(self, window: int = 200):
+        self._values = deque(maxlen=window)
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        """관측값 기록"""
+        self._values.append(value)
+        self._count += 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        """관측값 여러 개 기록"""
+        for value in values:
+            self.observe(value)
+
+    @property
+    def count(self) -> int:
+        """누적 관측 수"""
+        return self._count
+
+    def mean(self) -> float:
+        """최근 관측값 평균"""
+        return sum(self._values) / len(self._values) if self._values else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """최근 관측값 백분위"""
+        return percentile(sorted(self._values), pct)
+
+    def snapshot(self, precision: int = 4) -> Dict:
+        """통계 스냅샷"""
+        values = sorted(self._values)
+        return {
+            "count": self._count,
+            "mean": round(sum(values) / len(values), precision) if values else 0.0,
+            "p50": round(percentile(values, 50), precision),
+            "p90": round(percentile(values, 90), precision),
+            "p99": round(percentile(values, 99), precision),
+            "max": round(values[-1], precision) if values else 0.0
+        }
@@ -0,0 +1,103 @@
+"""
+동일한 진행 중 요청 합치기 (single-flight)
+
+같은 키의 호출이 이미 진행 중이면 새 업스트림 호출을 시작하지 않고 진행 중인 호출의 결과를 함께 기다립니다.
+(더블 클릭, 부하 급증 시 같은 재료 목록 요청 등)
+- 공유 호출은 별도 태스크로 실행되므로 기다리던 요청 하나가 취소되어도 다른 대기자가 남아 있으면 계속 진행됩니다.
+- 마지막 대기자까지 취소되면 공유 호출도 취소하고 즉시 목록에서 제거합니다 (결과를 받을 요청이 없으므로).
+- 합류한 요청은 자신이 취소되지 않았다면 취소를 물려받지 않습니다 (공유 호출이 중단되면 새로 호출).
+- 예외도 모든 대기자에게 그대로 전달됩니다.
+- 공유 호출은 첫 요청의 컨텍스트(요청 마감 시간 등)로 실행됩니다.
+
+사용 예:
+    result = await self.single_flight.do(key, lambda: self._generate(...))
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Call:
+    """진행 중인 공유 호출"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별 진행 중 호출 합치기"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+
+        # 통계
+        self._executed = 0  # 실제로 시작한 업스트림 호출 수
+        self._coalesced = 0  # 진행 중 호출에 합쳐진 요청 수
+        self._abandoned = 0  # 대기자가 모두 취소되어 중단한 공유 호출 수
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        키별로 합쳐서 호출
+
+        Args:
+            key: 요청의 정규 키 (같은 키 = 같은 결과를 기대할 수 있는 요청)
+            fn: 실제 업스트림 호출 (진행 중인 같은 키 호출이 없을 때만 실행)
+
+        Returns:
+            fn의 결과 (합쳐진 요청은 같은 객체를 공유하므로 수정하지 말 것)
+        """
+        while True:
+            call = self._join(key, fn)
+            call.waiters += 1
+            try:
+                return await asyncio.shield(call.task)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if call.task.cancelled() and not (current and current.cancelling()):
+                    # 이 요청은 취소되지 않았는데 공유 호출이 중단됨: 취소를 물려받지 않고 새로 호출
+                    logger.info(f"{self.name} 공유 호출이 중단되어 다시 호출")
+                    continue
+                # 이 요청만 취소된 경우: 남은 대기자가 없을 때만 공유 호출 중단
+                if call.waiters == 1 and not call.task.done():
+                    call.task.cancel()
+                    # 취소된 태스크가 끝나기 전에 도착한 같은 키 요청이 합류하지 않도록 즉시 제거
+                    self._forget(key, call)
+                    self._abandoned += 1
+                raise
+            finally:
+                call.waiters -= 1
+
+    def _join(self, key: str, fn: Callable[[], Awaitable[Any]]) -> _Call:
+        """진행 중인 같은 키 호출을 찾거나 새로 시작"""
+        call = self._calls.get(key)
+        # 중단된 호출은 done 콜백으로 제거되기 전이라도 합류하지 않음
+        if call is None or call.task.cancelled():
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            self._executed += 1
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self._coalesced += 1
+            logger.info(f"{self.name} 진행 중인 요청에 합류 - 대기자 {call.waiters + 1}명")
+        return call
+
+    def _forget(self, key: str, call: _Call) -> None:
+        """완료된 호출 제거 (같은 키의 새 호출은 유지)"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict:
+        """합치기 통계"""
+        requests = self._executed + self._coalesced
+        return {
+            "in_flight": len(self._calls),
+            "executed": self._executed,
+            "coalesced": self._coalesced,
+            "abandoned": self._abandoned,
+            "coalesce_rate": round(self._coalesced / requests, 3) if requests else 0.0
+        }
@@ -0,0 +1,44 @@
+"""
+Server-Sent Events 응답 유틸리티
+"""
+import json
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+# SSE 응답 헤더
+# - Content-Encoding: identity → GZipMiddleware가 이벤트를 압축 버퍼에 붙잡아 두지 않도록 우회
+# - X-Accel-Buffering: no → nginx 프록시 버퍼링 비활성화
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Content-Encoding": "identity",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    SSE 이벤트 문자열 생성
+
+    Args:
+        event: 이벤트 이름
+        data: JSON 직렬화 가능한 데이터
+
+    Returns:
+        "event: ...\\ndata: ...\\n\\n" 형식 문자열
+    """
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """
+    SSE 스트리밍 응답 생성
+
+    Args:
+        events: format_sse 문자열을 내보내는 비동기 이터레이터
+
+    Returns:
+        text/event-stream 응답
+    """
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
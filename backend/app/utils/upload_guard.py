@@ -0,0 +1,63 @@
+"""
+업로드 요청 본문 크기 제한 ASGI 미들웨어
+
+Starlette는 엔드포인트 실행 전에 multipart 본문 전체를 버퍼링(스풀)하므로,
+크기 검사를 엔드포인트에서 하면 이미 최대 크기만큼 메모리/디스크를 쓴 뒤입니다.
+이 미들웨어는 본문을 받는 도중 누적 크기를 세어 제한을 넘는 즉시 413으로 중단합니다.
+- Content-Length 헤더가 제한을 넘으면 본문을 읽기 전에 거절
+- 헤더가 없거나 거짓이어도 수신 바이트를 세어 초과 시 중단
+"""
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UploadSizeLimitMiddleware:
+    """경로 접두사별 요청 본문 크기 제한"""
+
+    def __init__(self, app: ASGIApp, path_prefix: str, max_body_size: int):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.max_body_size = max_body_size
+
+    def _too_large_detail(self) -> str:
+        max_size_mb = self.max_body_size / (1024 * 1024)
+        return f"요청 본문이 너무 큽니다. 최대 {max_size_mb:.1f}MB까지 가능합니다."
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT")
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # 1. Content-Length 선검사 (본문 수신 전)
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self.max_body_size:
+                logger.warning(f"업로드 거절 (Content-Length: {int(content_length)}) - {scope['path']}")
+                response = JSONResponse({"detail": self._too_large_detail()}, status_code=413)
+                await response(scope, receive, send)
+                return
+
+        # 2. 수신 중 누적 크기 검사
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    logger.warning(f"업로드 수신 중단 ({received} bytes) - {scope['path']}")
+                    raise HTTPException(status_code=413, detail=self._too_large_detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,69 @@
+"""
+분석 작업 워커 프로세스 (API 서버와 분리 실행)
+
+API 노드는 JOB_EXECUTION_MODE=external로 작업만 넣고, 이 프로세스가 analysis_jobs 테이블에서
+작업을 임대해 처리합니다. Ollama 호스트마다 워커를 두면 HTTP와 추론 용량을 따로 늘릴 수 있습니다.
+API와 같은 DATABASE_URL, IMAGE_STORE_DIR(공유 디렉터리)을 사용해야 합니다.
+
+사용법:
+    cd backend
+    python -m app.worker                # JOB_WORKERS개 동시 처리
+    python -m app.worker --workers 1
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.config import settings
+from app.db.database import init_db
+from app.services.image_analysis import image_analysis_service
+from app.services.job_runner import AnalysisJobRunner
+from app.services.ollama_service import ollama_service
+from app.utils.image_utils import shutdown_image_workers
+from app.utils.logger import setup_logger
+
+# 루트 로거 설정
+setup_logger("app", level=logging.INFO)
+
+logger = logging.getLogger("app")
+
+
+async def run_worker(workers: int) -> None:
+    """SIGINT/SIGTERM을 받을 때까지 작업 처리"""
+    await init_db()
+    ollama_service.http.start()
+    ollama_service.pool.start(warm_up=settings.OLLAMA_WARMUP_ON_STARTUP)
+
+    runner = AnalysisJobRunner(workers=workers)
+    await runner.start()
+    logger.info(f"🛠️  분석 작업 워커 실행 중 - Ollama: {', '.join(ollama_service.pool.urls)}")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("👋 분석 작업 워커 종료 중... (실행 중인 작업의 임대 반환)")
+        await runner.stop()
+        await image_analysis_service.stop()
+        await ollama_service.pool.stop()
+        await ollama_service.http.aclose()
+        shutdown_image_workers()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FridgeChef 분석 작업 워커")
+    parser.add_argument(
+        "--workers", type=int, default=settings.JOB_WORKERS,
+        help=f"동시 처리 작업 수 (기본: {settings.JOB_WORKERS})"
+    )
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.workers))
+
+
+if __name__ == "__main__":
+    main()
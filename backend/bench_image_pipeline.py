@@ -0,0 +1,95 @@
+"""
+이미지 전처리 파이프라인 벤치마크: 전체 디코딩 vs JPEG 축소 디코딩(draft)
+
+각 (모드, 파일) 조합을 별도 프로세스에서 실행하여 벽시계 시간과 최대 RSS를 비교합니다.
+
+사용법:
+    cd backend
+    python bench_image_pipeline.py                 # docs/sample/*.jpg
+    python bench_image_pipeline.py a.jpg b.jpg -n 10
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SAMPLE_DIR = Path(__file__).parent.parent / "docs" / "sample"
+MODES = {"full": "false", "draft": "true"}
+
+
+def _max_rss_mb() -> float:
+    """현재 프로세스 최대 RSS (MB)"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def run_child(path: str, iterations: int) -> None:
+    """자식 프로세스: 한 파일을 iterations번 처리하고 결과를 JSON으로 출력"""
+    from app.utils.image_utils import _process_image_bytes
+
+    data = Path(path).read_bytes()
+    baseline_rss = _max_rss_mb()
+
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        processed, _ = _process_image_bytes(time.time(), data)
+        durations.append(time.perf_counter() - started)
+
+    print(json.dumps({
+        "median_ms": statistics.median(durations) * 1000,
+        "peak_rss_mb": _max_rss_mb(),
+        "rss_delta_mb": _max_rss_mb() - baseline_rss,
+        "output": f"{processed.width}x{processed.height}"
+    }))
+
+
+def run_benchmark(paths: list, iterations: int) -> None:
+    """모드별로 자식 프로세스를 실행하고 결과 비교표 출력"""
+    print(f"\n{'='*78}")
+    print(f"{'파일':<24}{'모드':<8}{'중앙값(ms)':>12}{'최대RSS(MB)':>14}{'RSS증가(MB)':>14}{'출력':>10}")
+    print(f"{'='*78}")
+
+    for path in paths:
+        results = {}
+        for mode, draft_flag in MODES.items():
+            env = {**os.environ, "IMAGE_DRAFT_DECODE": draft_flag}
+            completed = subprocess.run(
+                [sys.executable, __file__, "--child", str(path), "-n", str(iterations)],
+                env=env,
+                cwd=Path(__file__).parent,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            results[mode] = result
+            print(
+                f"{Path(path).name:<24}{mode:<8}{result['median_ms']:>12.1f}"
+                f"{result['peak_rss_mb']:>14.1f}{result['rss_delta_mb']:>14.1f}{result['output']:>10}"
+            )
+
+        speedup = results["full"]["median_ms"] / max(results["draft"]["median_ms"], 1e-6)
+        print(f"{'':<24}→ draft 속도 향상: {speedup:.1f}배")
+
+    print(f"{'='*78}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이미지 전처리 파이프라인 벤치마크")
+    parser.add_argument("paths", nargs="*", help="이미지 파일 (기본: docs/sample/*.jpg)")
+    parser.add_argument("-n", "--iterations", type=int, default=5, help="파일당 반복 횟수")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.paths[0], args.iterations)
+    else:
+        image_paths = args.paths or sorted(str(p) for p in SAMPLE_DIR.glob("*.jpg"))
+        run_benchmark(image_paths, args.iterations)
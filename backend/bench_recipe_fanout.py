@@ -0,0 +1,74 @@
+"""
+레시피 생성 벤치마크: 프롬프트 하나로 N개(single) vs 1개씩 N개 동시 요청(fanout)
+
+같은 재료 목록으로 모드별 생성 시간(중앙값/p90/최대)과 받은 레시피 수를 비교합니다.
+실제 API 대신 스텁으로 확인하려면 OPENROUTER_API_URL을 지정합니다.
+
+사용법:
+    cd backend
+    python stub_openrouter.py --port 11601 --chars-per-second 300 --tail-rate 0.1 &
+    OPENROUTER_API_URL=http://localhost:11601/chat/completions python bench_recipe_fanout.py -n 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.services.openrouter_service import FANOUT_MODE, SINGLE_MODE, openrouter_service
+
+INGREDIENTS = ["김치", "계란", "밥", "대파", "두부", "감자"]
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def run_mode(mode: str, iterations: int) -> dict:
+    """한 모드로 iterations번 순차 생성"""
+    durations, counts, partial = [], [], 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = await openrouter_service.generate_recipes(INGREDIENTS, mode=mode)
+        durations.append(time.perf_counter() - started)
+        counts.append(len(result["recipes"]))
+        partial += bool(result.get("partial"))
+    return {
+        "median": statistics.median(durations),
+        "p90": _percentile(durations, 0.9),
+        "max": max(durations),
+        "recipes": statistics.mean(counts),
+        "partial": partial
+    }
+
+
+async def run_benchmark(iterations: int) -> None:
+    """모드별 결과 비교표 출력"""
+    openrouter_service.http.start()
+    try:
+        print(f"\n{'='*72}")
+        print(f"{'모드':<10}{'중앙값(s)':>12}{'p90(s)':>10}{'최대(s)':>10}{'평균 레시피':>14}{'부분 결과':>12}")
+        print(f"{'='*72}")
+
+        results = {}
+        for mode in (SINGLE_MODE, FANOUT_MODE):
+            result = await run_mode(mode, iterations)
+            results[mode] = result
+            print(
+                f"{mode:<10}{result['median']:>12.2f}{result['p90']:>10.2f}{result['max']:>10.2f}"
+                f"{result['recipes']:>14.1f}{result['partial']:>12}"
+            )
+
+        speedup = results[SINGLE_MODE]["median"] / max(results[FANOUT_MODE]["median"], 1e-6)
+        print(f"{'':<10}→ fanout 중앙값 속도 향상: {speedup:.1f}배")
+        print(f"{'='*72}\n")
+    finally:
+        await openrouter_service.http.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="레시피 생성 single/fanout 벤치마크")
+    parser.add_argument("-n", "--iterations", type=int, default=5, help="모드별 반복 횟수")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.iterations))
@@ -0,0 +1,65 @@
+"""
+데이터베이스 마이그레이션: ImageUpload 테이블에 content_hash 컬럼 추가
+
+사용법:
+    python backend/migrate_add_image_store.py
+"""
+import asyncio
+import sqlite3
+from pathlib import Path
+
+
+async def migrate_add_content_hash_column():
+    """ImageUpload 테이블에 content_hash 컬럼과 인덱스 추가"""
+
+    # 데이터베이스 파일 경로
+    db_path = Path(__file__).parent.parent / "fridgechef.db"
+
+    if not db_path.exists():
+        print(f"❌ 데이터베이스 파일을 찾을 수 없습니다: {db_path}")
+        print("ℹ️  먼저 애플리케이션을 실행하여 데이터베이스를 생성하세요.")
+        return
+
+    try:
+        # SQLite 연결
+        conn = sqlite3.connect(str(db_path))
+        cursor = conn.cursor()
+
+        # 컬럼이 이미 존재하는지 확인
+        cursor.execute("PRAGMA table_info(image_uploads)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        if "content_hash" in columns:
+            print("✅ content_hash 컬럼이 이미 존재합니다. 마이그레이션이 필요하지 않습니다.")
+        else:
+            print("🔄 content_hash 컬럼을 추가하는 중...")
+            cursor.execute("ALTER TABLE image_uploads ADD COLUMN content_hash VARCHAR(64)")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS ix_image_uploads_content_hash "
+                "ON image_uploads (content_hash)"
+            )
+            conn.commit()
+            print("✅ content_hash 컬럼이 성공적으로 추가되었습니다!")
+
+        # 통계 출력
+        cursor.execute("SELECT COUNT(*) FROM image_uploads")
+        total_uploads = cursor.fetchone()[0]
+
+        cursor.execute("SELECT COUNT(*) FROM image_uploads WHERE content_hash IS NOT NULL")
+        stored_uploads = cursor.fetchone()[0]
+
+        print("\n📊 이미지 업로드 통계:")
+        print(f"   - 전체 업로드: {total_uploads}개")
+        print(f"   - 이미지 저장됨: {stored_uploads}개")
+        print("\nℹ️  기존 업로드는 원본 이미지가 없으므로 재분석 시 다시 업로드해야 합니다.")
+
+        conn.close()
+        print("\n✅ 마이그레이션 완료!")
+
+    except Exception as e:
+        print(f"❌ 마이그레이션 실패: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_add_content_hash_column())
@@ -0,0 +1,72 @@
+"""
+데이터베이스 마이그레이션: AnalysisJob 테이블에 작업 임대(lease) 컬럼 추가
+
+사용법:
+    python backend/migrate_add_job_leases.py
+"""
+import asyncio
+import sqlite3
+from pathlib import Path
+
+LEASE_COLUMNS = {
+    "lease_owner": "VARCHAR",
+    "lease_expires_at": "DATETIME",
+    "available_at": "DATETIME",
+}
+
+
+async def migrate_add_job_lease_columns():
+    """AnalysisJob 테이블에 lease_owner, lease_expires_at, available_at 컬럼과 인덱스 추가"""
+
+    # 데이터베이스 파일 경로
+    db_path = Path(__file__).parent.parent / "fridgechef.db"
+
+    if not db_path.exists():
+        print(f"❌ 데이터베이스 파일을 찾을 수 없습니다: {db_path}")
+        print("ℹ️  먼저 애플리케이션을 실행하여 데이터베이스를 생성하세요.")
+        return
+
+    try:
+        # SQLite 연결
+        conn = sqlite3.connect(str(db_path))
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(analysis_jobs)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        if not columns:
+            print("ℹ️  analysis_jobs 테이블이 없습니다. 애플리케이션 시작 시 새 스키마로 생성됩니다.")
+            conn.close()
+            return
+
+        missing = [name for name in LEASE_COLUMNS if name not in columns]
+        if not missing:
+            print("✅ 임대 컬럼이 이미 존재합니다. 마이그레이션이 필요하지 않습니다.")
+        else:
+            for name in missing:
+                print(f"🔄 {name} 컬럼을 추가하는 중...")
+                cursor.execute(f"ALTER TABLE analysis_jobs ADD COLUMN {name} {LEASE_COLUMNS[name]}")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS ix_analysis_jobs_status_lease "
+                "ON analysis_jobs (status, lease_expires_at)"
+            )
+            conn.commit()
+            print("✅ 임대 컬럼이 성공적으로 추가되었습니다!")
+
+        # 통계 출력
+        cursor.execute("SELECT status, COUNT(*) FROM analysis_jobs GROUP BY status")
+        print("\n📊 분석 작업 통계:")
+        for status, count in cursor.fetchall():
+            print(f"   - {status}: {count}개")
+        print("\nℹ️  running 상태의 기존 작업은 임대 정보가 없으므로 워커가 즉시 다시 가져갑니다.")
+
+        conn.close()
+        print("\n✅ 마이그레이션 완료!")
+
+    except Exception as e:
+        print(f"❌ 마이그레이션 실패: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_add_job_lease_columns())
@@ -0,0 +1,172 @@
+"""
+개발용 Ollama 스텁 서버
+
+GPU 없이 여러 Ollama 서버 구성(OLLAMA_HOSTS)의 라우팅/헬스 체크/퇴출·복귀를 확인할 때 사용합니다.
+/api/chat(스트리밍/비스트리밍), /api/generate(모델 로드), /api/tags, /api/ps만 흉내 내며
+고정된 재료 목록과 토큰 수(prompt_eval_count/eval_count)를 반환합니다. 모델이 메모리에 없으면 첫 요청이 로드 시간(--load-time)만큼 더 걸리고,
+요청의 keep_alive가 지나면 모델이 내려갑니다.
+
+사용법:
+    cd backend
+    python stub_ollama.py --port 11501 --delay 2
+    python stub_ollama.py --port 11502 --delay 5 --fail-rate 0.3
+    python stub_ollama.py --port 11503 --cold --load-time 10
+    python stub_ollama.py --port 11504 --delay 8 --scale-with-image   # 1024px 기준 8초, 작은 이미지는 비례해 빠름
+    python stub_ollama.py --port 11505 --truncate 150   # 출력 토큰 한도에 걸려 잘린 응답 흉내
+    OLLAMA_HOSTS=http://localhost:11501,http://localhost:11502 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import base64
+import io
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+
+import uvicorn
+from PIL import Image
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+RESPONSE = {
+    "ingredients": [
+        {"name": "우유", "quantity": "1개", "freshness": "fresh", "confidence": 0.9},
+        {"name": "계란", "quantity": "6개", "freshness": "fresh", "confidence": 0.85},
+        {"name": "당근", "quantity": "2개", "freshness": "moderate", "confidence": 0.7}
+    ]
+}
+
+
+def parse_keep_alive(value) -> float:
+    """keep_alive 값 → 초 (음수는 계속 유지)"""
+    if value is None:
+        return 300.0
+    if isinstance(value, (int, float)):
+        return float(value) if value >= 0 else float("inf")
+    seconds = 0.0
+    for amount, unit in re.findall(r"(-?[\d.]+)(h|m|s)", value):
+        seconds += float(amount) * {"h": 3600, "m": 60, "s": 1}[unit]
+    return seconds if seconds >= 0 else float("inf")
+
+
+def image_scale(body: dict) -> float:
+    """요청 이미지 픽셀 수 / 1024x1024 (이미지가 없으면 1)"""
+    images = [image for message in body.get("messages", []) for image in message.get("images") or []]
+    if not images:
+        return 1.0
+    with Image.open(io.BytesIO(base64.b64decode(images[0]))) as image:
+        width, height = image.size
+    return max(width * height / (1024 * 1024), 0.05)
+
+
+def token_counts(body: dict, content: str, started: float, truncated: bool = False) -> dict:
+    """응답 토큰 수/시간 필드 (글자 수 기준 대략값, 시간은 나노초)"""
+    prompt = sum(len(message.get("content", "")) for message in body.get("messages", []))
+    images = sum(len(message.get("images") or []) for message in body.get("messages", []))
+    return {
+        "done_reason": "length" if truncated else "stop",
+        "total_duration": int((time.monotonic() - started) * 1e9),
+        "load_duration": 0,
+        "prompt_eval_count": prompt // 2 + images * 256,
+        "eval_count": len(content) // 2
+    }
+
+
+def create_app(
+    model: str,
+    delay: float,
+    fail_rate: float,
+    loaded: bool,
+    load_time: float,
+    scale_with_image: bool = False,
+    truncate: int = 0
+) -> FastAPI:
+    """스텁 앱 생성"""
+    app = FastAPI(title="Ollama stub")
+    state = {"loaded_until": float("inf") if loaded else 0.0, "requests": 0}
+
+    def is_loaded() -> bool:
+        return time.monotonic() < state["loaded_until"]
+
+    async def load(keep_alive) -> None:
+        if not is_loaded():
+            await asyncio.sleep(load_time)
+        state["loaded_until"] = time.monotonic() + parse_keep_alive(keep_alive)
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": model, "model": model}]}
+
+    @app.get("/api/ps")
+    async def ps():
+        return {"models": [{"name": model, "model": model}] if is_loaded() else []}
+
+    @app.post("/api/generate")
+    async def generate(body: dict):
+        await load(body.get("keep_alive"))
+        return {"model": model, "response": "", "done": True, "done_reason": "load"}
+
+    @app.post("/api/chat")
+    async def chat(body: dict):
+        state["requests"] += 1
+        started = time.monotonic()
+        if random.random() < fail_rate:
+            return JSONResponse(status_code=500, content={"error": "stub failure"})
+
+        await load(body.get("keep_alive"))
+        await asyncio.sleep(delay * image_scale(body) if scale_with_image else delay)
+        content = json.dumps(RESPONSE, ensure_ascii=False)
+        if truncate:
+            content = content[:truncate]
+        created_at = datetime.now(timezone.utc).isoformat()
+
+        if not body.get("stream"):
+            return {
+                "model": body.get("model", model),
+                "created_at": created_at,
+                "message": {"role": "assistant", "content": content},
+                "done": True,
+                **token_counts(body, content, started, truncated=bool(truncate))
+            }
+
+        async def generate():
+            for i in range(0, len(content), 8):
+                chunk = {"model": model, "message": {"role": "assistant", "content": content[i:i + 8]}, "done": False}
+                yield json.dumps(chunk, ensure_ascii=False) + "\n"
+                await asyncio.sleep(0.02)
+            final = {"model": model, "message": {"role": "assistant", "content": ""}, "done": True}
+            yield json.dumps({**final, **token_counts(body, content, started, truncated=bool(truncate))}) + "\n"
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="개발용 Ollama 스텁 서버")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", default="gemma3:12b", help="설치/로드된 것으로 보고할 모델")
+    parser.add_argument("--delay", type=float, default=1.0, help="응답 지연 (초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--cold", action="store_true", help="모델이 메모리에 없는 상태로 시작")
+    parser.add_argument("--load-time", type=float, default=5.0, help="모델 로드 시간 (초)")
+    parser.add_argument("--scale-with-image", action="store_true", help="응답 지연을 이미지 픽셀 수에 비례시킴")
+    parser.add_argument("--truncate", type=int, default=0, help="응답을 이 글자 수에서 자름 (0=자르지 않음)")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(
+            args.model,
+            args.delay,
+            args.fail_rate,
+            loaded=not args.cold,
+            load_time=args.load_time,
+            scale_with_image=args.scale_with_image,
+            truncate=args.truncate
+        ),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning"
+    )
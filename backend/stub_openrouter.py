@@ -0,0 +1,127 @@
+"""
+개발용 OpenRouter 스텁 서버
+
+네트워크/API 키 없이 레시피 생성(동기/스트리밍)의 지연 시간 특성을 확인할 때 사용합니다.
+/chat/completions(stream true/false)만 흉내 내며, 프롬프트의 "레시피 N개"만큼 레시피 JSON을
+--chars-per-second 속도로 생성합니다 (출력 길이에 비례하는 지연).
+
+사용법:
+    cd backend
+    python stub_openrouter.py --port 11601 --chars-per-second 300
+    OPENROUTER_API_URL=http://localhost:11601/chat/completions uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+import zlib
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+DISHES = ["김치볶음밥", "계란말이", "된장찌개", "감자조림", "두부부침", "잡채", "떡볶이", "순두부찌개"]
+
+
+def make_recipe(index: int, category: str = "") -> dict:
+    """고정 형식의 레시피 (약 400자, 요리 종류 힌트가 있으면 제목 앞에 표시)"""
+    dish = DISHES[index % len(DISHES)]
+    return {
+        "title": f"{category} {dish}" if category else dish,
+        "description": "집에 있는 재료로 간단하게 만드는 한 끼 요리",
+        "ingredients": [
+            {"name": "김치", "quantity": "1컵", "available": True},
+            {"name": "계란", "quantity": "2개", "available": True},
+            {"name": "대파", "quantity": "1대", "available": False}
+        ],
+        "instructions": [
+            "팬에 기름을 두르고 대파를 볶아 향을 냅니다.",
+            "김치를 넣고 중불에서 3분간 볶습니다.",
+            "나머지 재료를 넣고 간을 맞춘 뒤 마무리합니다."
+        ],
+        "cooking_time": 20,
+        "difficulty": "easy",
+        "calories": 450
+    }
+
+
+def recipe_count(body: dict) -> int:
+    """프롬프트에서 요청한 레시피 수"""
+    prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+    match = re.search(r"레시피 (\d+)개", prompt)
+    return int(match.group(1)) if match else 1
+
+
+def recipe_category(body: dict) -> str:
+    """프롬프트의 요리 종류 힌트 (팬아웃 생성, 없으면 빈 문자열)"""
+    prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+    match = re.search(r"요리 종류: (\S+)", prompt)
+    return match.group(1) if match else ""
+
+
+def create_app(chars_per_second: float, first_token_delay: float, tail_rate: float, tail_delay: float) -> FastAPI:
+    """스텁 앱 생성"""
+    app = FastAPI(title="OpenRouter stub")
+
+    @app.post("/chat/completions")
+    async def chat(body: dict):
+        # 팬아웃 요청(요리 종류 힌트)끼리 제목이 겹치지 않도록 힌트별로 다른 요리/제목 사용
+        category = recipe_category(body)
+        offset = zlib.crc32(category.encode("utf-8")) % len(DISHES)
+        content = json.dumps(
+            {"recipes": [make_recipe(offset + i, category) for i in range(recipe_count(body))]},
+            ensure_ascii=False
+        )
+        first_delay = first_token_delay + (tail_delay if random.random() < tail_rate else 0.0)
+        completion_id = f"gen-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "stub")
+
+        if not body.get("stream"):
+            await asyncio.sleep(first_delay + len(content) / chars_per_second)
+            return {
+                "id": completion_id,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"completion_tokens": len(content) // 2}
+            }
+
+        async def generate():
+            yield ": OPENROUTER PROCESSING\n\n"
+            await asyncio.sleep(first_delay)
+            step = 16
+            for i in range(0, len(content), step):
+                chunk = {
+                    "id": completion_id,
+                    "model": model,
+                    "created": int(time.time()),
+                    "choices": [{"index": 0, "delta": {"content": content[i:i + step]}, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                await asyncio.sleep(step / chars_per_second)
+            final = {"id": completion_id, "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="개발용 OpenRouter 스텁 서버")
+    parser.add_argument("--port", type=int, default=11601)
+    parser.add_argument("--chars-per-second", type=float, default=300.0, help="출력 생성 속도 (글자/초)")
+    parser.add_argument("--first-token-delay", type=float, default=0.5, help="첫 토큰까지 지연 (초)")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="느린 응답 비율 (0~1)")
+    parser.add_argument("--tail-delay", type=float, default=10.0, help="느린 응답에 추가되는 지연 (초)")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(args.chars_per_second, args.first_token_delay, args.tail_rate, args.tail_delay),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning"
+    )
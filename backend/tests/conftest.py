@@ -0,0 +1,7 @@
+"""
+테스트 공통 설정 (backend/ 디렉터리를 import 경로에 추가해 app 패키지를 바로 불러옴)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,107 @@
+"""
+관대한 JSON 파서(app.utils.llm_json) 테스트
+
+실행: cd backend && python -m pytest tests
+"""
+from app.utils.llm_json import (
+    PARSE_EXTRACTED,
+    PARSE_FAILED,
+    PARSE_OK,
+    PARSE_REPAIRED,
+    parse_llm_json
+)
+
+INGREDIENTS = '{"ingredients": [{"name": "우유", "quantity": "1개"}, {"name": "계란", "quantity": "6개"}]}'
+
+
+def names(value):
+    return [item["name"] for item in value.get("ingredients", [])]
+
+
+def test_plain_json_is_ok():
+    parsed = parse_llm_json(INGREDIENTS)
+    assert parsed.quality == PARSE_OK
+    assert names(parsed.value) == ["우유", "계란"]
+
+
+def test_fenced_json_is_extracted():
+    parsed = parse_llm_json(f"```json\n{INGREDIENTS}\n```")
+    assert parsed.quality == PARSE_EXTRACTED
+    assert names(parsed.value) == ["우유", "계란"]
+
+
+def test_surrounding_text_is_ignored():
+    parsed = parse_llm_json(f"분석 결과입니다:\n{INGREDIENTS}\n더 필요한 것이 있으면 알려주세요.")
+    assert parsed.quality == PARSE_EXTRACTED
+    assert names(parsed.value) == ["우유", "계란"]
+
+
+def test_trailing_comma_is_repaired():
+    parsed = parse_llm_json('{"ingredients": [{"name": "우유"}, {"name": "계란"},],}')
+    assert parsed.quality == PARSE_REPAIRED
+    assert names(parsed.value) == ["우유", "계란"]
+
+
+def test_truncated_inside_string_keeps_complete_items():
+    parsed = parse_llm_json('{"ingredients": [{"name": "우유"}, {"name": "계')
+    assert parsed.quality == PARSE_REPAIRED
+    assert names(parsed.value) == ["우유"]
+
+
+def test_truncated_inside_item_object_drops_partial_item():
+    parsed = parse_llm_json('{"ingredients": [{"name": "우유", "quantity": "1개"}, {"name": "계란", "quan')
+    assert parsed.quality == PARSE_REPAIRED
+    assert parsed.value == {"ingredients": [{"name": "우유", "quantity": "1개"}]}
+
+
+def test_truncated_inside_nested_array_keeps_complete_values():
+    parsed = parse_llm_json('{"recipes": [{"title": "계란찜"}], "tags": ["간단", "아침')
+    assert parsed.quality == PARSE_REPAIRED
+    assert parsed.value == {"recipes": [{"title": "계란찜"}], "tags": ["간단"]}
+
+
+def test_truncated_before_first_item_gives_empty_list():
+    parsed = parse_llm_json('{"ingredients": [{"name": "우')
+    assert parsed.quality == PARSE_REPAIRED
+    assert parsed.value == {"ingredients": []}
+
+
+def test_top_level_array_keeps_every_item():
+    parsed = parse_llm_json('[{"name": "우유"}, {"name": "계란"}]', array_key="ingredients")
+    assert parsed.quality == PARSE_OK
+    assert names(parsed.value) == ["우유", "계란"]
+
+
+def test_fenced_top_level_array_is_extracted():
+    parsed = parse_llm_json('```json\n[{"title": "계란찜"}, {"title": "볶음밥"}]\n```', array_key="recipes")
+    assert parsed.quality == PARSE_EXTRACTED
+    assert [item["title"] for item in parsed.value["recipes"]] == ["계란찜", "볶음밥"]
+
+
+def test_truncated_top_level_array_is_repaired():
+    parsed = parse_llm_json('[{"name": "우유"}, {"name": "계란"}, {"name": "두', array_key="ingredients")
+    assert parsed.quality == PARSE_REPAIRED
+    assert names(parsed.value) == ["우유", "계란"]
+
+
+def test_top_level_array_uses_default_key():
+    parsed = parse_llm_json('[{"name": "우유"}]')
+    assert parsed.value == {"items": [{"name": "우유"}]}
+
+
+def test_non_object_array_in_text_is_skipped():
+    parsed = parse_llm_json('참고 [1] 결과: {"ingredients": [{"name": "우유"}]}')
+    assert parsed.quality == PARSE_EXTRACTED
+    assert names(parsed.value) == ["우유"]
+
+
+def test_no_json_fails_with_empty_value():
+    parsed = parse_llm_json("죄송하지만 이미지에서 재료를 찾지 못했습니다.")
+    assert parsed.quality == PARSE_FAILED
+    assert parsed.value == {}
+    assert not parsed.ok
+
+
+def test_empty_content_fails():
+    assert parse_llm_json("").quality == PARSE_FAILED
+    assert parse_llm_json(None).quality == PARSE_FAILED
@@ -0,0 +1,124 @@
+"""
+진행 중 요청 합치기(app.utils.single_flight) 테스트
+
+실행: cd backend && python -m pytest tests
+"""
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(flight.do("k", fetch), flight.do("k", fetch))
+        return results, calls, flight.stats()
+
+    results, calls, stats = run(scenario())
+    assert results == ["result", "result"]
+    assert calls == 1
+    assert stats["coalesced"] == 1
+
+
+def test_one_of_two_waiters_cancelled_other_still_gets_result():
+    async def scenario():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "result"
+
+        first = asyncio.create_task(flight.do("k", fetch))
+        second = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, flight.stats()
+
+    result, stats = run(scenario())
+    assert result == "result"
+    assert stats["abandoned"] == 0
+
+
+def test_joiner_after_abandoned_call_starts_a_new_call():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        first = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        # 첫 요청의 취소가 처리되고 공유 호출이 정리되기 전(한 번만 양보)에 같은 키로 다시 요청
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("k", fetch))
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, calls, flight.stats()
+
+    result, calls, stats = run(scenario())
+    assert result == 2
+    assert calls == 2
+    assert stats["abandoned"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_joiner_does_not_inherit_cancellation_of_shared_call():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        waiter = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        # 대기자가 취소하지 않았는데 공유 호출 자체가 중단된 경우
+        flight._calls["k"].task.cancel()
+        return await waiter, calls, flight.stats()
+
+    result, calls, stats = run(scenario())
+    assert result == calls
+    assert stats["executed"] == 2
+
+
+def test_exception_is_propagated_to_every_waiter():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        return await asyncio.gather(flight.do("k", fetch), flight.do("k", fetch), return_exceptions=True)
+
+    results = run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
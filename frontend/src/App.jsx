@@ -15,7 +15,7 @@ import LoginModal from './components/LoginModal';
 import Profile from './pages/Profile';
 import RegisterPage from './pages/RegisterPage';
 import AdminPage from './pages/AdminPage';
-import { generateRecipes } from './services/api';
+import { generateRecipes, reanalyzeImage } from './services/api';
 import { DEFAULT_USER_ID } from './utils/constants';
 import { processAndAnalyzeImage } from './utils/imageAnalysis';
 import LoadingSpinner from './components/LoadingSpinner';
@@ -151,8 +151,25 @@ function Home() {
     startLoading(loadingKey);
 
     try {
-      // 커스텀 프롬프트와 함께 재분석
-      const result = await processAndAnalyzeImage(uploadedFile, null, customPrompt);
+      let result;
+      const imageId = rawAnalysisData?.image_id;
+
+      if (imageId) {
+        // 서버에 저장된 이미지로 재분석 (재업로드 없이 모델 호출만)
+        const startTime = Date.now();
+        const reanalysis = await reanalyzeImage(imageId, customPrompt);
+        result = {
+          ...reanalysis,
+          imagePreview: uploadedImage,
+          fileName: uploadedFile.name,
+          fileSize: uploadedFile.size,
+          analysisDuration: ((Date.now() - startTime) / 1000).toFixed(1),
+          model: reanalysis.model || 'Unknown Model',
+        };
+      } else {
+        // 커스텀 프롬프트와 함께 재분석 (원본 파일 재업로드)
+        result = await processAndAnalyzeImage(uploadedFile, null, customPrompt);
+      }
 
       // 분석 완료 핸들러 호출
       handleAnalysisComplete(result, uploadedFile);
@@ -169,7 +186,7 @@ function Home() {
     } finally {
       stopLoading(loadingKey);
     }
-  }, [uploadedFile, startLoading, stopLoading, toast, handleAnalysisComplete]);
+  }, [uploadedFile, uploadedImage, rawAnalysisData, startLoading, stopLoading, toast, handleAnalysisComplete]);
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-primary-50 to-secondary-50">
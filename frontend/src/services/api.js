@@ -74,6 +74,25 @@ export const analyzeImage = async (file, customPrompt = null, userId = 'demo-use
   return response.data;
 };
 
+/**
+ * 이미지 재분석 API (서버에 저장된 이미지 사용, 재업로드 없음)
+ */
+export const reanalyzeImage = async (imageId, customPrompt = null) => {
+  // 목 데이터 사용
+  if (USE_MOCK_DATA) {
+    console.log('📸 [MOCK] 이미지 재분석 중...', imageId);
+    await delay(2000);
+    return mockIngredients;
+  }
+
+  const response = await apiClient.post(`/api/images/${imageId}/reanalyze`, {
+    custom_prompt: customPrompt,
+    use_previous: true,
+  });
+
+  return response.data;
+};
+
 /**
  * 레시피 생성 API
  */
@@ -33,6 +33,9 @@ export const getErrorMessage = (error) => {
     case 409:
       return '이미 존재하는 정보입니다.';
 
+    case 413:
+      return error.response?.data?.detail || '파일 크기가 너무 큽니다.';
+
     case 422:
       // Pydantic 검증 오류
       const validationErrors = error.response?.data?.detail;